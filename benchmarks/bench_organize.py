@@ -0,0 +1,304 @@
+# End-to-end throughput benchmark for PhotoOrganizer.
+# Generates a deterministic synthetic corpus, times the scan, extract, move and
+# cleanup phases one by one, then times a complete organize_photos() run on a fresh
+# copy of the same corpus. Reports files/sec and MB/sec per phase.
+#
+# Usage: python benchmarks/bench_organize.py --count 2000 --jobs 4 --json result.json
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+from corpus import generate_corpus
+
+# The application modules live in src/ and import each other by module name
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+from PhotoOrganizer_v3 import PhotoOrganizer, PipelineLimits  # noqa: E402
+from move_engine import MoveEngine  # noqa: E402
+
+
+def _confirm_all(file_path: str) -> bool:
+    """Removal confirmation that accepts every hidden/system file."""
+    return True
+
+
+def _result(
+    phase: str, seconds: float, files: int, size: int, error: Optional[str] = None
+) -> dict:
+    """Build one row of the report."""
+    return {
+        "phase": phase,
+        "seconds": seconds,
+        "files": files,
+        "bytes": size,
+        "files_per_sec": files / seconds if seconds > 0 else None,
+        "mb_per_sec": size / 1e6 / seconds if seconds > 0 and size else None,
+        "error": error,
+    }
+
+
+def run_phases(
+    source: Path,
+    destination: Path,
+    jobs: int,
+    executor: str,
+    sort_by_day: bool,
+    cleanup: bool,
+) -> list[dict]:
+    """Run the pipeline stages one after the other and time each of them.
+
+    Args:
+        source: Copy of the corpus to organize
+        destination: Destination folder
+        jobs: Number of workers used for date extraction
+        executor: Worker pool type, "thread" or "process"
+        sort_by_day: Whether to sort into day-level folders
+        cleanup: Whether to time the removal of the emptied source folders
+
+    Returns:
+        list: One result per phase
+    """
+    organizer = PhotoOrganizer()
+    destination.mkdir(parents=True, exist_ok=True)
+    results = []
+
+    start = perf_counter()
+    records = list(organizer.iter_source_files(source, exclude=destination))
+    scanned_bytes = sum(record.size for record in records)
+    results.append(
+        _result("scan", perf_counter() - start, len(records), scanned_bytes)
+    )
+
+    start = perf_counter()
+    dates = list(organizer.iter_file_dates(records, jobs=jobs, executor=executor))
+    results.append(
+        _result("extract", perf_counter() - start, len(records), scanned_bytes)
+    )
+
+    organizer.total_files = len(records)
+    organizer.scan_complete = True
+    organizer.move_engine = MoveEngine(source, destination)
+    moved_bytes = sum(
+        record.size for record, file_date, error in dates if file_date and not error
+    )
+    start = perf_counter()
+    for record, file_date, error in dates:
+        organizer._handle_file(
+            record, file_date, error, destination, sort_by_day, perf_counter()
+        )
+    results.append(
+        _result("move", perf_counter() - start, organizer.processed_files, moved_bytes)
+    )
+
+    if not cleanup:
+        return results
+    start = perf_counter()
+    try:
+        removed = organizer.delete_empty_folders(
+            source,
+            remove_confirmation_callback=_confirm_all,
+            folders=organizer.touched_dirs,
+        )
+        results.append(_result("cleanup", perf_counter() - start, removed, 0))
+    except Exception as e:
+        results.append(_result("cleanup", perf_counter() - start, 0, 0, repr(e)))
+    return results
+
+
+def run_end_to_end(
+    source: Path,
+    destination: Path,
+    jobs: int,
+    executor: str,
+    sort_by_day: bool,
+    cleanup: bool,
+    pipeline: Optional[PipelineLimits] = None,
+) -> tuple[dict, Optional[dict]]:
+    """Time one complete organize_photos() run.
+
+    Returns:
+        tuple: (result row, run report of organize_photos or None if it failed)
+    """
+    organizer = PhotoOrganizer()
+    start = perf_counter()
+    error = None
+    report = None
+    try:
+        report = organizer.organize_photos(
+            source,
+            destination,
+            sort_by_day=sort_by_day,
+            remove_empty=cleanup,
+            remove_confirmation_callback=_confirm_all,
+            jobs=jobs,
+            executor=executor,
+            pipeline=pipeline,
+        )
+    except Exception as e:
+        error = repr(e)
+    seconds = perf_counter() - start
+    moved_bytes = sum(
+        entry.stat().st_size for entry in destination.rglob("*") if entry.is_file()
+    )
+    row = _result(
+        "organize_photos", seconds, organizer.processed_files, moved_bytes, error
+    )
+    return row, report
+
+
+def _format_row(row: dict) -> str:
+    files_per_sec = row["files_per_sec"]
+    mb_per_sec = row["mb_per_sec"]
+    line = (
+        f"{row['phase']:<16}{row['files']:>8}{row['bytes'] / 1e6:>10.1f}"
+        f"{row['seconds']:>10.3f}"
+        f"{files_per_sec if files_per_sec is not None else float('nan'):>12.1f}"
+        f"{mb_per_sec if mb_per_sec is not None else float('nan'):>10.1f}"
+    )
+    if row["error"]:
+        line += f"  failed: {row['error']}"
+    return line
+
+
+def print_report(
+    corpus: dict, rows: list[dict], run_report: Optional[dict] = None
+) -> None:
+    kinds = ", ".join(f"{kind} {count}" for kind, count in corpus["kinds"].items())
+    print(
+        f"Corpus: {corpus['files']} files, {corpus['bytes'] / 1e6:.1f} MB, "
+        f"{corpus['hidden']} hidden ({kinds})"
+    )
+    print(
+        f"{'phase':<16}{'files':>8}{'MB':>10}{'seconds':>10}"
+        f"{'files/s':>12}{'MB/s':>10}"
+    )
+    for row in rows:
+        print(_format_row(row))
+    if run_report:
+        print()
+        print("Extraction in organize_photos, by extension and backend:")
+        print(f"{'format':<24}{'files':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+        for stats in run_report["extraction"]:
+            name = f"{stats['extension']} {stats['backend']}"
+            print(
+                f"{name:<24}{stats['count']:>8}{stats['p50_ms']:>10.2f}"
+                f"{stats['p95_ms']:>10.2f}{stats['max_ms']:>10.2f}"
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Measure PhotoOrganizer throughput on a synthetic corpus."
+    )
+    parser.add_argument(
+        "--count", type=int, default=1000, help="media files in the corpus"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="corpus random seed")
+    parser.add_argument("--jobs", type=int, default=1, help="date extraction workers")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--sort-by-day", action="store_true")
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="time the end-to-end run with the staged pipeline, --jobs decoders",
+    )
+    parser.add_argument(
+        "--no-cleanup", action="store_true", help="skip empty folder removal"
+    )
+    parser.add_argument(
+        "--workdir", type=Path, help="folder for the corpus (default: a temp folder)"
+    )
+    parser.add_argument(
+        "--destination-dir",
+        type=Path,
+        help="folder for the destinations, e.g. on another drive to time copies",
+    )
+    parser.add_argument("--json", type=Path, help="write the results to a JSON file")
+    parser.add_argument("--keep", action="store_true", help="keep the generated files")
+    parser.add_argument("--verbose", action="store_true", help="show warnings")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        # Files without a date are expected in the corpus
+        logging.getLogger().setLevel(logging.ERROR)
+
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="photo-bench-"))
+    destination_root = args.destination_dir or workdir
+    corpus_dir = workdir / "corpus"
+    runs = []
+    try:
+        shutil.rmtree(corpus_dir, ignore_errors=True)
+        start = perf_counter()
+        corpus = generate_corpus(corpus_dir, count=args.count, seed=args.seed)
+        print(f"Generated corpus in {perf_counter() - start:.1f} s")
+
+        rows = []
+        run_report = None
+        for name in ("phases", "end-to-end"):
+            # Every run organizes its own copy of the corpus
+            source = workdir / name / "source"
+            destination = destination_root / name / "destination"
+            shutil.rmtree(source, ignore_errors=True)
+            shutil.rmtree(destination, ignore_errors=True)
+            shutil.copytree(corpus_dir, source)
+            runs.append(source.parent)
+            runs.append(destination.parent)
+            if name == "phases":
+                rows += run_phases(
+                    source,
+                    destination,
+                    args.jobs,
+                    args.executor,
+                    args.sort_by_day,
+                    cleanup=not args.no_cleanup,
+                )
+            else:
+                row, run_report = run_end_to_end(
+                    source,
+                    destination,
+                    args.jobs,
+                    args.executor,
+                    args.sort_by_day,
+                    cleanup=not args.no_cleanup,
+                    pipeline=(
+                        PipelineLimits(decoders=args.jobs) if args.pipeline else None
+                    ),
+                )
+                rows.append(row)
+
+        print_report(corpus, rows, run_report)
+        if args.json:
+            report = {
+                "corpus": corpus,
+                "options": {
+                    "count": args.count,
+                    "seed": args.seed,
+                    "jobs": args.jobs,
+                    "executor": args.executor,
+                    "sort_by_day": args.sort_by_day,
+                    "pipeline": args.pipeline,
+                    "cleanup": not args.no_cleanup,
+                    "cross_device": os.stat(workdir).st_dev
+                    != os.stat(destination_root).st_dev,
+                },
+                "results": rows,
+                "run_report": run_report,
+            }
+            args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    finally:
+        if not args.keep:
+            for path in runs + [corpus_dir]:
+                shutil.rmtree(path, ignore_errors=True)
+            if args.workdir is None:
+                shutil.rmtree(workdir, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# Startup import time benchmark for PhotoOrganizer.
+# Imports each entry module in a fresh interpreter several times and compares the
+# median import time with a budget. Also checks that the heavy metadata backends
+# (Pillow, pillow_heif, pymediainfo, NumPy) are not imported at startup: they are
+# loaded the first time a file needs them. Exits with 1 if a check fails.
+#
+# Usage: python benchmarks/bench_startup.py --repeat 7 --budget gui=400
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+# Median import time budget per module, in milliseconds. gui includes PyQt6.
+DEFAULT_BUDGETS_MS = {"PhotoOrganizer_v3": 80, "cli": 80, "gui": 250}
+
+# Modules that must only be imported once a file needs them
+LAZY_MODULES = ("PIL", "pillow_heif", "pymediainfo", "numpy")
+
+# Runs in the fresh interpreter: time one import, list the lazy modules it pulled in
+_PROBE = """
+import json, sys
+from time import perf_counter
+sys.path.insert(0, {src!r})
+start = perf_counter()
+import {module}
+seconds = perf_counter() - start
+loaded = [name for name in {lazy!r} if name in sys.modules]
+print(json.dumps({{"seconds": seconds, "loaded": loaded}}))
+"""
+
+
+def measure_import(module: str, repeat: int) -> tuple[list[float], list[str]]:
+    """Import a module in repeat fresh interpreters.
+
+    Returns:
+        tuple: (import times in ms, lazy modules loaded by the import)
+    """
+    # Qt needs no display to be imported, but keep it from looking for one
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    times = []
+    loaded: list[str] = []
+    for _ in range(repeat):
+        code = _PROBE.format(src=str(SRC_DIR), module=module, lazy=LAZY_MODULES)
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=SRC_DIR,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{result.stderr.strip()}")
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        times.append(probe["seconds"] * 1000)
+        loaded = probe["loaded"]
+    return times, loaded
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check the startup import time of the PhotoOrganizer modules."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="fresh interpreters per module"
+    )
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="MODULE=MS",
+        help="override the budget of a module, e.g. gui=400; repeatable",
+    )
+    parser.add_argument(
+        "--skip-gui", action="store_true", help="do not measure gui (no PyQt6)"
+    )
+    parser.add_argument("--json", type=Path, help="write the results to a JSON file")
+    args = parser.parse_args(argv)
+
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for item in args.budget:
+        module, _, value = item.partition("=")
+        if module not in budgets or not value:
+            parser.error(f"--budget expects MODULE=MS with MODULE in {list(budgets)}")
+        budgets[module] = float(value)
+    if args.skip_gui:
+        del budgets["gui"]
+
+    rows = []
+    failed = False
+    print(f"{'module':<20}{'median ms':>10}{'max ms':>10}{'budget':>10}  result")
+    for module, budget in budgets.items():
+        times, loaded = measure_import(module, args.repeat)
+        median = statistics.median(times)
+        problems = []
+        if median > budget:
+            problems.append("over budget")
+        if loaded:
+            problems.append("imports " + ", ".join(loaded))
+        failed = failed or bool(problems)
+        print(
+            f"{module:<20}{median:>10.1f}{max(times):>10.1f}{budget:>10.0f}  "
+            f"{'; '.join(problems) or 'ok'}"
+        )
+        rows.append(
+            {
+                "module": module,
+                "median_ms": median,
+                "max_ms": max(times),
+                "budget_ms": budget,
+                "lazy_modules_loaded": loaded,
+                "ok": not problems,
+            }
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+# Deterministic synthetic media corpus for the benchmarks.
+# The same count and seed always produce the same tree: JPEGs with EXIF dates, PNGs
+# without metadata, HEIC images, MP4/MOV files with date atoms, zero-byte files and
+# the hidden/system files that cameras and operating systems leave behind.
+
+import os
+import random
+import struct
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Union
+
+from PIL import Image
+
+try:
+    from pillow_heif import register_heif_opener
+
+    register_heif_opener()
+    HEIC_SUPPORTED = True
+except ImportError:  # HEIC files are generated as JPEGs instead
+    HEIC_SUPPORTED = False
+
+# Share of the corpus per file kind
+KIND_WEIGHTS = [
+    ("jpeg", 0.60),
+    ("jpeg_datetime", 0.05),  # Only the IFD0 DateTime tag, no DateTimeOriginal
+    ("png", 0.08),
+    ("heic", 0.05),
+    ("mp4", 0.12),
+    ("mov", 0.06),
+    ("empty", 0.04),
+]
+
+# Kinds the engine always dates, the only ones in the folders that end up empty
+DATABLE_KINDS = {"jpeg", "jpeg_datetime", "heic", "mp4", "mov"}
+
+# Every Nth folder holds only datable media and hidden files, so the cleanup phase
+# has folders to remove once their media is moved out
+DATABLE_FOLDER_EVERY = 4
+
+# Hidden and system files left in camera / synced folders
+HIDDEN_FILES = [".DS_Store", "Thumbs.db", "desktop.ini"]
+
+_MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+_FIRST_DATE = datetime(2015, 1, 1, tzinfo=timezone.utc)
+_DATE_RANGE_DAYS = 10 * 365
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(payload)) + box_type + payload
+
+
+def _mvhd(created: datetime) -> bytes:
+    """Version 0 movie header with the creation and modification times set."""
+    seconds = int((created - _MP4_EPOCH).total_seconds())
+    body = b"\0\0\0\0" + struct.pack(">IIII", seconds, seconds, 1000, 0) + b"\0" * 80
+    return _box(b"mvhd", body)
+
+
+def _udta_day(created: datetime) -> bytes:
+    """QuickTime user data with a ©day recording date."""
+    value = created.strftime("%Y-%m-%dT%H:%M:%S+0000").encode()
+    return _box(b"udta", _box(b"\xa9day", struct.pack(">HH", len(value), 0x55C4) + value))
+
+
+def _write_video(path: Path, created: datetime, payload: bytes, rng: random.Random):
+    """Write an MP4/MOV with a media payload and a moov box holding the dates."""
+    brand = b"qt  \0\0\0\0qt  " if path.suffix == ".mov" else b"isom\0\0\2\0isomiso2mp41"
+    moov_children = _mvhd(created)
+    if rng.random() < 0.5:
+        moov_children += _udta_day(created)
+    moov = _box(b"moov", moov_children)
+    mdat = _box(b"mdat", payload)
+    # Phones write moov first for streaming, cameras often write it at the end
+    body = moov + mdat if rng.random() < 0.5 else mdat + moov
+    path.write_bytes(_box(b"ftyp", brand) + body)
+
+
+def _make_image(rng: random.Random, size: tuple[int, int]) -> Image.Image:
+    """Smooth random noise: compresses like a photo, unlike pure noise or flat color."""
+    small = (max(size[0] // 16, 1), max(size[1] // 16, 1))
+    noise = Image.frombytes("RGB", small, rng.randbytes(small[0] * small[1] * 3))
+    return noise.resize(size, Image.Resampling.BILINEAR)
+
+
+def _exif(created: datetime, original: bool) -> Image.Exif:
+    exif = Image.Exif()
+    value = created.strftime("%Y:%m:%d %H:%M:%S")
+    exif[0x010F] = "Benchmark"  # Make
+    exif[0x0132] = value  # DateTime
+    if original:
+        exif.get_ifd(0x8769)[0x9003] = value  # DateTimeOriginal
+    return exif
+
+
+def generate_corpus(
+    root: Union[str, Path],
+    count: int = 1000,
+    seed: int = 0,
+    image_size: tuple[int, int] = (1024, 768),
+    video_bytes: int = 512 * 1024,
+    files_per_dir: int = 100,
+) -> dict:
+    """Generate a synthetic media tree.
+
+    Args:
+        root: Directory to create the files in (created if missing)
+        count: Number of media files, hidden/system files not included
+        seed: Random seed, the same seed always produces the same tree
+        image_size: Pixel size of the generated images
+        video_bytes: Size of the media payload of each video
+        files_per_dir: Number of media files per folder
+
+    Returns:
+        dict: "files" and "bytes" of the media files, "hidden" files and a
+        "kinds" count per file kind, and "emptied_folders", the folders left with
+        only hidden files after the media is moved
+    """
+    root = Path(root)
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in KIND_WEIGHTS]
+    weights = [weight for _, weight in KIND_WEIGHTS]
+    # One shared block of video data, sliced per file
+    video_data = rng.randbytes(video_bytes + 4096)
+
+    datable = [kind in DATABLE_KINDS for kind in kinds]
+    datable_weights = [w if ok else 0 for w, ok in zip(weights, datable)]
+
+    stats = {
+        "files": 0,
+        "bytes": 0,
+        "hidden": 0,
+        "kinds": Counter(),
+        "emptied_folders": 0,
+    }
+    folder = root
+    folder_weights = weights
+    for index in range(count):
+        if index % files_per_dir == 0:
+            folder_index = index // files_per_dir
+            # Mix flat camera folders with nested, manually sorted ones
+            if folder_index % 3 == 2:
+                folder = root / "Sorted" / f"Event {folder_index:03d}" / "Camera"
+            else:
+                folder = root / "DCIM" / f"{100 + folder_index:03d}MEDIA"
+            folder.mkdir(parents=True, exist_ok=True)
+            if folder_index % DATABLE_FOLDER_EVERY == 1:
+                folder_weights = datable_weights
+                stats["emptied_folders"] += 1
+            else:
+                folder_weights = weights
+            for name in HIDDEN_FILES:
+                if rng.random() < 0.5:
+                    (folder / name).write_bytes(rng.randbytes(rng.randint(1, 4096)))
+                    stats["hidden"] += 1
+
+        kind = rng.choices(kinds, folder_weights)[0]
+        if kind == "heic" and not HEIC_SUPPORTED:
+            kind = "jpeg"
+        created = _FIRST_DATE + timedelta(
+            seconds=rng.randrange(_DATE_RANGE_DAYS * 86400)
+        )
+        stem = f"IMG_{index:06d}"
+
+        if kind in ("jpeg", "jpeg_datetime"):
+            path = folder / f"{stem}.jpg"
+            image = _make_image(rng, image_size)
+            image.save(path, quality=90, exif=_exif(created, kind == "jpeg"))
+        elif kind == "png":
+            path = folder / f"{stem}.png"
+            _make_image(rng, image_size).save(path, compress_level=1)
+        elif kind == "heic":
+            path = folder / f"{stem}.heic"
+            # HEVC encoding is slow, half-size images keep generation time down
+            image = _make_image(rng, (image_size[0] // 2, image_size[1] // 2))
+            image.save(path, format="HEIF", quality=50, exif=_exif(created, True))
+        elif kind in ("mp4", "mov"):
+            path = folder / f"VID_{index:06d}.{kind}"
+            offset = rng.randrange(4096)
+            _write_video(path, created, video_data[offset : offset + video_bytes], rng)
+        else:
+            path = folder / f"{stem}.jpg"
+            path.write_bytes(b"")
+
+        # AppleDouble companion files, as left by macOS on exFAT cards
+        if rng.random() < 0.02:
+            (folder / f"._{path.name}").write_bytes(rng.randbytes(4096))
+            stats["hidden"] += 1
+
+        timestamp = created.timestamp()
+        os.utime(path, (timestamp, timestamp))
+        stats["files"] += 1
+        stats["bytes"] += path.stat().st_size
+        stats["kinds"][kind] += 1
+
+    stats["kinds"] = dict(sorted(stats["kinds"].items()))
+    return stats
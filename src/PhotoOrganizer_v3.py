@@ -5,21 +5,50 @@
 
 
 from pathlib import Path
-from typing import Union, Optional
+from typing import Iterable, NamedTuple, Union, Optional
 import os
+import errno
 import shutil
-from datetime import datetime, date
+from datetime import date
+import json
 import logging
-import ctypes
+import fnmatch
+import re
+import stat
+import heapq
 from time import perf_counter
-
-from PIL import Image
-from PIL.ExifTags import TAGS
-from pymediainfo import MediaInfo
-from pillow_heif import register_heif_opener  # Import HEIF support for Pillow
-
-# Register HEIF opener with Pillow
-register_heif_opener(thumbnails=False)
+import threading
+from queue import Empty, Full, Queue
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from exif_reader import HEADER_EXTENSIONS, read_exif_dates
+from date_parser import parse_exif_datetime, parse_video_datetime
+from video_reader import VIDEO_HEADER_EXTENSIONS, read_video_date
+from metadata_cache import MISS, MetadataCache
+from move_engine import MoveEngine
+import move_plan
+from move_plan import PlanEntry, PlanWriter, iter_plan_entries, read_plan_header
+from move_journal import JournalState, MoveJournal, load_journal
+from folder_watcher import DEFAULT_POLL_INTERVAL, DEFAULT_SETTLE_SECONDS, FolderWatcher
+from destination_catalog import DestinationCatalog
+from duplicates import find_duplicate_groups, full_hash
+from near_duplicates import DEFAULT_MAX_DISTANCE, dhash, find_similar_pairs
+from run_report import RunReport
+from eta_estimator import EtaEstimator
+
+# Pillow, pillow_heif and pymediainfo are imported on first use, see lazy_backends
+from lazy_backends import exif_tag_names, media_info, pil_image
+
+# Marks the end of a background source scan
+_SCAN_DONE = object()
+
+# Windows file attributes of hidden/system entries (st_file_attributes only exists
+# on Windows)
+_HIDDEN_ATTRIBUTES = (
+    stat.FILE_ATTRIBUTE_HIDDEN | stat.FILE_ATTRIBUTE_SYSTEM if os.name == "nt" else 0
+)
 
 # Configure logging
 logging.basicConfig(
@@ -27,10 +56,30 @@ logging.basicConfig(
 )
 
 
+class FileRecord(NamedTuple):
+    """A file found by the source scan, with the stat data the scan already read."""
+
+    path: Path
+    size: int
+    mtime_ns: int
+    dev: int
+    ino: int
+
+
+class PipelineLimits(NamedTuple):
+    """Concurrency limits of the staged pipeline engine, see pipeline.py."""
+
+    readers: int = 16  # Concurrent header reads
+    decoders: int = 2  # Workers decoding files with Pillow or MediaInfo
+    writers: int = 4  # Destination folders written to at the same time
+    queue_size: int = 256  # Files waiting between two stages
+
+
 def debug_exif_tags(exif_data):
     """Helper function to debug EXIF tags"""
+    tags = exif_tag_names()
     for tag_id, value in exif_data.items():
-        tag_name = TAGS.get(tag_id)
+        tag_name = tags.get(tag_id)
         tag_type = type(value).__name__
         logging.debug(
             "EXIF tag: %s (%s) - type: %s - value: %s",
@@ -73,6 +122,38 @@ class PhotoOrganizer:
     # Combined set of all supported file extensions
     SUPPORTED_EXTENSIONS = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
 
+    # Camera RAW formats, much larger than other images
+    RAW_EXTENSIONS = {".cr2", ".arw", ".dng"}
+
+    # System files that are never processed
+    EXCLUDED_FILES = {"Thumbs.db", "desktop.ini"}
+
+    # Hidden/system files and folders left by operating systems and NAS indexers,
+    # matched case-insensitively with fnmatch. Files starting with "." are always hidden.
+    HIDDEN_PATTERNS = [
+        ".DS_Store",
+        "._*",
+        "Thumbs.db",
+        "ehthumbs.db",
+        "desktop.ini",
+        "~$*",
+        "@eaDir",
+        "$RECYCLE.BIN",
+        "System Volume Information",
+    ]
+
+    # Folders of generated system data (thumbnails, indexes, resource forks) that
+    # the cleanup removes with their contents. Other hidden folders are only
+    # removed once each of their files was approved.
+    JUNK_FOLDERS = [
+        "@eaDir",
+        "__MACOSX",
+        ".thumbnails",
+        ".AppleDouble",
+        ".Spotlight-V100",
+        ".fseventsd",
+    ]
+
     def __init__(self):
         """Initialize the PhotoOrganizer with default values."""
         self.total_files: int = 0
@@ -82,8 +163,21 @@ class PhotoOrganizer:
         self._debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
         self.total_processing_time: float = 0.0
         self.average_time_per_file: float = 0.0
-        self.list_of_processing_times: list[float] = []
+        self.eta: EtaEstimator = EtaEstimator()
         self.estimated_time_remaining: float = -1
+        self.scan_complete: bool = False
+        self.move_engine: Optional[MoveEngine] = None
+        self.catalog: Optional[DestinationCatalog] = None
+        self.duplicate_files: list[tuple[str, str]] = []
+        self.compute_perceptual_hash: bool = False
+        self.perceptual_hashes: dict[str, int] = {}
+        self.near_duplicate_pairs: list[tuple[str, str, int]] = []
+        self.run_report: RunReport = RunReport()
+        # Source folders that files were moved out of during the run
+        self.touched_dirs: set[str] = set()
+        # Journal of the current run, if one was requested
+        self.journal: Optional[MoveJournal] = None
+        self.set_hidden_patterns(self.HIDDEN_PATTERNS)
 
     def is_valid_file(self, file: Path) -> bool:
         """Check if file should be processed."""
@@ -96,8 +190,7 @@ class PhotoOrganizer:
             return False
 
         # Skip excluded system files
-        excluded_files = {"Thumbs.db", "desktop.ini"}
-        if file.name in excluded_files:
+        if file.name in self.EXCLUDED_FILES:
             return False
 
         # Check file extension against supported formats (class-level)
@@ -105,7 +198,7 @@ class PhotoOrganizer:
             return False
 
         # Skip empty files (only check for non-RAW formats to avoid expensive stat calls)
-        if file.suffix.lower() not in {".cr2", ".arw", ".dng"}:
+        if file.suffix.lower() not in self.RAW_EXTENSIONS:
             try:
                 if file.stat().st_size == 0:
                     return False
@@ -114,59 +207,217 @@ class PhotoOrganizer:
 
         return True
 
+    def file_class(self, file: Path) -> str:
+        """Group a file with others of similar throughput for the time estimate."""
+        ext = file.suffix.lower()
+        if ext in self.VIDEO_EXTENSIONS:
+            return "video"
+        if ext in self.RAW_EXTENSIONS:
+            return "raw"
+        return "image"
+
+    def scan_entry(self, entry: os.DirEntry) -> Optional[FileRecord]:
+        """Classify a directory entry using only its name and cached stat data.
+
+        Same rules as is_valid_file(), but without extra stat calls: the name and
+        suffix come from the entry and DirEntry.stat() is cached by os.scandir.
+
+        Returns:
+            Optional[FileRecord]: The file record, or None if the file should be skipped
+        """
+        name = entry.name
+        # Skip hidden/system files
+        if name.startswith((".", "~$")) or name in self.EXCLUDED_FILES:
+            return None
+
+        # Check file extension against supported formats (class-level)
+        if os.path.splitext(name)[1].lower() not in self.SUPPORTED_EXTENSIONS:
+            return None
+
+        try:
+            if not entry.is_file():
+                return None
+            st = entry.stat()
+        except OSError:
+            return None
+
+        # Skip empty files
+        if st.st_size == 0:
+            return None
+
+        return FileRecord(
+            Path(entry.path), st.st_size, st.st_mtime_ns, st.st_dev, st.st_ino
+        )
+
+    def iter_source_files(self, source_path: Path, exclude: Optional[Path] = None):
+        """Walk the source folder and yield records of the valid files as they are found.
+
+        Directory listing and entry validation times are recorded in run_report.
+
+        Args:
+            source_path: The directory to scan
+            exclude: Optional directory to skip, e.g. a destination inside the source
+
+        Yields:
+            FileRecord: One record per file to process, in top-down walk order
+        """
+        excluded = os.path.normcase(os.path.abspath(exclude)) if exclude else None
+        stack = [os.fspath(source_path)]
+        report = self.run_report
+        while stack:
+            current_dir = stack.pop()
+            records = []
+            subdirs = []
+            dir_start = perf_counter()
+            try:
+                # Collect the directory first so no handle stays open while files move
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            # System folders such as @eaDir hold thumbnails, not photos
+                            if self._hidden_regex.match(entry.name):
+                                continue
+                            if (
+                                excluded is None
+                                or os.path.normcase(os.path.abspath(entry.path))
+                                != excluded
+                            ):
+                                subdirs.append(entry.path)
+                            continue
+                        entry_start = perf_counter()
+                        record = self.scan_entry(entry)
+                        # Rejected entries (hidden, unsupported, empty) count as failed
+                        report.add(
+                            "validate",
+                            perf_counter() - entry_start,
+                            failed=record is None,
+                        )
+                        if record is not None:
+                            records.append(record)
+            except OSError as e:
+                logging.warning("Failed to scan %s: %s", current_dir, e)
+                report.add("scan", perf_counter() - dir_start, failed=True)
+                continue
+            report.add(
+                "scan",
+                perf_counter() - dir_start,
+                sum(record.size for record in records),
+            )
+            yield from records
+            stack.extend(reversed(subdirs))
+
+    def stream_source_files(
+        self,
+        source_path: Path,
+        exclude: Optional[Path] = None,
+        max_queued: int = 10000,
+    ):
+        """Scan the source folder in a background thread and yield records as they arrive.
+
+        total_files is updated while the scan runs and scan_complete is set once
+        the walk has finished. At most `max_queued` paths are held in memory.
+
+        Args:
+            source_path: The directory to scan
+            exclude: Optional directory to skip, e.g. a destination inside the source
+            max_queued: Maximum number of found files waiting to be processed
+        """
+        found = Queue(maxsize=max_queued)
+        stop = threading.Event()
+        scan_error: list[BaseException] = []
+        self.total_files = 0
+        self.scan_complete = False
+
+        def scan():
+            try:
+                for record in self.iter_source_files(source_path, exclude):
+                    # Count before queueing so progress never exceeds the total
+                    self.total_files += 1
+                    self.eta.add_pending(self.file_class(record.path), record.size)
+                    # Block while the queue is full, unless the consumer stopped
+                    while not stop.is_set():
+                        try:
+                            found.put(record, timeout=0.1)
+                            break
+                        except Full:
+                            continue
+                    if stop.is_set():
+                        return
+            except Exception as e:
+                scan_error.append(e)
+            finally:
+                self.scan_complete = True
+                found.put(_SCAN_DONE)
+
+        scanner = threading.Thread(target=scan, name="source-scan", daemon=True)
+        scanner.start()
+        try:
+            while True:
+                record = found.get()
+                if record is _SCAN_DONE:
+                    break
+                yield record
+        finally:
+            # Unblock the scanner if processing stopped early
+            stop.set()
+            while scanner.is_alive():
+                try:
+                    found.get(timeout=0.1)
+                except Empty:
+                    pass
+        if scan_error:
+            raise scan_error[0]
+
     def get_file_date(self, file: Path) -> Optional[date]:
         """Get creation date from file based on type.
         Returns:
             Optional[date]: The date extracted from the file's metadata, or None if no date could be found
+        Raises:
+            OSError: If the file could not be read, see _read_file_date()
+        """
+        return self._read_file_date(file)[0]
+
+    def _read_file_date(
+        self, file: Path, skip_headers: bool = False
+    ) -> tuple[Optional[date], str]:
+        """Get the creation date of a file and the name of the reader that was used.
+
+        Args:
+            file: The file to read
+            skip_headers: Go straight to Pillow/MediaInfo, for files whose headers
+                were already read by _read_header_date() without settling the date
+
+        Returns:
+            tuple: (date or None, backend) where backend is "exif_header", "pillow",
+            "video_header", "mediainfo" or "none" for unsupported files. None means
+            the file was read and holds no usable date.
+
+        Raises:
+            OSError: If the file could not be read (missing, permissions, network
+                errors), so the failure is not mistaken for a file without a date
         """
         # image handling
         ext = file.suffix.lower()
         if ext in self.IMAGE_EXTENSIONS:
-            try:
-                # Ensure the file handle is closed promptly for large batches
-                with Image.open(file) as image:
-                    exif_data = image.getexif()
-                if exif_data:
-                    # Debug EXIF tags only when debug logging is enabled
-                    if self._debug_enabled:
-                        debug_exif_tags(exif_data)
-
-                    # Try DateTimeOriginal first (most reliable)
-                    sub_ifd = exif_data.get_ifd(0x8769)  # EXIF Sub-IFD
-                    if sub_ifd and 36867 in sub_ifd:
-                        if self._debug_enabled:
-                            debug_exif_tags(sub_ifd)
-                        try:
-                            return datetime.strptime(
-                                sub_ifd[36867], "%Y:%m:%d %H:%M:%S"
-                            ).date()
-                        except ValueError:
-                            logging.warning(
-                                "Invalid DateTimeOriginal format: %s", sub_ifd[36867]
-                            )
-
-                    # Fallback to DateTime tag
-                    logging.debug("Falling back to DateTime tag")
-                    if 306 in exif_data:
-                        try:
-                            return datetime.strptime(
-                                exif_data[306], "%Y:%m:%d %H:%M:%S"
-                            ).date()
-                        except ValueError:
-                            if self._debug_enabled:
-                                logging.warning(
-                                    "Invalid DateTime format: %s", exif_data[306]
-                                )
-                else:
-                    logging.info("No EXIF data found in image: %s", file.name)
-
-            except Exception as e:
-                logging.warning("Error reading image metadata from %s: %s", file, e)
+            file_date, _, backend = self._read_image_metadata(
+                file, skip_headers=skip_headers
+            )
+            return file_date, backend
 
         # video handling
-        elif ext in self.VIDEO_EXTENSIONS:
+        if ext in self.VIDEO_EXTENSIONS:
+            # Fast path: read the date straight from the container headers
+            if not skip_headers:
+                header = self._read_header_date(file)
+                if header is not None:
+                    return header
+
+            # Fall back to a full MediaInfo analysis
             try:
-                video_info = MediaInfo.parse(file)
+                video_info = media_info().parse(file)
+                # MediaInfo reports every file it can open with a General track
+                if not any(t.track_type == "General" for t in video_info.tracks):
+                    raise OSError(errno.EIO, "MediaInfo could not read the file", file)
                 for track in video_info.tracks:
                     if track.track_type == "General":
                         # Try different date fields in order of reliability
@@ -179,26 +430,9 @@ class PhotoOrganizer:
                             date_str = getattr(track, date_field)
                             if date_str is not None:
                                 try:
-                                    # Clean up and standardize date string
-                                    date_str = date_str.replace(" UTC", "").replace(
-                                        "UTC ", ""
-                                    )
-
-                                    # Try common formats
-                                    formats = [
-                                        "%Y-%m-%d %H:%M:%S",
-                                        "%Y-%m-%dT%H:%M:%S.%fZ",
-                                        "%Y-%m-%dT%H:%M:%SZ",
-                                        "%Y-%m-%d",
-                                    ]
-
-                                    for fmt in formats:
-                                        try:
-                                            return datetime.strptime(
-                                                date_str, fmt
-                                            ).date()
-                                        except ValueError:
-                                            continue
+                                    parsed = parse_video_datetime(date_str)
+                                    if parsed is not None:
+                                        return parsed, "mediainfo"
                                 except Exception as e:
                                     logging.warning(
                                         "Failed parsing %s: %s", date_field, e
@@ -208,288 +442,1035 @@ class PhotoOrganizer:
                         logging.warning(
                             "No valid date found in video metadata: %s", file.name
                         )
+            except OSError:
+                raise
             except Exception as e:
                 logging.error("Error reading metadata from %s: %s", file, e)
+            return None, "mediainfo"
+        return None, "none"
+
+    def _read_header_date(self, file: Path) -> Optional[tuple[Optional[date], str]]:
+        """Read a file date from its headers only, without Pillow or MediaInfo.
+
+        Returns:
+            tuple: (date or None, "exif_header" or "video_header"), or None when
+            the headers do not settle it and the file has to be decoded
+        """
+        ext = file.suffix.lower()
+        if ext in HEADER_EXTENSIONS:
+            exif_dates = read_exif_dates(file)
+            if exif_dates is None:
                 return None
+            date_time_original, date_time = exif_dates
+            if date_time_original is None and date_time is None:
+                logging.info("No EXIF data found in image: %s", file.name)
+                return None, "exif_header"
+            return (
+                self._date_from_exif_strings(date_time_original, date_time),
+                "exif_header",
+            )
+        if ext in VIDEO_HEADER_EXTENSIONS:
+            video_date = read_video_date(file)
+            if video_date is not None:
+                return video_date, "video_header"
+        return None
+
+    def get_image_metadata(
+        self, file: Path, perceptual_hash: bool = False
+    ) -> tuple[Optional[date], Optional[int]]:
+        """Get the creation date of an image and, optionally, its perceptual hash.
+
+        The hash is computed from the same Image.open as the EXIF data, so asking
+        for it skips the header-only fast path.
+
+        Returns:
+            tuple: (date or None, 64-bit dHash or None)
+        """
+        file_date, image_hash, _ = self._read_image_metadata(file, perceptual_hash)
+        return file_date, image_hash
+
+    def _read_image_metadata(
+        self, file: Path, perceptual_hash: bool = False, skip_headers: bool = False
+    ) -> tuple[Optional[date], Optional[int], str]:
+        """get_image_metadata() that also names the reader used.
+
+        skip_headers opens the file with Pillow without trying the header reader.
 
-    def has_regular_files(self, path: Path) -> bool:
-        """Check if directory contains any non-hidden, non-system files"""
+        Returns:
+            tuple: (date or None, 64-bit dHash or None, "exif_header" or "pillow")
+        """
+        ext = file.suffix.lower()
+        image_hash = None
         try:
-            for entry in os.scandir(path):
-                if entry.is_file():
-                    # Check if file is not hidden and not system
-                    attrs = ctypes.windll.kernel32.GetFileAttributesW(entry.path)
-                    if attrs != -1 and not (
-                        attrs & 2
-                    ):  # Hidden=2, System=4 "or attrs & 4"
-                        return True
-            return False
+            # Fast path: read the date tags straight from the file header
+            if not perceptual_hash and not skip_headers:
+                header = self._read_header_date(file)
+                if header is not None:
+                    return header[0], None, header[1]
+
+            # Ensure the file handle is closed promptly for large batches
+            with pil_image(ext).open(file) as image:
+                exif_data = image.getexif()
+                if perceptual_hash:
+                    try:
+                        image_hash = dhash(image)
+                    except Exception as e:
+                        logging.warning("Failed to hash image %s: %s", file, e)
+            if exif_data:
+                # Debug EXIF tags only when debug logging is enabled
+                if self._debug_enabled:
+                    debug_exif_tags(exif_data)
+
+                # Try DateTimeOriginal first (most reliable)
+                sub_ifd = exif_data.get_ifd(0x8769)  # EXIF Sub-IFD
+                if sub_ifd and self._debug_enabled:
+                    debug_exif_tags(sub_ifd)
+                return (
+                    self._date_from_exif_strings(
+                        sub_ifd.get(36867) if sub_ifd else None, exif_data.get(306)
+                    ),
+                    image_hash,
+                    "pillow",
+                )
+            else:
+                logging.info("No EXIF data found in image: %s", file.name)
+
+        except Exception as e:
+            # Pillow reports undecodable images as OSError without an errno
+            if isinstance(e, OSError) and e.errno is not None:
+                raise
+            logging.warning("Error reading image metadata from %s: %s", file, e)
+        return None, image_hash, "pillow"
+
+    def _date_from_exif_strings(
+        self, date_time_original: Optional[str], date_time: Optional[str]
+    ) -> Optional[date]:
+        """Parse the EXIF DateTimeOriginal tag, falling back to the DateTime tag.
+
+        Returns:
+            Optional[date]: The parsed date, or None if neither tag holds a valid date
+        """
+        # Try DateTimeOriginal first (most reliable)
+        if date_time_original is not None:
+            parsed = parse_exif_datetime(date_time_original)
+            if parsed is not None:
+                return parsed
+            logging.warning("Invalid DateTimeOriginal format: %s", date_time_original)
+
+        # Fallback to DateTime tag
+        logging.debug("Falling back to DateTime tag")
+        if date_time is not None:
+            parsed = parse_exif_datetime(date_time)
+            if parsed is not None:
+                return parsed
+            if self._debug_enabled:
+                logging.warning("Invalid DateTime format: %s", date_time)
+        return None
+
+    def set_hidden_patterns(self, patterns: Iterable[str]) -> None:
+        """Set the name patterns of hidden/system files and folders."""
+        self.hidden_patterns = list(patterns)
+        self._hidden_regex = re.compile(
+            "|".join(fnmatch.translate(pattern) for pattern in self.hidden_patterns)
+            or "(?!)",  # No patterns: match nothing
+            re.IGNORECASE,
+        )
+        self._hidden_pattern_regexes = [
+            (pattern, re.compile(fnmatch.translate(pattern), re.IGNORECASE))
+            for pattern in self.hidden_patterns
+        ]
+        self._junk_folders = {name.lower() for name in self.JUNK_FOLDERS}
+
+    def is_hidden_entry(self, entry: os.DirEntry) -> bool:
+        """Check if a directory entry is a hidden or system file or folder
+
+        Uses the name and, on Windows, the attributes that os.scandir already
+        cached with the entry, so no extra system call is made. Folders only count
+        as hidden by pattern or attribute, not for a leading "."
+        """
+        name = entry.name
+        if self._hidden_regex.match(name):
+            return True
+        try:
+            if name.startswith(".") and not entry.is_dir(follow_symlinks=False):
+                return True
+            if _HIDDEN_ATTRIBUTES:
+                attrs = entry.stat(follow_symlinks=False).st_file_attributes
+                return bool(attrs & _HIDDEN_ATTRIBUTES)
         except OSError:
-            return False
+            return True  # Unreadable entries are never regular files
+        return False
+
+    def is_junk_folder(self, path: Union[str, Path]) -> bool:
+        """Check if a folder is generated system data, removed with its contents."""
+        return os.path.basename(path).lower() in self._junk_folders
+
+    def _remove_path(self, path: str) -> None:
+        """Remove a file, or a junk folder with its contents."""
+        if os.path.isdir(path) and not os.path.islink(path):
+            if not self.is_junk_folder(path):
+                raise OSError(f"Not a system folder, not removing its contents: {path}")
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
 
-    def delete_file_with_confirmation(
-        self, file_path: str, log_callback=None, remove_confirmation_callback=None
-    ) -> None:
-        """Delete a file with confirmation
+    def hidden_pattern_of(self, path: Union[str, Path]) -> str:
+        """Return the HIDDEN_PATTERNS entry a hidden file matches, used to group files.
+
+        Returns:
+            str: The pattern, or "Other hidden files" for dotfiles and files that
+            are only hidden by their attributes
+        """
+        name = os.path.basename(path)
+        for pattern, regex in self._hidden_pattern_regexes:
+            if regex.match(name):
+                return pattern
+        return "Other hidden files"
+
+    def find_removable_folders(
+        self, root: Path, folders: Optional[Iterable[Union[str, Path]]] = None
+    ) -> list[tuple[str, list[str]]]:
+        """Find the folders holding only hidden/system files, without removing anything.
+
+        A folder is removable when every entry is a hidden/system file or folder,
+        or a removable subfolder.
+
+        Args:
+            root: The root directory, never removed itself
+            folders: Optional folders to start from, e.g. those files were moved out
+                of. Only these and their ancestors up to root are checked, a parent
+                only after all of its queued subfolders. When None the whole tree
+                under root is checked.
+
+        Returns:
+            list: (folder, hidden files to remove first) pairs, deepest folders first
+        """
+        root_path = os.path.normcase(os.path.abspath(root))
+        removable = []
+        removable_paths: set[str] = set()
+        # Folder -> whether it is removable, for folders already checked
+        checked: dict[str, bool] = {}
+
+        def check(path: str) -> bool:
+            key = os.path.normcase(os.path.abspath(path))
+            if key in checked:
+                return checked[key]
+            hidden_files = self._hidden_contents(path, removable_paths, check)
+            checked[key] = hidden_files is not None
+            if hidden_files is None:
+                return False
+            removable.append((path, hidden_files))
+            removable_paths.add(key)
+            return True
+
+        if folders is None:
+            # Bottom-up: every folder is checked after its subfolders
+            for current_dir, _, _ in os.walk(root, topdown=False):
+                if os.path.normcase(os.path.abspath(current_dir)) != root_path:
+                    check(current_dir)
+            return removable
+
+        # Deepest folders first, so children are decided before their parent
+        queue = []
+        queued = set()
+        for folder in folders:
+            path = os.path.normcase(os.path.abspath(folder))
+            if path not in queued and path.startswith(root_path + os.sep):
+                queued.add(path)
+                heapq.heappush(queue, (-path.count(os.sep), path))
+        while queue:
+            _, path = heapq.heappop(queue)
+            if not check(path):
+                continue
+            # The parent may be removable too. It is queued at its own depth, so
+            # any of its subfolders still queued are checked before it
+            parent = os.path.dirname(path)
+            if parent != root_path and parent not in queued:
+                queued.add(parent)
+                heapq.heappush(queue, (-parent.count(os.sep), parent))
+        return removable
+
+    def _hidden_contents(
+        self, path: str, removable_paths: set[str], check_folder
+    ) -> Optional[list[str]]:
+        """List the hidden/system entries of a folder with a single os.scandir call.
+
+        Junk folders are listed as a whole. Other hidden folders are checked like
+        any folder with check_folder, so each of their files is reviewed.
+
+        Returns:
+            Optional[list[str]]: The hidden entries, or None if the folder holds
+            anything else than hidden entries and removable subfolders
+        """
+        folder_start = perf_counter()
+        hidden_files = []
+        hidden_folders = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    if is_dir and os.path.normcase(
+                        os.path.abspath(entry.path)
+                    ) in removable_paths:
+                        continue
+                    if is_dir and self.is_junk_folder(entry.path):
+                        hidden_files.append(entry.path)
+                    elif not self.is_hidden_entry(entry):
+                        hidden_files = None
+                        break
+                    elif is_dir:
+                        hidden_folders.append(entry.path)
+                    else:
+                        hidden_files.append(entry.path)
+        except OSError as e:
+            logging.warning("Failed to scan %s: %s", path, e)
+            hidden_files = None
+        self.run_report.add("cleanup_scan", perf_counter() - folder_start)
+        if hidden_files is None:
+            return None
+        # Checked after the scan, so the timing above only counts this folder
+        for folder in hidden_folders:
+            if not check_folder(folder):
+                return None
+        return hidden_files
+
+    def confirm_removals(
+        self,
+        file_paths: list[str],
+        remove_confirmation_callback=None,
+        removal_review_callback=None,
+    ) -> set[str]:
+        """Ask once which hidden/system files may be removed.
+
+        Args:
+            file_paths: All removal candidates
+            remove_confirmation_callback: Optional callback(file_path) -> bool, asked
+                per file when no review callback is given
+            removal_review_callback: Optional callback(file_paths) -> approved paths,
+                e.g. a dialog listing every candidate
+
+        Returns:
+            set: The approved file paths
+        """
+        if not file_paths:
+            return set()
+        if removal_review_callback:
+            return set(removal_review_callback(list(file_paths)))
+        if remove_confirmation_callback:
+            return {path for path in file_paths if remove_confirmation_callback(path)}
+
+        # No callbacks: a single prompt in the console
+        counts: dict[str, int] = {}
+        for path in file_paths:
+            pattern = self.hidden_pattern_of(path)
+            counts[pattern] = counts.get(pattern, 0) + 1
+        summary = ", ".join(f"{pattern} {count}" for pattern, count in counts.items())
+        confirm = ""
+        while confirm not in ["y", "n"]:
+            confirm = input(
+                f"Remove {len(file_paths)} hidden/system files ({summary})? (y/n): "
+            )
+        return set(file_paths) if confirm == "y" else set()
+
+    def delete_empty_folders(
+        self,
+        root: Path,
+        log_callback=None,
+        remove_confirmation_callback=None,
+        folders: Optional[Iterable[Union[str, Path]]] = None,
+        removal_review_callback=None,
+    ) -> int:
+        """Delete empty folders and their hidden/system files
+
+        All removal candidates are collected first and confirmed at once, then
+        the approved files and their folders are removed in bulk, deepest first.
+        A folder is only removed if all of its hidden files and subfolders went.
 
         Args:
-            file_path: The path of the file to delete
+            root: The root directory, never removed itself
             log_callback: Optional callback function to log messages
             remove_confirmation_callback: Optional callback function to confirm file removal
+            folders: Optional folders to start from, see find_removable_folders()
+            removal_review_callback: Optional callback that reviews all candidates
+                at once, see confirm_removals()
+
+        Returns:
+            int: The number of folders removed
         """
-        if remove_confirmation_callback:
-            # If a callback is provided, use it to ask for confirmation
-            confirm = remove_confirmation_callback(file_path)
-            if confirm:
+        removable = self.find_removable_folders(root, folders)
+        approved = self.confirm_removals(
+            [path for _, hidden_files in removable for path in hidden_files],
+            remove_confirmation_callback,
+            removal_review_callback,
+        )
+
+        counter = 0
+        # Folders whose parent has to stay because something in them stayed
+        kept: set[str] = set()
+        for folder, hidden_files in removable:
+            folder_start = perf_counter()
+            keep = folder in kept
+            for file_path in hidden_files:
+                if file_path not in approved:
+                    keep = True
+                    if log_callback:
+                        log_callback(f" • Skipped removing file: {file_path}")
+                    continue
                 try:
-                    os.remove(file_path)
+                    self._remove_path(file_path)
                     if log_callback:
                         log_callback(f" • Removed file: {file_path}")
                 except OSError as e:
+                    keep = True
                     if log_callback:
                         log_callback(f" • Failed to remove file {file_path}: {e}")
                     self.failed_files.append(
                         f" • removal hidden/system file: {file_path}"
                     )
-            else:
-                if log_callback:
-                    log_callback(f" • Skipped removing file: {file_path}")
-        else:
-            # If no callback, ask for confirmation in console
-            confirm = ""
-            while confirm not in ["y", "n"]:
-                confirm = input(f"Remove file {file_path}? (y/n): ")
-            if confirm == "y":
+            failed = False
+            if not keep:
                 try:
-                    os.remove(file_path)
-                    logging.info("Removed file: %s", file_path)
+                    os.rmdir(folder)
+                    counter += 1
+                    logging.debug("Removed empty folder: %s", folder)
                 except OSError as e:
-                    logging.warning("Failed to remove file %s: %s", file_path, e)
-            else:
-                logging.info("Skipped removing file: %s", file_path)
+                    logging.warning("Failed to remove %s: %s", folder, e)
+                    keep = failed = True
+            if keep:
+                kept.add(os.path.dirname(folder))
+            self.run_report.add("cleanup", perf_counter() - folder_start, failed=failed)
+        return counter
 
-    def delete_empty_folders(
-        self, root: Path, log_callback=None, remove_confirmation_callback=None
-    ) -> int:
-        """Recursively delete empty folders and their hidden/system files
+    def update_estimate_time_remaining(self) -> None:
+        """Estimate the time remaining from the remaining bytes and recent throughput.
+
+        Stays -1 until enough files were processed.
+        """
+        self.estimated_time_remaining = self.eta.estimate()
+
+    def _safe_get_file_date(
+        self, file: Path, skip_headers: bool = False
+    ) -> tuple[Optional[date], Optional[str], Optional[int], str, float]:
+        """Get the file date, returning any exception as a message instead of raising.
 
         Args:
-            root: The root directory to start searching for empty folders
-            log_callback: Optional callback function to log messages
-            remove_confirmation_callback: Optional callback function to confirm file removal
+            file: The file to read
+            skip_headers: Whether the headers were already read without a result,
+                see _read_file_date()
+
+        Returns:
+            tuple: (date or None, error message or None, perceptual hash or None,
+            backend used, extraction time in seconds)
         """
-        counter = 0
-        while True:
-            empty_found = False
-            for current_dir, subdirs, _ in os.walk(root, topdown=False):
-                for folder in subdirs:
-                    full_path = Path(current_dir) / Path(folder)
-                    try:
-                        # First check if directory has any regular files
-                        if not self.has_regular_files(full_path):
-                            # If no regular files, delete any hidden/system files
-                            for entry in os.scandir(full_path):
-                                if entry.is_file():
-                                    self.delete_file_with_confirmation(
-                                        entry.path,
-                                        log_callback=log_callback,
-                                        remove_confirmation_callback=remove_confirmation_callback,
-                                    )
-                            # Now try to remove the empty directory
-                            if not os.listdir(full_path):
-                                os.rmdir(full_path)
-                                counter += 1
-                                empty_found = True
-                                logging.debug("Removed empty folder: %s", full_path)
-
-                    except OSError as e:
-                        logging.warning("Failed to remove %s: %s", full_path, e)
-
-            if not empty_found:
-                logging.info("No more empty folders found.")
-                break  # Exit loop if no empty folders were found
-        return counter
+        start = perf_counter()
+        try:
+            ext = file.suffix.lower()
+            if self.compute_perceptual_hash and ext in self.IMAGE_EXTENSIONS:
+                file_date, image_hash, backend = self._read_image_metadata(
+                    file, perceptual_hash=True
+                )
+                return file_date, None, image_hash, backend, perf_counter() - start
+            file_date, backend = self._read_file_date(file, skip_headers)
+            return file_date, None, None, backend, perf_counter() - start
+        except Exception as e:
+            return None, str(e), None, "error", perf_counter() - start
 
-    def update_estimate_time_remaining(self) -> None:
-        """Calculate estimated time remaining based on average processing time."""
-        if len(self.list_of_processing_times) < 10:
-            return  # Not enough data to estimate
-        if len(self.list_of_processing_times) > 300:
-            # Keep only the last 300 processing times for a rolling average
-            self.list_of_processing_times = self.list_of_processing_times[-300:]
-        average_time = sum(self.list_of_processing_times) / len(
-            self.list_of_processing_times
-        )
-        files_left = self.total_files - self.processed_files - self.failed_count
-        self.estimated_time_remaining = average_time * files_left
+    def _extraction_pool(self, jobs: int, executor: str):
+        """Create the worker pool used for date extraction.
 
-    # main function
-    def organize_photos(
+        Returns:
+            tuple: (executor, function taking a Path and an optional skip_headers
+            flag and returning the _safe_get_file_date() tuple)
+        """
+        if executor == "thread":
+            return ThreadPoolExecutor(max_workers=jobs), self._safe_get_file_date
+        if executor == "process":
+            # Imported here: loading multiprocessing slows down every startup
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_worker,
+                initargs=(self.compute_perceptual_hash,),
+            )
+            return pool, _extract_in_worker
+        raise ValueError(f"Unknown executor type: {executor}")
+
+    def iter_file_dates(
         self,
-        source_folder: Union[str, Path],
-        destination_folder: Union[str, Path],
-        sort_by_day: bool = False,
-        remove_empty: bool = True,
+        files,
+        jobs: int = 1,
+        executor: str = "thread",
+        cache: Optional[MetadataCache] = None,
+    ):
+        """Extract the dates of the given files, optionally on a worker pool.
+
+        Args:
+            files: Iterable of FileRecord from the source scan
+            jobs: Number of workers, 1 extracts in the calling thread
+            executor: "thread" for I/O-bound sources (network shares),
+                "process" for CPU-heavy decodes (HEIC, RAW)
+            cache: Optional metadata cache consulted before extraction
+
+        Extraction times are recorded in run_report, by extension and backend.
+
+        Yields:
+            tuple: (record, date or None, error message or None) in input order
+        """
+        if jobs <= 1:
+            pool = nullcontext()
+            extract = self._safe_get_file_date
+        else:
+            pool, extract = self._extraction_pool(jobs, executor)
+
+        def finish(entry):
+            # Resolve a pending entry and store fresh results in the cache
+            record, key, outcome = entry
+            if isinstance(outcome, Future):
+                outcome = outcome.result()
+            file_date, error, image_hash, backend, seconds = outcome
+            if key is not None and error is None:
+                cache.put(key, file_date)
+            if image_hash is not None:
+                self.perceptual_hashes[str(record.path)] = image_hash
+            self.run_report.add_extraction(
+                record.path.suffix.lower(),
+                backend,
+                seconds,
+                record.size,
+                failed=file_date is None,
+            )
+            return record, file_date, error
+
+        # Keep a bounded window of submitted files so workers stay busy
+        # without queueing the whole file list at once
+        max_pending = jobs * 4 if jobs > 1 else 1
+        pending = deque()
+        with pool:
+            for record in files:
+                key = None
+                cached = MISS
+                # Cached results carry no perceptual hash, so images are re-read
+                if cache is not None and not (
+                    self.compute_perceptual_hash
+                    and record.path.suffix.lower() in self.IMAGE_EXTENSIONS
+                ):
+                    lookup_start = perf_counter()
+                    key = cache.make_key(
+                        record.dev, record.ino, record.size, record.mtime_ns, record.path
+                    )
+                    cached = cache.get(key)
+                    lookup_time = perf_counter() - lookup_start
+                if cached is not MISS:
+                    pending.append(
+                        (record, None, (cached, None, None, "cache", lookup_time))
+                    )
+                elif jobs <= 1:
+                    pending.append((record, key, extract(record.path)))
+                else:
+                    pending.append((record, key, pool.submit(extract, record.path)))
+                if len(pending) >= max_pending:
+                    yield finish(pending.popleft())
+            while pending:
+                yield finish(pending.popleft())
+
+    def detect_duplicates(
+        self,
+        records,
+        skip: bool = True,
+        jobs: int = 4,
         progress_callback=None,
         log_callback=None,
-        remove_confirmation_callback=None,
-    ) -> None:
-        """
-        Main method to organize photos
+    ) -> list[FileRecord]:
+        """Find byte-identical files among the scanned records.
+
+        Every file after the first one of a group is recorded in duplicate_files
+        as (duplicate, original). Skipped duplicates count as processed.
 
         Args:
-            source_folder: Source directory path
-            destination_folder: Destination directory path
-            sort_by_day: Whether to sort into day-level folders
-            remove_empty: Whether to remove empty folders after processing
+            records: FileRecord objects from the source scan
+            skip: Whether duplicates are left out of the returned list
+            jobs: Number of threads used for hashing
             progress_callback: Optional callback function to update GUI progress
             log_callback: Optional callback for logging messages
-            remove_confirmation_callback: Optional callback for file removal confirmation
-        """
-
-        # Get source path and start timing
-        source_path = Path(source_folder)
-        global_start_time = perf_counter()
 
+        Returns:
+            list[FileRecord]: The records that should still be processed
+        """
+        records = list(records)
         if log_callback:
-            log_callback("🔍 Scanning source folder for files...")
-        # Get list of files to process using list comprehension
-        files_to_process = [
-            file for file in source_path.rglob("*") if self.is_valid_file(file)
-        ]
+            log_callback("🔁 Checking for duplicate files...")
+        duplicates = set()
+        start = perf_counter()
+        groups = find_duplicate_groups(records, jobs=jobs)
+        self.run_report.add(
+            "duplicates", perf_counter() - start, sum(r.size for r in records)
+        )
+        for group in groups:
+            original = group[0]
+            for duplicate in group[1:]:
+                duplicates.add(duplicate.path)
+                self.duplicate_files.append((str(duplicate.path), str(original.path)))
+                if log_callback:
+                    action = "skipping" if skip else "keeping"
+                    log_callback(
+                        f"   {duplicate.path.name} is a duplicate of {original.path}, {action}."
+                    )
 
-        # Update total files count
-        self.total_files = len(files_to_process)
+        if not skip or not duplicates:
+            return records
 
+        self.processed_files += len(duplicates)
+        for record in records:
+            if record.path in duplicates:
+                self.eta.skip(self.file_class(record.path), record.size)
+        self.update_estimate_time_remaining()
         if progress_callback:
-            progress_callback(self.processed_files, self.total_files, self.failed_count, self.estimated_time_remaining)
-
-        # start processing files
-        if log_callback:
-            # Log a clear summary of the task at the start
-            summary_lines = [
-                "-" * 50,
-                "📦 Photo Organizer Task Summary",
-                "-" * 50,
-                f"Source folder       : {source_folder}",
-                f"Destination folder  : {destination_folder}",
-                f"Sort by day         : {'Yes' if sort_by_day else 'No'}",
-                f"Remove empty folders: {'Yes' if remove_empty else 'No'}",
-                f"Total files found   : {self.total_files}",
-                "-" * 50,
-                "",
-            ]
-            for line in summary_lines:
-                log_callback(line)
-
-        if not files_to_process:
-            if log_callback:
-                log_callback(" • No files found to process.")
-            return
+            progress_callback(
+                self.processed_files,
+                self.total_files,
+                self.failed_count,
+                self.estimated_time_remaining,
+            )
+        return [record for record in records if record.path not in duplicates]
 
-        # Process each file
-        for file in files_to_process:
-            # Start timing for this file, only used if file is processed
-            file_start_time = perf_counter()
-            if log_callback:
-                log_callback(f" • Processing: {file.name}")
+    def find_near_duplicates(
+        self, max_distance: int = DEFAULT_MAX_DISTANCE
+    ) -> list[tuple[str, str, int]]:
+        """Find visually similar images among the perceptual hashes of this run.
 
-            # Check if file has a valid date
-            try:
-                file_date = self.get_file_date(file)
-                if file_date:
-                    # Create the new folder structure based on the date
-                    # Format folder structure based on sort_by_day option
-                    if sort_by_day:
-                        date_folder = file_date.strftime("%Y/%m/%d")
-                    else:
-                        date_folder = file_date.strftime("%Y/%m")
-
-                    # Create full destination path
-                    file_new_path = Path(destination_folder) / date_folder
-
-                    # Create all necessary directories
-                    file_new_path.mkdir(parents=True, exist_ok=True)
-
-                    # Generate new file path, handling duplicates
-                    # TODO: implement counter and list for duplicate files
-
-                    new_file_path = file_new_path / file.name
-                    if new_file_path.exists():
-                        self.processed_files += 1
-                        if progress_callback:
-                            progress_callback(
-                                self.processed_files,
-                                self.total_files,
-                                self.failed_count,
-                                self.estimated_time_remaining,
-                            )
-                        if log_callback:
-                            log_callback(
-                                f"   File {file.name} already exists in {file_new_path}, skipping."
-                            )
-                        continue  # This prevents the file from being moved
-
-                        # If file exists, append number until we find a unique name
-                        # counter = 1
-                        # while new_file_path.exists():
-                        #     stem = file.stem
-                        #     suffix = file.suffix
-                        #     new_name = f"{stem}_{counter}{suffix}"
-                        #     new_file_path = file_new_path / new_name
-                        #     counter += 1
+        Args:
+            max_distance: Maximum Hamming distance between two dHashes
 
-                    try:
-                        # Move the file to new location
-                        shutil.move(str(file), str(new_file_path))
-                        # Increment processed files count
-                        self.processed_files += 1
-                        # Record processing time for this file
-                        file_end_time = perf_counter()
-                        file_processing_time = file_end_time - file_start_time
-                        self.list_of_processing_times.append(file_processing_time)
-                        self.update_estimate_time_remaining()
-                        
-                        if progress_callback:
-                            progress_callback(
-                                self.processed_files,
-                                self.total_files,
-                                self.failed_count,
-                                self.estimated_time_remaining,
-                            )
-
-                        if log_callback:
-                            log_callback(f"   Moved {file.name} to {new_file_path}")
+        Returns:
+            list: (path_a, path_b, distance) tuples, also stored in near_duplicate_pairs
+        """
+        paths = list(self.perceptual_hashes)
+        hashes = [self.perceptual_hashes[path] for path in paths]
+        start = perf_counter()
+        self.near_duplicate_pairs = [
+            (paths[a], paths[b], distance)
+            for a, b, distance in find_similar_pairs(hashes, max_distance)
+        ]
+        self.run_report.add("near_duplicates", perf_counter() - start)
+        return self.near_duplicate_pairs
+
+    @staticmethod
+    def date_folder(
+        destination_folder: Union[str, Path], file_date: date, sort_by_day: bool
+    ) -> Path:
+        """Return the destination folder of a date, YYYY/MM or YYYY/MM/DD."""
+        # Format folder structure based on sort_by_day option
+        if sort_by_day:
+            return Path(destination_folder) / file_date.strftime("%Y/%m/%d")
+        return Path(destination_folder) / file_date.strftime("%Y/%m")
+
+    def _place_file(
+        self,
+        record: FileRecord,
+        file_new_path: Path,
+        file_start_time: float,
+        progress_callback=None,
+        log_callback=None,
+    ) -> None:
+        """Move a file into its destination folder, unless the name is already taken.
 
-                    except Exception as e:
-                        if log_callback:
-                            log_callback(f"   ❌ Failed to move {file.name}: {e}")
-                        logging.error("Failed to move %s: %s", file.name, e)
-                        self.failed_files.append(str(file))
-                        self.failed_count += 1
+        Args:
+            record: The scanned file to move
+            file_new_path: The destination folder
+            file_start_time: perf_counter() value when work on this file started
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+        """
+        file = record.path
+        # Create all necessary directories, known folders come from the catalog
+        mkdir_start = perf_counter()
+        if self.catalog is None or not self.catalog.has_dir(file_new_path):
+            file_new_path.mkdir(parents=True, exist_ok=True)
+            if self.catalog is not None:
+                self.catalog.add_dir(file_new_path)
+        self.run_report.add("mkdir", perf_counter() - mkdir_start)
+
+        # Generate new file path, skipping name collisions
+        # (byte-identical files are handled by detect_duplicates())
+
+        new_file_path = file_new_path / file.name
+        if self.catalog is not None:
+            already_exists = self.catalog.contains(new_file_path)
+        else:
+            already_exists = new_file_path.exists()
+        if already_exists:
+            self._count_existing(record, file_new_path, progress_callback, log_callback)
+            return  # This prevents the file from being moved
+
+            # If file exists, append number until we find a unique name
+            # counter = 1
+            # while new_file_path.exists():
+            #     stem = file.stem
+            #     suffix = file.suffix
+            #     new_name = f"{stem}_{counter}{suffix}"
+            #     new_file_path = file_new_path / new_name
+            #     counter += 1
+
+        if self.journal is not None:
+            self.journal.planned(file, new_file_path, record.size, record.mtime_ns)
+        move_start = perf_counter()
+        try:
+            self._move_file(record, new_file_path)
+            self.run_report.add("move", perf_counter() - move_start, record.size)
+            self._count_moved(
+                record, new_file_path, file_start_time, progress_callback, log_callback
+            )
+        except Exception as e:
+            self.run_report.add("move", perf_counter() - move_start, failed=True)
+            self._count_move_failure(record, e, log_callback)
+
+    def _move_file(self, record: FileRecord, new_file_path: Path) -> None:
+        """Move a file to new_file_path, only touching the filesystem."""
+        if self.move_engine is not None:
+            self.move_engine.move(record.path, new_file_path, record.size)
+        else:
+            shutil.move(str(record.path), str(new_file_path))
 
-                else:
-                    # If no date found, log and skip the file
-                    if log_callback:
-                        log_callback(f"   ❌ No date found for {file.name}")
-                    logging.warning("No date found for %s", file.name)
+    def _count_existing(
+        self,
+        record: FileRecord,
+        file_new_path: Path,
+        progress_callback=None,
+        log_callback=None,
+    ) -> None:
+        """Count a file left in the source because its name is taken."""
+        file = record.path
+        if self.journal is not None:
+            self.journal.skipped(file, record.size, record.mtime_ns, "exists")
+        self.processed_files += 1
+        self.eta.skip(self.file_class(file), record.size)
+        self.update_estimate_time_remaining()
+        if progress_callback:
+            progress_callback(
+                self.processed_files,
+                self.total_files,
+                self.failed_count,
+                self.estimated_time_remaining,
+            )
+        if log_callback:
+            log_callback(
+                f"   File {file.name} already exists in {file_new_path}, skipping."
+            )
 
-                    self.failed_files.append(str(file))
-                    self.failed_count += 1
-                    if progress_callback:
-                        progress_callback(
-                            self.processed_files,
-                            self.total_files,
-                            self.failed_count,
-                            self.estimated_time_remaining,
-                        )
+    def _count_moved(
+        self,
+        record: FileRecord,
+        new_file_path: Path,
+        file_start_time: float,
+        progress_callback=None,
+        log_callback=None,
+    ) -> None:
+        """Record a completed move in the journal, catalog and counters."""
+        file = record.path
+        if self.journal is not None:
+            self.journal.done(file, new_file_path, record.size)
+        self.touched_dirs.add(str(file.parent))
+        if self.catalog is not None:
+            self.catalog.add_file(new_file_path, record.size, record.mtime_ns)
+        # Near-duplicate reports refer to where the file ended up
+        image_hash = self.perceptual_hashes.pop(str(file), None)
+        if image_hash is not None:
+            self.perceptual_hashes[str(new_file_path)] = image_hash
+        # Increment processed files count
+        self.processed_files += 1
+        # Record processing time for this file
+        file_end_time = perf_counter()
+        file_processing_time = file_end_time - file_start_time
+        self.eta.complete(self.file_class(file), record.size, file_processing_time)
+        self.update_estimate_time_remaining()
+
+        if progress_callback:
+            progress_callback(
+                self.processed_files,
+                self.total_files,
+                self.failed_count,
+                self.estimated_time_remaining,
+            )
+
+        if log_callback:
+            log_callback(f"   Moved {file.name} to {new_file_path}")
+
+    def _count_move_failure(
+        self, record: FileRecord, error: Exception, log_callback=None
+    ) -> None:
+        """Count a file whose move failed."""
+        file = record.path
+        if log_callback:
+            log_callback(f"   ❌ Failed to move {file.name}: {error}")
+        logging.error("Failed to move %s: %s", file.name, error)
+        self.failed_files.append(str(file))
+        self.failed_count += 1
+        self.eta.skip(self.file_class(file), record.size)
+        self.update_estimate_time_remaining()
+
+    def _handle_file(
+        self,
+        record: FileRecord,
+        file_date: Optional[date],
+        error: Optional[str],
+        destination_folder: Union[str, Path],
+        sort_by_day: bool,
+        file_start_time: float,
+        progress_callback=None,
+        log_callback=None,
+    ) -> None:
+        """Move a single file to its date folder and update the counters.
+
+        Args:
+            record: The scanned file to move
+            file_date: The extracted date, or None if no date was found
+            error: Error message if date extraction failed
+            destination_folder: Destination directory path
+            sort_by_day: Whether to sort into day-level folders
+            file_start_time: perf_counter() value when work on this file started
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+        """
+        file = record.path
+        file_class = self.file_class(file)
+        if log_callback:
+            log_callback(f" • Processing: {file.name}")
+
+        # Check if file has a valid date
+        try:
+            if error is not None:
+                raise RuntimeError(error)
+            if file_date:
+                self._place_file(
+                    record,
+                    self.date_folder(destination_folder, file_date, sort_by_day),
+                    file_start_time,
+                    progress_callback,
+                    log_callback,
+                )
+            else:
+                # If no date found, log and skip the file
+                if log_callback:
+                    log_callback(f"   ❌ No date found for {file.name}")
+                logging.warning("No date found for %s", file.name)
+                if self.journal is not None:
+                    self.journal.skipped(file, record.size, record.mtime_ns, "no_date")
+
+                self.failed_files.append(str(file))
+                self.failed_count += 1
+                self.eta.skip(file_class, record.size)
+                self.update_estimate_time_remaining()
+                if progress_callback:
+                    progress_callback(
+                        self.processed_files,
+                        self.total_files,
+                        self.failed_count,
+                        self.estimated_time_remaining,
+                    )
+
+        except Exception as e:
+            if log_callback:
+                log_callback(f"   ❌ Failed to get date for {file.name}: {e}")
+            logging.error("Failed to get date for %s: %s", file.name, e)
+            self.failed_files.append(str(file))
+            self.failed_count += 1
+            self.eta.skip(file_class, record.size)
+            self.update_estimate_time_remaining()
+            if progress_callback:
+                progress_callback(
+                    self.processed_files,
+                    self.total_files,
+                    self.failed_count,
+                    self.estimated_time_remaining,
+                )
 
+    def _plan_file(
+        self,
+        record: FileRecord,
+        file_date: Optional[date],
+        error: Optional[str],
+        destination_folder: Union[str, Path],
+        sort_by_day: bool,
+        file_start_time: float,
+        plan: PlanWriter,
+        planned: set[str],
+        progress_callback=None,
+        log_callback=None,
+    ) -> None:
+        """Write the plan entry of a single file instead of moving it.
+
+        Args:
+            record: The scanned file
+            file_date: The extracted date, or None if no date was found
+            error: Error message if date extraction failed
+            destination_folder: Destination directory path
+            sort_by_day: Whether to sort into day-level folders
+            file_start_time: perf_counter() value when work on this file started
+            plan: The plan being written
+            planned: Normalized destination paths of the earlier entries
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+        """
+        file = record.path
+        file_class = self.file_class(file)
+        new_file_path = None
+        if error is not None:
+            status = move_plan.ERROR
+        elif not file_date:
+            status = move_plan.NO_DATE
+        else:
+            new_file_path = (
+                self.date_folder(destination_folder, file_date, sort_by_day)
+                / file.name
+            )
+            key = os.path.normcase(os.path.abspath(new_file_path))
+            if key in planned:
+                status = move_plan.CONFLICT
+            elif (
+                self.catalog.contains(new_file_path)
+                if self.catalog is not None
+                else new_file_path.exists()
+            ):
+                status = move_plan.EXISTS
+            else:
+                status = move_plan.MOVE
+                planned.add(key)
+
+        plan.write(
+            PlanEntry(
+                source=plan.relative_source(file),
+                size=record.size,
+                mtime_ns=record.mtime_ns,
+                status=status,
+                date=file_date,
+                destination=(
+                    plan.relative_destination(new_file_path) if new_file_path else None
+                ),
+                error=error,
+            )
+        )
+
+        if new_file_path is None:
+            if log_callback:
+                if error is not None:
+                    log_callback(f"   ❌ Failed to get date for {file.name}: {error}")
+                else:
+                    log_callback(f"   ❌ No date found for {file.name}")
+            self.failed_files.append(str(file))
+            self.failed_count += 1
+            self.eta.skip(file_class, record.size)
+        else:
+            if log_callback:
+                log_callback(f"   Planned {file.name} → {new_file_path} ({status})")
+            self.processed_files += 1
+            self.eta.complete(file_class, record.size, perf_counter() - file_start_time)
+        self.update_estimate_time_remaining()
+        if progress_callback:
+            progress_callback(
+                self.processed_files,
+                self.total_files,
+                self.failed_count,
+                self.estimated_time_remaining,
+            )
+
+    def execute_plan(
+        self,
+        plan_path: Union[str, Path],
+        source_folder: Optional[Union[str, Path]] = None,
+        destination_folder: Optional[Union[str, Path]] = None,
+        remove_empty: bool = False,
+        progress_callback=None,
+        log_callback=None,
+        remove_confirmation_callback=None,
+        removal_review_callback=None,
+        byte_progress_callback=None,
+        report_path: Optional[Union[str, Path]] = None,
+    ) -> dict:
+        """Apply a move plan written by organize_photos(plan_path=...).
+
+        Only entries with status "move" are moved, nothing is extracted again.
+        A file is left in place when it changed since the plan was made or when
+        its destination has been taken in the meantime.
+
+        Args:
+            plan_path: Path of the plan file
+            source_folder: Optional source directory, defaults to the planned one
+                (e.g. the live tree when the plan was made on a snapshot)
+            destination_folder: Optional destination directory, defaults to the
+                planned one
+            remove_empty: Whether to remove the source folders emptied by this run
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+            remove_confirmation_callback: Optional callback for file removal confirmation
+            removal_review_callback: Optional callback(file_paths) -> approved paths
+            byte_progress_callback: Optional callback(bytes_done, bytes_total) for
+                the file being copied when the destination is on another device
+            report_path: Optional path of a JSON file the run report is written to
+
+        Returns:
+            dict: The run report
+        """
+        header = read_plan_header(plan_path)
+        source_path = Path(source_folder or header["source"])
+        destination_path = Path(destination_folder or header["destination"])
+        global_start_time = perf_counter()
+        self.run_report = RunReport()
+        self.eta = EtaEstimator()
+        self.touched_dirs = set()
+
+        # First pass for the totals, the entries are read again while moving
+        self.total_files = 0
+        for entry in iter_plan_entries(plan_path):
+            if entry.status == move_plan.MOVE:
+                self.total_files += 1
+                self.eta.add_pending(self.file_class(Path(entry.source)), entry.size)
+        self.scan_complete = True
+
+        destination_path.mkdir(parents=True, exist_ok=True)
+        self.move_engine = MoveEngine(
+            source_path, destination_path, byte_progress_callback
+        )
+        if log_callback:
+            log_callback(f"📄 Executing move plan {plan_path}")
+            log_callback(f" • Files to move: {self.total_files}")
+        if progress_callback:
+            progress_callback(
+                self.processed_files,
+                self.total_files,
+                self.failed_count,
+                self.estimated_time_remaining,
+            )
+
+        for entry in iter_plan_entries(plan_path):
+            if entry.status != move_plan.MOVE:
+                continue
+            file_start_time = perf_counter()
+            file = source_path / entry.source
+            if log_callback:
+                log_callback(f" • Processing: {file.name}")
+            try:
+                st = file.stat()
+                if st.st_size != entry.size or st.st_mtime_ns != entry.mtime_ns:
+                    raise RuntimeError("changed since the plan was made")
+                record = FileRecord(
+                    file, st.st_size, st.st_mtime_ns, st.st_dev, st.st_ino
+                )
+                self._place_file(
+                    record,
+                    (destination_path / entry.destination).parent,
+                    file_start_time,
+                    progress_callback,
+                    log_callback,
+                )
             except Exception as e:
                 if log_callback:
-                    log_callback(f"   ❌ Failed to get date for {file.name}: {e}")
-                logging.error("Failed to get date for %s: %s", file.name, e)
+                    log_callback(f"   ❌ Failed to move {file.name}: {e}")
+                logging.error("Failed to move %s: %s", file.name, e)
                 self.failed_files.append(str(file))
                 self.failed_count += 1
+                self.eta.skip(self.file_class(file), entry.size)
+                self.update_estimate_time_remaining()
                 if progress_callback:
                     progress_callback(
                         self.processed_files,
@@ -497,7 +1478,587 @@ class PhotoOrganizer:
                         self.failed_count,
                         self.estimated_time_remaining,
                     )
+
+        if log_callback:
+            log_callback(
+                f" • Moved {self.processed_files} files, {self.failed_count} failed"
+            )
+        if remove_empty:
+            self._cleanup_source(
+                source_path,
+                log_callback,
+                remove_confirmation_callback,
+                removal_review_callback,
+            )
+        return self._finish_report(
+            source_path, destination_path, global_start_time, report_path
+        )
+
+    def _resume_from_journal(
+        self,
+        records,
+        state: JournalState,
+        progress_callback=None,
+        log_callback=None,
+    ):
+        """Handle the files a journal already decided on, without extracting dates.
+
+        Interrupted moves are finished to their journaled destination and files
+        the journal left in the source (no date, name taken) are counted again.
+        Files that changed since they were journaled are treated as new.
+
+        Args:
+            records: FileRecord objects from the source scan
+            state: The replayed journal
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+
+        Yields:
+            FileRecord: The records that still need their date extracted
+        """
+        for record in records:
+            key = os.path.abspath(record.path)
+            pending = state.pending.get(key)
+            if pending is not None and pending[1:] == (record.size, record.mtime_ns):
+                if log_callback:
+                    log_callback(f" • Resuming: {record.path.name}")
+                try:
+                    if not self._finish_interrupted_move(
+                        record,
+                        Path(pending[0]),
+                        pending[1],
+                        progress_callback,
+                        log_callback,
+                    ):
+                        self._place_file(
+                            record,
+                            Path(pending[0]).parent,
+                            perf_counter(),
+                            progress_callback,
+                            log_callback,
+                        )
+                except Exception as e:
+                    if log_callback:
+                        log_callback(f"   ❌ Failed to move {record.path.name}: {e}")
+                    logging.error("Failed to move %s: %s", record.path.name, e)
+                    self.failed_files.append(str(record.path))
+                    self.failed_count += 1
+                    self.eta.skip(self.file_class(record.path), record.size)
+                continue
+
+            skipped = state.skipped.get(key)
+            if skipped is None or skipped[:2] != (record.size, record.mtime_ns):
+                yield record
                 continue
+            self._count_journal_skip(record, skipped[2], progress_callback)
+
+    def _finish_interrupted_move(
+        self,
+        record: FileRecord,
+        destination: Path,
+        size: int,
+        progress_callback=None,
+        log_callback=None,
+    ) -> bool:
+        """Settle a journaled move whose source file is still there.
+
+        A copy only gets its real name once it is complete, so the temporary copy
+        of a killed cross-device move is removed, never the destination itself.
+        A destination with the same contents is the finished move of a run that
+        stopped before removing the source: only the source is removed. Any other
+        file under that name was already in the library and the source stays.
+
+        Returns:
+            bool: Whether the file is settled, False if the move still has to be
+            made
+        """
+        partial = MoveEngine.partial_path(destination)
+        if os.path.lexists(partial):
+            logging.info("Removing partial copy %s", partial)
+            os.remove(partial)
+        try:
+            st = os.lstat(destination)
+        except FileNotFoundError:
+            return False
+        if (
+            stat.S_ISREG(st.st_mode)
+            and st.st_size == size
+            and full_hash(destination) == full_hash(record.path)
+        ):
+            os.remove(record.path)
+            self._count_moved(
+                record, destination, perf_counter(), progress_callback, log_callback
+            )
+            return True
+        self._count_existing(
+            record, destination.parent, progress_callback, log_callback
+        )
+        return True
+
+    def _count_journal_skip(
+        self, record: FileRecord, reason: str, progress_callback=None
+    ) -> None:
+        """Count a file a resumed journal already left in the source."""
+        if reason == "no_date":
+            self.failed_files.append(str(record.path))
+            self.failed_count += 1
+        else:
+            self.processed_files += 1
+        self.eta.skip(self.file_class(record.path), record.size)
+        self.update_estimate_time_remaining()
+        if progress_callback:
+            progress_callback(
+                self.processed_files,
+                self.total_files,
+                self.failed_count,
+                self.estimated_time_remaining,
+            )
+
+    def undo_moves(
+        self,
+        journal_path: Union[str, Path],
+        progress_callback=None,
+        log_callback=None,
+        byte_progress_callback=None,
+        report_path: Optional[Union[str, Path]] = None,
+    ) -> dict:
+        """Move every file of a journal back to where it came from, newest first.
+
+        A file is left where it is when it is gone from its destination or when
+        its original path is taken again. Restores are journaled, so an
+        interrupted undo can simply be run again. Destination folders emptied by
+        the undo are removed.
+
+        Args:
+            journal_path: Path of the journal written by organize_photos()
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+            byte_progress_callback: Optional callback(bytes_done, bytes_total) for
+                the file being copied when the source is on another device
+            report_path: Optional path of a JSON file the run report is written to
+
+        Returns:
+            dict: The run report
+        """
+        state = load_journal(journal_path)
+        global_start_time = perf_counter()
+        self.run_report = RunReport()
+        self.eta = EtaEstimator()
+        self.touched_dirs = set()
+        self.total_files = len(state.done)
+        self.scan_complete = True
+        for source, _, size in state.done:
+            self.eta.add_pending(self.file_class(Path(source)), size)
+
+        if log_callback:
+            log_callback(f"↩️ Undoing {self.total_files} moves from {journal_path}")
+        if not state.done:
+            return self._finish_report(
+                state.source, state.destination, global_start_time, report_path
+            )
+
+        engine = MoveEngine(state.destination, state.source, byte_progress_callback)
+        emptied_dirs = set()
+        with MoveJournal(journal_path, state.source, state.destination) as journal:
+            for source, destination, size in reversed(state.done):
+                file_class = self.file_class(Path(source))
+                move_start = perf_counter()
+                try:
+                    if not os.path.exists(destination):
+                        raise FileNotFoundError(f"{destination} no longer exists")
+                    if os.path.exists(source):
+                        raise FileExistsError(f"{source} already exists")
+                    os.makedirs(os.path.dirname(source), exist_ok=True)
+                    engine.move(Path(destination), Path(source), size)
+                    journal.undone(source, destination)
+                except Exception as e:
+                    self.run_report.add(
+                        "move", perf_counter() - move_start, failed=True
+                    )
+                    if log_callback:
+                        log_callback(
+                            f"   ❌ Failed to restore {os.path.basename(source)}: {e}"
+                        )
+                    logging.error("Failed to restore %s: %s", source, e)
+                    self.failed_files.append(destination)
+                    self.failed_count += 1
+                    self.eta.skip(file_class, size)
+                else:
+                    seconds = perf_counter() - move_start
+                    self.run_report.add("move", seconds, size)
+                    emptied_dirs.add(os.path.dirname(destination))
+                    self.processed_files += 1
+                    self.eta.complete(file_class, size, seconds)
+                    if log_callback:
+                        log_callback(f"   Restored {source}")
+                self.update_estimate_time_remaining()
+                if progress_callback:
+                    progress_callback(
+                        self.processed_files,
+                        self.total_files,
+                        self.failed_count,
+                        self.estimated_time_remaining,
+                    )
+
+        # Remove the date folders left empty, deepest first, up to the destination
+        destination_root = os.path.normcase(os.path.abspath(state.destination))
+        removed = 0
+        for folder in sorted(emptied_dirs, key=lambda path: -path.count(os.sep)):
+            while os.path.normcase(folder) != destination_root:
+                try:
+                    os.rmdir(folder)
+                except OSError:
+                    break  # Not empty, or already removed
+                removed += 1
+                folder = os.path.dirname(folder)
+
+        if log_callback:
+            log_callback(
+                f" • Restored {self.processed_files} files, {self.failed_count} failed"
+            )
+            log_callback(f" • Empty folders removed : {removed}")
+        return self._finish_report(
+            state.source, state.destination, global_start_time, report_path
+        )
+
+    def watch_folder(
+        self,
+        source_folder: Union[str, Path],
+        destination_folder: Union[str, Path],
+        sort_by_day: bool = False,
+        stop_event: Optional[threading.Event] = None,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: Optional[bool] = None,
+        process_existing: bool = False,
+        progress_callback=None,
+        log_callback=None,
+        journal_path: Optional[Union[str, Path]] = None,
+        report_path: Optional[Union[str, Path]] = None,
+    ) -> dict:
+        """Sort new files as they arrive in the source folder, until stop_event is set.
+
+        Only the files reported by the watcher are read, the source tree is never
+        rescanned. A file is picked up once it is complete (close-write or move-in
+        event, or unchanged for settle_seconds) and goes through the same date
+        extraction and move as in organize_photos().
+
+        Args:
+            source_folder: Folder to watch, e.g. a camera upload folder
+            destination_folder: Destination directory path
+            sort_by_day: Whether to sort into day-level folders
+            stop_event: Optional event that ends the watch, e.g. set by a signal handler
+            settle_seconds: Time a file must stay unchanged when no close-write
+                event is available
+            poll_interval: Time between two checks for changes
+            use_inotify: Force (True) or disable (False) inotify, None uses it on Linux
+            process_existing: Whether the files already in the folder are sorted too
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+            journal_path: Optional path of an append-only journal of the moves
+            report_path: Optional path of a JSON file the run report is written to
+
+        Returns:
+            dict: The run report of the whole watch
+        """
+        source_path = Path(source_folder)
+        global_start_time = perf_counter()
+        self.run_report = RunReport()
+        self.eta = EtaEstimator()
+        self.touched_dirs = set()
+        self.scan_complete = True
+
+        Path(destination_folder).mkdir(parents=True, exist_ok=True)
+        self.move_engine = MoveEngine(source_path, destination_folder)
+        watcher = FolderWatcher(
+            source_path,
+            accept_file=self.is_valid_file,
+            accept_folder=lambda name: not self._hidden_regex.match(name),
+            exclude=destination_folder,
+            settle_seconds=settle_seconds,
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
+        if journal_path:
+            self.journal = MoveJournal(journal_path, source_path, destination_folder)
+        if log_callback:
+            log_callback(
+                f"👀 Watching {source_folder} for new files ({watcher.backend_name})"
+            )
+        try:
+            for paths in watcher.watch(stop_event, existing=process_existing):
+                records = []
+                for path in paths:
+                    try:
+                        st = path.stat()
+                    except OSError:
+                        continue
+                    records.append(
+                        FileRecord(
+                            path, st.st_size, st.st_mtime_ns, st.st_dev, st.st_ino
+                        )
+                    )
+                    self.total_files += 1
+                    self.eta.add_pending(self.file_class(path), st.st_size)
+                file_start_time = perf_counter()
+                for record, file_date, error in self.iter_file_dates(records):
+                    self._handle_file(
+                        record,
+                        file_date,
+                        error,
+                        destination_folder,
+                        sort_by_day,
+                        file_start_time,
+                        progress_callback,
+                        log_callback,
+                    )
+                    file_start_time = perf_counter()
+        finally:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+
+        if log_callback:
+            log_callback(
+                f" • Watch stopped: {self.processed_files} files sorted, "
+                f"{self.failed_count} failed"
+            )
+        return self._finish_report(
+            source_folder, destination_folder, global_start_time, report_path
+        )
+
+    # main function
+    def organize_photos(
+        self,
+        source_folder: Union[str, Path],
+        destination_folder: Union[str, Path],
+        sort_by_day: bool = False,
+        remove_empty: bool = True,
+        progress_callback=None,
+        log_callback=None,
+        remove_confirmation_callback=None,
+        removal_review_callback=None,
+        jobs: int = 1,
+        executor: str = "thread",
+        cache_path: Optional[Union[str, Path]] = None,
+        byte_progress_callback=None,
+        catalog_path: Optional[Union[str, Path]] = None,
+        duplicates: str = "off",
+        near_duplicates: bool = False,
+        report_path: Optional[Union[str, Path]] = None,
+        plan_path: Optional[Union[str, Path]] = None,
+        journal_path: Optional[Union[str, Path]] = None,
+        resume: bool = False,
+        pipeline: Optional[PipelineLimits] = None,
+    ) -> dict:
+        """
+        Main method to organize photos
+
+        Args:
+            source_folder: Source directory path
+            destination_folder: Destination directory path
+            sort_by_day: Whether to sort into day-level folders
+            remove_empty: Whether to remove the source folders emptied by this run
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+            remove_confirmation_callback: Optional callback for file removal confirmation
+            removal_review_callback: Optional callback(file_paths) -> approved paths,
+                asked once with all hidden/system files the cleanup would remove
+            jobs: Number of workers used for date extraction (1 = sequential)
+            executor: Worker pool type, "thread" or "process"
+            cache_path: Optional path of a persistent metadata cache database
+            byte_progress_callback: Optional callback(bytes_done, bytes_total) for
+                the file being copied when the destination is on another device
+            catalog_path: Optional path of a persistent destination catalog database,
+                used instead of probing the destination for every file
+            duplicates: "off", "report" to list byte-identical files, or "skip" to
+                also leave them in the source folder instead of moving them
+            near_duplicates: Whether to hash every image and report visually similar
+                images (burst shots, re-encoded copies) after sorting
+            report_path: Optional path of a JSON file the run report is written to
+            plan_path: Optional path of a JSON Lines move plan. When given, nothing
+                is moved or removed: every file's date, destination and collision
+                status is written to the plan instead, see execute_plan()
+            journal_path: Optional path of an append-only journal of the moves,
+                used to resume an interrupted run or to undo it with undo_moves()
+            resume: Whether to continue the run recorded in journal_path: files
+                it already decided on are moved or skipped without extracting
+                their date again
+            pipeline: Optional stage limits. When given, files go through the
+                asyncio pipeline (concurrent reads, pool decodes, moves serialized
+                per destination folder) instead of one at a time; jobs is not
+                used then. Dry runs always process one file at a time
+
+        Returns:
+            dict: The run report with per-phase counts, times, p50/p95/max latencies
+            and bytes, and the extraction times per extension and backend
+        """
+        if duplicates not in ("off", "report", "skip"):
+            raise ValueError(f"Unknown duplicates mode: {duplicates}")
+        if resume and not journal_path:
+            raise ValueError("resume needs a journal_path")
+
+        # Get source path and start timing
+        source_path = Path(source_folder)
+        global_start_time = perf_counter()
+        self.run_report = RunReport()
+        self.eta = EtaEstimator()
+        self.touched_dirs = set()
+
+        # A dry run only reads, the destination does not have to exist yet
+        plan = None
+        if plan_path:
+            plan = PlanWriter(plan_path, source_path, destination_folder, sort_by_day)
+            remove_empty = False
+        else:
+            # Decide once per run whether moves are renames or cross-device copies
+            Path(destination_folder).mkdir(parents=True, exist_ok=True)
+            self.move_engine = MoveEngine(
+                source_path, destination_folder, byte_progress_callback
+            )
+
+        journal_state = None
+        if journal_path and plan is None:
+            if resume and Path(journal_path).exists():
+                journal_state = load_journal(journal_path)
+            self.journal = MoveJournal(journal_path, source_path, destination_folder)
+            if journal_state is not None:
+                # Moves that completed before the journal recorded them
+                for source, (target, size, _) in journal_state.pending.items():
+                    if not os.path.exists(source) and os.path.exists(target):
+                        self.journal.done(source, target, size)
+
+        if log_callback:
+            log_callback("🔍 Scanning source folder for files...")
+        # Files are streamed from a background scan, so processing starts right away
+        # and total_files grows while the walk is still running
+        files_to_process = self.stream_source_files(
+            source_path, exclude=Path(destination_folder)
+        )
+
+        if progress_callback:
+            progress_callback(self.processed_files, self.total_files, self.failed_count, self.estimated_time_remaining)
+
+        # start processing files
+        if log_callback:
+            # Log a clear summary of the task at the start
+            summary_lines = [
+                "-" * 50,
+                "📦 Photo Organizer Task Summary",
+                "-" * 50,
+                f"Source folder       : {source_folder}",
+                f"Destination folder  : {destination_folder}",
+                f"Sort by day         : {'Yes' if sort_by_day else 'No'}",
+                f"Remove empty folders: {'Yes' if remove_empty else 'No'}",
+                "-" * 50,
+                "",
+            ]
+            if plan is not None:
+                summary_lines.insert(-2, f"Dry run, plan file  : {plan_path}")
+            for line in summary_lines:
+                log_callback(line)
+
+        self.compute_perceptual_hash = near_duplicates
+        self.perceptual_hashes = {}
+        self.near_duplicate_pairs = []
+
+        # Duplicate detection needs the complete file list before anything moves
+        if duplicates != "off":
+            files_to_process = self.detect_duplicates(
+                files_to_process,
+                skip=duplicates == "skip",
+                jobs=max(jobs, 4),
+                progress_callback=progress_callback,
+                log_callback=log_callback,
+            )
+            if plan is not None and duplicates == "skip":
+                self._plan_duplicates(plan)
+
+        # Process each file, extracting dates on the configured worker pool.
+        # Results come back in scan order, so moves stay deterministic.
+        use_pipeline = pipeline is not None and plan is None
+        if journal_state is not None and not use_pipeline:
+            files_to_process = self._resume_from_journal(
+                files_to_process, journal_state, progress_callback, log_callback
+            )
+
+        cache = MetadataCache(cache_path) if cache_path else None
+        if catalog_path:
+            self.catalog = DestinationCatalog(destination_folder, catalog_path)
+            self.catalog.load()
+        try:
+            if use_pipeline:
+                # Imported here: loading asyncio slows down every startup
+                from pipeline import StagedPipeline
+
+                StagedPipeline(
+                    self,
+                    destination_folder,
+                    sort_by_day,
+                    pipeline,
+                    executor=executor,
+                    cache=cache,
+                    journal_state=journal_state,
+                    progress_callback=progress_callback,
+                    log_callback=log_callback,
+                ).run(files_to_process)
+            else:
+                file_start_time = perf_counter()
+                planned: set[str] = set()
+                for record, file_date, error in self.iter_file_dates(
+                    files_to_process, jobs=jobs, executor=executor, cache=cache
+                ):
+                    if plan is not None:
+                        self._plan_file(
+                            record,
+                            file_date,
+                            error,
+                            destination_folder,
+                            sort_by_day,
+                            file_start_time,
+                            plan,
+                            planned,
+                            progress_callback,
+                            log_callback,
+                        )
+                    else:
+                        self._handle_file(
+                            record,
+                            file_date,
+                            error,
+                            destination_folder,
+                            sort_by_day,
+                            file_start_time,
+                            progress_callback,
+                            log_callback,
+                        )
+                    # With a worker pool this is the interval between completed files
+                    file_start_time = perf_counter()
+        finally:
+            if plan is not None:
+                plan.close()
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            if self.catalog is not None:
+                self.catalog.close()
+                self.catalog = None
+            if cache is not None:
+                cache.close()
+                if log_callback:
+                    log_callback(
+                        f" • Metadata cache: {cache.hits} hits, {cache.misses} misses"
+                    )
+
+        if self.total_files == 0:
+            if log_callback:
+                log_callback(" • No files found to process.")
+            return self._finish_report(
+                source_folder, destination_folder, global_start_time, report_path
+            )
+
+        if near_duplicates:
+            self.find_near_duplicates()
 
         # Calculate processing time
         total_time = perf_counter() - global_start_time
@@ -530,8 +2091,12 @@ class PhotoOrganizer:
                 "-" * 50,
                 "☑️ Sorting completed successfully:",
                 "",
+                f" • Total files found     : {self.total_files}",
                 f" • Total files processed : {self.processed_files}",
                 f" • Total files failed    : {self.failed_count}",
+                f" • Duplicate files       : {len(self.duplicate_files)}"
+                if duplicates != "off"
+                else "",
                 f" • Processing time       : {total_time_str}",
                 f" • Average per file      : {average_time_str}"
                 if self.total_files > 0
@@ -549,6 +2114,36 @@ class PhotoOrganizer:
                 for failed in self.failed_files:
                     summary_lines.append(f"   • {failed}")
 
+            if self.duplicate_files:
+                summary_lines.extend(
+                    [
+                        "",
+                        "🔁 Duplicate files:",
+                    ]
+                )
+                for duplicate, original in self.duplicate_files:
+                    summary_lines.append(f"   • {duplicate} (same as {original})")
+
+            if self.near_duplicate_pairs:
+                summary_lines.extend(
+                    [
+                        "",
+                        "🖼️ Near-duplicate images:",
+                    ]
+                )
+                for path_a, path_b, distance in self.near_duplicate_pairs:
+                    summary_lines.append(
+                        f"   • {path_a} ~ {path_b} (distance {distance})"
+                    )
+
+            if plan is not None:
+                counts = ", ".join(
+                    f"{status} {count}" for status, count in plan.counts.items()
+                )
+                summary_lines.extend(
+                    ["", f"📄 Move plan written to {plan_path} ({counts})"]
+                )
+
             summary_lines.append("-" * 50)
 
             for line in summary_lines:
@@ -556,35 +2151,121 @@ class PhotoOrganizer:
 
         # After processing all files, remove empty folders if requested
         if remove_empty:
-            if log_callback:
-                summary_lines = ["🧹 Cleanup — Removing empty folders:", ""]
+            self._cleanup_source(
+                source_path,
+                log_callback,
+                remove_confirmation_callback,
+                removal_review_callback,
+            )
+
+        return self._finish_report(
+            source_folder, destination_folder, global_start_time, report_path
+        )
+
+    def _cleanup_source(
+        self,
+        source_path: Path,
+        log_callback=None,
+        remove_confirmation_callback=None,
+        removal_review_callback=None,
+    ) -> None:
+        """Remove the source folders emptied by this run and log the result."""
+        if log_callback:
+            summary_lines = ["🧹 Cleanup — Removing empty folders:", ""]
+            for line in summary_lines:
+                log_callback(line)
+
+        # Only the folders this run moved files out of can have become empty
+        empty_folders_removed = self.delete_empty_folders(
+            source_path,
+            log_callback,
+            remove_confirmation_callback,
+            folders=self.touched_dirs,
+            removal_review_callback=removal_review_callback,
+        )
+
+        if log_callback:
+            if empty_folders_removed == 0:
+                log_callback(" • No empty folders found.")
+            else:
+                summary_lines = [
+                    f" • Empty folders removed : {empty_folders_removed}",
+                ]
                 for line in summary_lines:
                     log_callback(line)
 
-            empty_folders_removed = self.delete_empty_folders(
-                source_path, log_callback, remove_confirmation_callback
+    def _plan_duplicates(self, plan: PlanWriter) -> None:
+        """Write the plan entries of the duplicates that detect_duplicates() skipped."""
+        for duplicate, _ in self.duplicate_files:
+            try:
+                st = os.stat(duplicate)
+            except OSError:
+                continue
+            plan.write(
+                PlanEntry(
+                    source=plan.relative_source(duplicate),
+                    size=st.st_size,
+                    mtime_ns=st.st_mtime_ns,
+                    status=move_plan.DUPLICATE,
+                )
             )
 
-            if log_callback:
-                if empty_folders_removed == 0:
-                    log_callback(" • No empty folders found.")
-                else:
-                    summary_lines = [
-                        f" • Empty folders removed : {empty_folders_removed}",
-                    ]
-                    for line in summary_lines:
-                        log_callback(line)
+    def _finish_report(
+        self,
+        source_folder: Union[str, Path],
+        destination_folder: Union[str, Path],
+        global_start_time: float,
+        report_path: Optional[Union[str, Path]] = None,
+    ) -> dict:
+        """Build the run report of organize_photos() and optionally save it as JSON."""
+        report = self.run_report.as_dict(
+            source_folder=str(source_folder),
+            destination_folder=str(destination_folder),
+            total_seconds=round(perf_counter() - global_start_time, 6),
+            files={
+                "found": self.total_files,
+                "processed": self.processed_files,
+                "failed": self.failed_count,
+                "duplicates": len(self.duplicate_files),
+                "near_duplicate_pairs": len(self.near_duplicate_pairs),
+            },
+        )
+        if report_path:
+            with open(report_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        return report
+
+
+# Organizer instance owned by each process pool worker
+_worker_organizer: Optional[PhotoOrganizer] = None
+
+
+def _init_worker(compute_perceptual_hash: bool = False) -> None:
+    """Create the organizer used by a process pool worker."""
+    global _worker_organizer
+    _worker_organizer = PhotoOrganizer()
+    _worker_organizer.compute_perceptual_hash = compute_perceptual_hash
+
+
+def _extract_in_worker(
+    file: Path, skip_headers: bool = False
+) -> tuple[Optional[date], Optional[str], Optional[int], str, float]:
+    """Extract a file date inside a process pool worker."""
+    return _worker_organizer._safe_get_file_date(file, skip_headers)
 
 
 # main
 if __name__ == "__main__":
-    organizer = PhotoOrganizer()
+    import sys
 
-    # Use relative paths based on the repository structure
-    script_dir = Path(__file__).parent
-    repo_root = script_dir.parent  # Go up one level from src/ to repo root
-    source = repo_root / "tests" / "resources"
-    dest = repo_root / "tests" / "result"
+    if len(sys.argv) != 3:
+        # Test data can be generated with benchmarks/corpus.py
+        print("Usage: python PhotoOrganizer_v3.py SOURCE DESTINATION")
+        sys.exit(2)
+
+    organizer = PhotoOrganizer()
+    source = Path(sys.argv[1])
+    dest = Path(sys.argv[2])
 
     logging.info("Processing files from: %s", source)
     logging.info("Destination folder: %s", dest)
@@ -0,0 +1,351 @@
+# PhotoOrganizer_v3/cli.py
+# Headless command-line entry point: runs the engine without importing PyQt6.
+# With --json every log line, progress update and the final run report is written
+# to stdout as one JSON object per line (NDJSON), for scripts and servers.
+#
+# Usage: python src/cli.py organize SOURCE DESTINATION --sort-by-day --cleanup --json
+import argparse
+import fnmatch
+import json
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+from time import monotonic
+from typing import Optional, TextIO
+
+from PhotoOrganizer_v3 import PhotoOrganizer, PipelineLimits
+from log_sink import DEFAULT_MAX_DELAY, LogBatcher, line_level
+
+# Minimum seconds between two progress events
+DEFAULT_PROGRESS_INTERVAL = 0.5
+
+
+class EventWriter:
+    """Turn the organizer's callbacks into output lines, plain text or NDJSON."""
+
+    def __init__(
+        self,
+        stream: TextIO,
+        json_output: bool,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+        log_path: Optional[Path] = None,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        """
+        Args:
+            stream: Output stream, usually sys.stdout
+            json_output: Whether to write NDJSON events instead of plain log lines
+            progress_interval: Minimum seconds between two progress events
+            log_path: Optional file the complete log is written to
+            max_delay: Maximum seconds a log line waits to be written in a batch
+        """
+        self.stream = stream
+        self.json_output = json_output
+        self.progress_interval = progress_interval
+        self._lock = threading.Lock()
+        self._last_progress_time = 0.0
+        self._last_progress: Optional[tuple[int, int, int, float]] = None
+        self.log_batcher = LogBatcher(
+            self._write_log_lines, log_path, max_delay=max_delay
+        )
+
+    def emit(self, event: str, **fields) -> None:
+        """Write one event (only in JSON mode)."""
+        if self.json_output:
+            self._write(json.dumps({"event": event, **fields}, ensure_ascii=False))
+
+    def _write(self, text: str) -> None:
+        with self._lock:
+            self.stream.write(text + "\n")
+            self.stream.flush()
+
+    def _write_log_lines(self, lines: list[str]) -> None:
+        if not self.json_output:
+            self._write("\n".join(lines))
+            return
+        for line in lines:
+            level = logging.getLevelName(line_level(line)).lower()
+            self.emit("log", level=level, message=line)
+
+    def log(self, line: str) -> None:
+        """log_callback of the organizer."""
+        self.log_batcher.write(line)
+
+    def progress(
+        self, current: int, total: int, failed: int, estimated_time: float
+    ) -> None:
+        """progress_callback of the organizer, rate limited to progress_interval."""
+        self._last_progress = (current, total, failed, estimated_time)
+        now = monotonic()
+        if now - self._last_progress_time >= self.progress_interval:
+            self._last_progress_time = now
+            # Keep the events in order: log lines of the files counted so far first
+            self.log_batcher.flush()
+            self._emit_progress()
+
+    def _emit_progress(self) -> None:
+        if self._last_progress is None:
+            return
+        current, total, failed, estimated_time = self._last_progress
+        self.emit(
+            "progress",
+            processed=current,
+            total=total,
+            failed=failed,
+            eta_seconds=round(estimated_time, 1) if estimated_time >= 0 else None,
+        )
+
+    def close(self) -> None:
+        """Write the waiting log lines and the exact final progress."""
+        self.log_batcher.close()
+        self._emit_progress()
+
+
+def removal_rules(keep_patterns: list[str]):
+    """Build a non-interactive removal_review_callback.
+
+    Every hidden/system file is approved except those matching a keep pattern.
+    """
+
+    def review(file_paths: list[str]) -> list[str]:
+        return [
+            path
+            for path in file_paths
+            if not any(
+                fnmatch.fnmatch(Path(path).name.lower(), pattern.lower())
+                for pattern in keep_patterns
+            )
+        ]
+
+    return review
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Sort photos and videos into date folders without the GUI.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # Output options of every command
+    output_options = argparse.ArgumentParser(add_help=False)
+    output_options.add_argument(
+        "--json", action="store_true", help="write NDJSON events to stdout"
+    )
+    output_options.add_argument(
+        "--progress-interval",
+        type=float,
+        default=DEFAULT_PROGRESS_INTERVAL,
+        help="minimum seconds between two progress events",
+    )
+    output_options.add_argument(
+        "--log-file", type=Path, help="write the full log to a file"
+    )
+    output_options.add_argument(
+        "--report", type=Path, help="write the JSON run report to a file"
+    )
+
+    # Options shared by the commands that move files out of the source
+    cleanup_options = argparse.ArgumentParser(add_help=False)
+    cleanup_options.add_argument(
+        "--cleanup",
+        action="store_true",
+        help="remove the source folders emptied by the run, with their hidden files",
+    )
+    cleanup_options.add_argument(
+        "--keep-hidden",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="do not remove hidden files matching PATTERN (e.g. desktop.ini), "
+        "their folders stay too; repeatable",
+    )
+
+    organize = commands.add_parser(
+        "organize", parents=[output_options, cleanup_options], help="sort a folder once"
+    )
+    organize.add_argument("source", type=Path)
+    organize.add_argument("destination", type=Path)
+    organize.add_argument(
+        "--sort-by-day", action="store_true", help="YYYY/MM/DD instead of YYYY/MM"
+    )
+    organize.add_argument(
+        "--jobs", type=int, default=1, help="date extraction workers (default: 1)"
+    )
+    organize.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="thread for network shares, process for CPU-heavy HEIC/RAW decodes",
+    )
+    organize.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="overlap reads, decodes and moves in a staged pipeline; "
+        "--jobs sets the decode workers",
+    )
+    organize.add_argument(
+        "--readers",
+        type=int,
+        default=PipelineLimits().readers,
+        help="concurrent header reads of the pipeline",
+    )
+    organize.add_argument(
+        "--writers",
+        type=int,
+        default=PipelineLimits().writers,
+        help="destination folders the pipeline writes to at once",
+    )
+    organize.add_argument(
+        "--duplicates", choices=["off", "report", "skip"], default="off"
+    )
+    organize.add_argument(
+        "--near-duplicates", action="store_true", help="report similar images"
+    )
+    organize.add_argument("--cache", type=Path, help="metadata cache database")
+    organize.add_argument("--catalog", type=Path, help="destination catalog database")
+    organize.add_argument(
+        "--plan", type=Path, help="dry run: write a move plan, move nothing"
+    )
+    organize.add_argument("--journal", type=Path, help="journal the moves to a file")
+    organize.add_argument(
+        "--resume", action="store_true", help="continue the run in --journal"
+    )
+
+    execute = commands.add_parser(
+        "execute-plan",
+        parents=[output_options, cleanup_options],
+        help="apply a move plan",
+    )
+    execute.add_argument("plan", type=Path)
+    execute.add_argument("--source", type=Path, help="override the planned source")
+    execute.add_argument(
+        "--destination", type=Path, help="override the planned destination"
+    )
+
+    undo = commands.add_parser(
+        "undo", parents=[output_options], help="move the files of a journal back"
+    )
+    undo.add_argument("journal", type=Path)
+
+    watch = commands.add_parser(
+        "watch",
+        parents=[output_options],
+        help="sort new files as they arrive, until interrupted",
+    )
+    watch.add_argument("source", type=Path)
+    watch.add_argument("destination", type=Path)
+    watch.add_argument("--sort-by-day", action="store_true")
+    watch.add_argument(
+        "--settle",
+        type=float,
+        default=2.0,
+        help="seconds a file must stay unchanged without a close-write event",
+    )
+    watch.add_argument(
+        "--poll", action="store_true", help="poll instead of using inotify"
+    )
+    watch.add_argument(
+        "--existing", action="store_true", help="also sort the files already there"
+    )
+    watch.add_argument("--journal", type=Path, help="journal the moves to a file")
+    return parser
+
+
+def run(args: argparse.Namespace, events: EventWriter) -> dict:
+    """Run the selected command and return its run report."""
+    organizer = PhotoOrganizer()
+    callbacks = {"progress_callback": events.progress, "log_callback": events.log}
+
+    if args.command == "organize":
+        return organizer.organize_photos(
+            args.source,
+            args.destination,
+            sort_by_day=args.sort_by_day,
+            remove_empty=args.cleanup,
+            removal_review_callback=removal_rules(args.keep_hidden),
+            jobs=args.jobs,
+            executor=args.executor,
+            cache_path=args.cache,
+            catalog_path=args.catalog,
+            duplicates=args.duplicates,
+            near_duplicates=args.near_duplicates,
+            report_path=args.report,
+            plan_path=args.plan,
+            journal_path=args.journal,
+            resume=args.resume,
+            pipeline=(
+                PipelineLimits(
+                    readers=args.readers, decoders=args.jobs, writers=args.writers
+                )
+                if args.pipeline
+                else None
+            ),
+            **callbacks,
+        )
+    if args.command == "execute-plan":
+        return organizer.execute_plan(
+            args.plan,
+            source_folder=args.source,
+            destination_folder=args.destination,
+            remove_empty=args.cleanup,
+            removal_review_callback=removal_rules(args.keep_hidden),
+            report_path=args.report,
+            **callbacks,
+        )
+    if args.command == "undo":
+        return organizer.undo_moves(args.journal, report_path=args.report, **callbacks)
+
+    # watch: stop cleanly on Ctrl+C or a service manager's SIGTERM
+    stop_event = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop_event.set())
+    return organizer.watch_folder(
+        args.source,
+        args.destination,
+        sort_by_day=args.sort_by_day,
+        stop_event=stop_event,
+        settle_seconds=args.settle,
+        use_inotify=False if args.poll else None,
+        process_existing=args.existing,
+        journal_path=args.journal,
+        report_path=args.report,
+        **callbacks,
+    )
+
+
+def main(argv=None) -> int:
+    """Run the command line interface.
+
+    Returns:
+        int: 0 on success, 1 if the command raised an error
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "organize" and args.resume and not args.journal:
+        build_parser().error("--resume needs --journal")
+
+    events = EventWriter(
+        sys.stdout,
+        args.json,
+        args.progress_interval,
+        log_path=args.log_file,
+        # A watch is idle most of the time, its lines are written right away
+        max_delay=0 if args.command == "watch" else DEFAULT_MAX_DELAY,
+    )
+    events.emit("start", command=args.command)
+    try:
+        report = run(args, events)
+    except Exception as e:
+        events.close()
+        logging.error("%s failed: %s", args.command, e)
+        events.emit("error", message=str(e))
+        return 1
+    events.close()
+    events.emit("done", report=report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# Fast parsers for the fixed-format date strings found in photo and video metadata.
+# The common shapes are sliced directly, without datetime.strptime and without raising
+# exceptions. Anything unusual falls back to strptime with the original formats, so
+# the accepted inputs stay the same. Results are memoized: burst shots and clips from
+# one session share the same timestamp strings.
+
+from calendar import monthrange
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional
+
+EXIF_FORMAT = "%Y:%m:%d %H:%M:%S"
+
+# Formats accepted for video metadata, in order of preference
+VIDEO_FORMATS = [
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%fZ",
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%d",
+]
+
+_CACHE_SIZE = 4096
+
+# Field positions of the fixed-width layouts
+_DATE_SPANS = ((0, 4), (5, 7), (8, 10))
+_EXIF_SPANS = _DATE_SPANS + ((11, 13), (14, 16), (17, 19))
+_TIME_SPANS = ((1, 3), (4, 6), (7, 9))  # After the date and its separator
+
+
+def _ints(value: str, spans: tuple) -> Optional[list[int]]:
+    """Read the (start, end) slices of a string as integers.
+
+    Returns None unless every slice is made of ASCII digits only. Anything else
+    (space padding, non-ASCII digits) is left to strptime.
+    """
+    fields = []
+    for start, end in spans:
+        part = value[start:end]
+        if not (part.isascii() and part.isdigit()):
+            return None
+        fields.append(int(part))
+    return fields
+
+
+def _make_date(year: int, month: int, day: int) -> Optional[date]:
+    """Build a date, or None if it does not exist."""
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= monthrange(year, month)[1]:
+        return None
+    return date(year, month, day)
+
+
+def _valid_time(hour: int, minute: int, second: int) -> bool:
+    # Same limits as datetime.strptime
+    return hour <= 23 and minute <= 59 and second <= 59
+
+
+def _strptime_date(value: str, formats: list[str]) -> Optional[date]:
+    """Slow path: try each format with strptime."""
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_exif_datetime(value: str) -> Optional[date]:
+    """Parse an EXIF "YYYY:MM:DD HH:MM:SS" string.
+
+    Returns:
+        Optional[date]: The date, or None if the string is not a valid EXIF date
+    """
+    if (
+        len(value) == 19
+        and value[4] == ":"
+        and value[7] == ":"
+        and value[10] == " "
+        and value[13] == ":"
+        and value[16] == ":"
+    ):
+        fields = _ints(value, _EXIF_SPANS)
+        if fields is not None:
+            year, month, day, hour, minute, second = fields
+            if not _valid_time(hour, minute, second):
+                return None
+            return _make_date(year, month, day)
+    return _strptime_date(value, [EXIF_FORMAT])
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def parse_video_datetime(value: str) -> Optional[date]:
+    """Parse a video metadata date string, e.g. "UTC 2021-05-06 10:11:12".
+
+    Accepts the VIDEO_FORMATS, after removing a "UTC" marker.
+
+    Returns:
+        Optional[date]: The date, or None if no format matches
+    """
+    # Clean up and standardize date string
+    value = value.replace(" UTC", "").replace("UTC ", "")
+
+    if len(value) >= 10 and value[4] == "-" and value[7] == "-":
+        rest = value[10:]
+        if not rest:
+            matches = True
+        elif len(rest) >= 9 and rest[0] in " T" and rest[3] == ":" and rest[6] == ":":
+            tail = rest[9:]
+            if rest[0] == " ":
+                matches = not tail
+            else:
+                # "Z" or ".fffZ" with 1 to 6 fraction digits
+                matches = tail == "Z" or (
+                    2 < len(tail) <= 8
+                    and tail[0] == "."
+                    and tail[-1] == "Z"
+                    and _ints(tail, ((1, -1),)) is not None
+                )
+            if matches:
+                time_fields = _ints(rest, _TIME_SPANS)
+                if time_fields is None:
+                    matches = False
+                elif not _valid_time(*time_fields):
+                    return None
+        else:
+            matches = False
+        if matches:
+            date_fields = _ints(value, _DATE_SPANS)
+            if date_fields is not None:
+                return _make_date(*date_fields)
+    return _strptime_date(value, VIDEO_FORMATS)
@@ -0,0 +1,263 @@
+# Persistent catalog of the destination library.
+# Answers "does this folder exist" and "is this file name taken" from memory instead of
+# probing the destination once or twice per file, which is slow on network drives.
+# The catalog is stored in SQLite and refreshed per directory: only folders whose
+# modification time changed since the last run are rescanned.
+
+import os
+import re
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+# Matches date folders created by the organizer: YYYY, YYYY/MM or YYYY/MM/DD
+_DATE_FOLDER = re.compile(r"^(\d{4})(?:[\\/](\d{2}))?(?:[\\/](\d{2}))?$")
+
+
+def _folder_date(rel_dir: str) -> Optional[str]:
+    """Return the date a destination folder stands for, e.g. "2021-03", or None."""
+    match = _DATE_FOLDER.match(rel_dir)
+    if not match:
+        return None
+    return "-".join(part for part in match.groups() if part)
+
+
+class DestinationCatalog:
+    """
+    In-memory view of the files and folders in the destination library,
+    persisted between runs and updated in bulk after moves.
+    """
+
+    def __init__(
+        self,
+        destination_root: Union[str, Path],
+        catalog_path: Union[str, Path],
+        flush_interval: int = 1000,
+    ):
+        """Open the catalog for a destination folder.
+
+        Args:
+            destination_root: Root of the destination library
+            catalog_path: Path of the SQLite database that stores the catalog
+            flush_interval: Number of added files before they are written to disk
+        """
+        self.root = Path(destination_root)
+        self._root_str = str(self.root)
+        self._root_key = os.path.normcase(os.path.abspath(self.root))
+        self.flush_interval = flush_interval
+        # rel_dir -> directory mtime_ns (None until known)
+        self._dirs: dict[str, Optional[int]] = {}
+        # rel_dir -> {file name: (size, mtime_ns)}
+        self._files: dict[str, dict[str, tuple[int, int]]] = {}
+        self._pending_files: list[tuple] = []
+        self._touched_dirs: set[str] = set()
+        self.rescanned_dirs: int = 0
+
+        catalog_path = Path(catalog_path)
+        catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(catalog_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS dirs (
+                root TEXT NOT NULL,
+                rel_dir TEXT NOT NULL,
+                mtime_ns INTEGER,
+                PRIMARY KEY (root, rel_dir)
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS files (
+                root TEXT NOT NULL,
+                rel_dir TEXT NOT NULL,
+                name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                folder_date TEXT,
+                PRIMARY KEY (root, rel_dir, name)
+            )"""
+        )
+        self._conn.commit()
+
+    # Keys
+
+    def _rel(self, path: Union[str, Path]) -> str:
+        """Relative, case-normalized key of a path inside the destination."""
+        path_str = str(path)
+        rest = path_str[len(self._root_str) :]
+        if path_str.startswith(self._root_str) and (
+            not rest or rest[0] in "\\/" or self._root_str[-1] in "\\/"
+        ):
+            rel = rest.lstrip("\\/")
+        else:
+            rel = os.path.relpath(path_str, self._root_str)
+            if rel == ".":
+                rel = ""
+        return os.path.normcase(rel)
+
+    # Loading and refreshing
+
+    def load(self) -> None:
+        """Load the stored catalog and rescan folders that changed since it was saved.
+
+        A missing or empty catalog is rebuilt from a full scan of the destination.
+        """
+        for rel_dir, mtime_ns in self._conn.execute(
+            "SELECT rel_dir, mtime_ns FROM dirs WHERE root=?", (self._root_key,)
+        ):
+            self._dirs[rel_dir] = mtime_ns
+            self._files[rel_dir] = {}
+        for rel_dir, name, size, mtime_ns in self._conn.execute(
+            "SELECT rel_dir, name, size, mtime_ns FROM files WHERE root=?",
+            (self._root_key,),
+        ):
+            self._files.setdefault(rel_dir, {})[name] = (size, mtime_ns)
+
+        if not self._dirs:
+            logging.info("Destination catalog missing, scanning %s", self.root)
+            self._scan_tree("")
+            self._rewrite()
+            return
+
+        # Any change to a folder's entries updates its mtime, so only stat folders
+        stale = []
+        for rel_dir, mtime_ns in list(self._dirs.items()):
+            try:
+                current = os.stat(os.path.join(self._root_str, rel_dir)).st_mtime_ns
+            except OSError:
+                current = None
+            if current != mtime_ns:
+                stale.append(rel_dir)
+
+        for rel_dir in sorted(stale):
+            if rel_dir in self._dirs:  # May be gone with a removed parent
+                self._rescan_dir(rel_dir)
+        if stale:
+            logging.info("Destination catalog: rescanned %d changed folders", len(stale))
+            self._rewrite()
+
+    def _scan_dir(self, rel_dir: str) -> list[str]:
+        """Scan one folder into the catalog and return its subfolder keys."""
+        path = os.path.join(self._root_str, rel_dir)
+        files = {}
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(os.path.normcase(os.path.join(rel_dir, entry.name)))
+                elif entry.is_file():
+                    st = entry.stat()
+                    files[os.path.normcase(entry.name)] = (st.st_size, st.st_mtime_ns)
+        self._files[rel_dir] = files
+        self._dirs[rel_dir] = os.stat(path).st_mtime_ns
+        self.rescanned_dirs += 1
+        return subdirs
+
+    def _scan_tree(self, rel_dir: str) -> None:
+        """Scan a folder and everything below it into the catalog."""
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            try:
+                stack.extend(self._scan_dir(current))
+            except OSError as e:
+                logging.warning("Failed to scan destination folder %s: %s", current, e)
+
+    def _forget_tree(self, rel_dir: str) -> None:
+        """Remove a folder and everything below it from the catalog."""
+        prefix = rel_dir + os.sep if rel_dir else ""
+        for key in [k for k in self._dirs if k == rel_dir or k.startswith(prefix)]:
+            self._dirs.pop(key, None)
+            self._files.pop(key, None)
+
+    def _rescan_dir(self, rel_dir: str) -> None:
+        """Refresh a changed folder, scanning new subfolders and dropping removed ones."""
+        try:
+            subdirs = self._scan_dir(rel_dir)
+        except OSError:
+            self._forget_tree(rel_dir)
+            return
+        for subdir in subdirs:
+            if subdir not in self._dirs:
+                self._scan_tree(subdir)
+
+    def _rewrite(self) -> None:
+        """Replace the stored catalog with the in-memory state."""
+        with self._conn:
+            self._conn.execute("DELETE FROM dirs WHERE root=?", (self._root_key,))
+            self._conn.execute("DELETE FROM files WHERE root=?", (self._root_key,))
+            self._conn.executemany(
+                "INSERT INTO dirs VALUES (?, ?, ?)",
+                [(self._root_key, d, m) for d, m in self._dirs.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (self._root_key, d, name, size, mtime_ns, _folder_date(d))
+                    for d, files in self._files.items()
+                    for name, (size, mtime_ns) in files.items()
+                ],
+            )
+
+    # Queries and updates
+
+    def has_dir(self, path: Union[str, Path]) -> bool:
+        """Check whether a destination folder exists."""
+        return self._rel(path) in self._dirs
+
+    def add_dir(self, path: Union[str, Path]) -> None:
+        """Record a folder (and its parents) created in the destination."""
+        rel_dir = self._rel(path)
+        while rel_dir not in self._dirs:
+            self._dirs[rel_dir] = None
+            self._files.setdefault(rel_dir, {})
+            self._touched_dirs.add(rel_dir)
+            if not rel_dir:
+                break
+            rel_dir = os.path.dirname(rel_dir)
+        # Creating the folders also changed the mtime of the existing parent
+        self._touched_dirs.add(rel_dir)
+
+    def contains(self, path: Union[str, Path]) -> bool:
+        """Check whether a file path is already taken in the destination."""
+        rel_dir, name = os.path.split(self._rel(path))
+        return name in self._files.get(rel_dir, ())
+
+    def add_file(self, path: Union[str, Path], size: int, mtime_ns: int) -> None:
+        """Record a file moved into the destination."""
+        rel_dir, name = os.path.split(self._rel(path))
+        self._files.setdefault(rel_dir, {})[name] = (size, mtime_ns)
+        self._touched_dirs.add(rel_dir)
+        self._pending_files.append(
+            (self._root_key, rel_dir, name, size, mtime_ns, _folder_date(rel_dir))
+        )
+        if len(self._pending_files) >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write added files in bulk and record the new mtimes of touched folders."""
+        for rel_dir in self._touched_dirs:
+            try:
+                self._dirs[rel_dir] = os.stat(
+                    os.path.join(self._root_str, rel_dir)
+                ).st_mtime_ns
+            except OSError:
+                self._dirs[rel_dir] = None  # Rescanned on the next load
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                self._pending_files,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)",
+                [(self._root_key, d, self._dirs[d]) for d in self._touched_dirs],
+            )
+        self._pending_files.clear()
+        self._touched_dirs.clear()
+
+    def close(self) -> None:
+        """Flush pending updates and close the database."""
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
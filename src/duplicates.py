@@ -0,0 +1,90 @@
+# Byte-identical duplicate detection for the source tree.
+# Files are bucketed by size first, then by a hash of a small head/tail sample, and
+# only files that still collide are hashed in full. Hashing runs on a thread pool.
+
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Union
+
+# Bytes hashed from the start and from the end of a file in the sample stage
+SAMPLE_SIZE = 64 * 1024
+# Read size for full-content hashing
+READ_SIZE = 1024 * 1024
+
+
+def sample_hash(path: Union[str, Path], size: int) -> bytes:
+    """Hash the head and tail of a file (the whole file when it is small)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        if size <= 2 * SAMPLE_SIZE:
+            digest.update(f.read())
+        else:
+            digest.update(f.read(SAMPLE_SIZE))
+            f.seek(size - SAMPLE_SIZE)
+            digest.update(f.read(SAMPLE_SIZE))
+    return digest.digest()
+
+
+def full_hash(path: Union[str, Path]) -> bytes:
+    """Hash the complete contents of a file."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _safe(func, *args):
+    """Run a hash function, returning None for unreadable files."""
+    try:
+        return func(*args)
+    except OSError:
+        return None
+
+
+def _split_groups(groups: list[list], key_func, pool: ThreadPoolExecutor) -> list[list]:
+    """Split candidate groups by a hash key, keeping only groups with 2+ members."""
+    members = [record for group in groups for record in group]
+    keys = pool.map(key_func, members)
+    buckets = defaultdict(list)
+    # Group index keeps equal hashes from different size buckets apart
+    group_index = {id(record): i for i, group in enumerate(groups) for record in group}
+    for record, key in zip(members, keys):
+        if key is not None:
+            buckets[(group_index[id(record)], key)].append(record)
+    return [group for group in buckets.values() if len(group) > 1]
+
+
+def find_duplicate_groups(records: Iterable, jobs: int = 4) -> list[list]:
+    """Find groups of byte-identical files.
+
+    Args:
+        records: FileRecord-like objects with `path` and `size` attributes
+        jobs: Number of threads used for hashing
+
+    Returns:
+        list: Groups of two or more identical records, each in input order
+    """
+    records = list(records)
+    position = {id(record): i for i, record in enumerate(records)}
+    by_size = defaultdict(list)
+    for record in records:
+        by_size[record.size].append(record)
+    candidates = [group for group in by_size.values() if len(group) > 1]
+    if not candidates:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        candidates = _split_groups(
+            candidates, lambda r: _safe(sample_hash, r.path, r.size), pool
+        )
+        # Small files were hashed completely by the sample stage
+        confirmed = [g for g in candidates if g[0].size <= 2 * SAMPLE_SIZE]
+        large = [g for g in candidates if g[0].size > 2 * SAMPLE_SIZE]
+        if large:
+            confirmed += _split_groups(large, lambda r: _safe(full_hash, r.path), pool)
+
+    # Report groups in scan order of their first file
+    return sorted(confirmed, key=lambda group: position[id(group[0])])
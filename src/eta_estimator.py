@@ -0,0 +1,123 @@
+# Byte-weighted estimate of the time remaining in a run.
+# Throughput is tracked per file class (photos, RAW files, videos) as exponentially
+# weighted moving averages of seconds and bytes per file, so a 3 GB video and a 10 KB
+# PNG no longer count the same. Every update is O(1).
+
+from typing import Optional
+
+# Weight of the newest file in the moving averages
+DEFAULT_ALPHA = 0.05
+# Files to complete before an estimate is given
+DEFAULT_MIN_SAMPLES = 10
+
+
+class _ClassStats:
+    __slots__ = (
+        "samples",
+        "seconds",
+        "bytes",
+        "found_files",
+        "found_bytes",
+        "done_files",
+        "done_bytes",
+    )
+
+    def __init__(self):
+        self.samples = 0
+        self.seconds = 0.0  # EWMA of seconds per file
+        self.bytes = 0.0  # EWMA of bytes per file
+        # Written only by the scanner thread
+        self.found_files = 0
+        self.found_bytes = 0
+        # Written only by the processing thread
+        self.done_files = 0
+        self.done_bytes = 0
+
+
+class EtaEstimator:
+    """Predict the remaining time from the remaining bytes of each file class.
+
+    The scanner reports every file it finds with add_pending(), processing reports
+    every finished file with complete() or skip(). Both may run on different threads:
+    each counter has a single writer.
+    """
+
+    def __init__(
+        self, alpha: float = DEFAULT_ALPHA, min_samples: int = DEFAULT_MIN_SAMPLES
+    ):
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.samples = 0
+        self._classes: dict[str, _ClassStats] = {}
+
+    def _stats(self, file_class: str) -> _ClassStats:
+        stats = self._classes.get(file_class)
+        if stats is None:
+            # setdefault keeps the first object if both threads create it at once
+            stats = self._classes.setdefault(file_class, _ClassStats())
+        return stats
+
+    def add_pending(self, file_class: str, size: int) -> None:
+        """Register a file found by the scan that still has to be processed."""
+        stats = self._stats(file_class)
+        stats.found_files += 1
+        stats.found_bytes += size
+
+    def complete(self, file_class: str, size: int, seconds: float) -> None:
+        """Record a processed file and the time it took."""
+        stats = self._stats(file_class)
+        stats.done_files += 1
+        stats.done_bytes += size
+        stats.samples += 1
+        self.samples += 1
+        # Plain average for the first files, so the first sample does not dominate
+        alpha = max(self.alpha, 1 / stats.samples)
+        stats.seconds += alpha * (seconds - stats.seconds)
+        stats.bytes += alpha * (size - stats.bytes)
+
+    def skip(self, file_class: str, size: int) -> None:
+        """Remove a file that needs no more work (failed, duplicate, already there)."""
+        stats = self._stats(file_class)
+        stats.done_files += 1
+        stats.done_bytes += size
+
+    def estimate(self) -> float:
+        """Return the estimated seconds remaining, or -1 while there is too little data."""
+        if self.samples < self.min_samples:
+            return -1
+        classes = list(self._classes.values())
+        measured = [s for s in classes if s.samples and s.seconds > 0]
+        if not measured:
+            return -1
+        # Classes without samples of their own use the overall throughput
+        overall_rate = self._rate(
+            sum(s.bytes * s.samples for s in measured),
+            sum(s.seconds * s.samples for s in measured),
+        )
+        overall_seconds = sum(s.seconds * s.samples for s in measured) / sum(
+            s.samples for s in measured
+        )
+        remaining = 0.0
+        for stats in classes:
+            files_left = stats.found_files - stats.done_files
+            if files_left <= 0:
+                continue
+            bytes_left = max(stats.found_bytes - stats.done_bytes, 0)
+            if stats.samples and stats.seconds > 0:
+                rate = self._rate(stats.bytes, stats.seconds)
+                per_file = stats.seconds
+            else:
+                rate = overall_rate
+                per_file = overall_seconds
+            if rate:
+                remaining += bytes_left / rate
+            else:
+                remaining += files_left * per_file
+        return remaining
+
+    @staticmethod
+    def _rate(size: float, seconds: float) -> Optional[float]:
+        """Bytes per second, or None when no bytes were seen."""
+        if size <= 0 or seconds <= 0:
+            return None
+        return size / seconds
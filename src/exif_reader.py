@@ -0,0 +1,162 @@
+# Header-only EXIF date reader for JPEG, TIFF and TIFF-based RAW files (CR2/ARW/DNG).
+# Reads a bounded prefix of the file and walks the TIFF IFD chain straight to the
+# DateTimeOriginal (36867) and DateTime (306) tags, without building Pillow image state.
+
+import os
+import struct
+from pathlib import Path
+from typing import Optional, Union
+
+# Formats whose EXIF block lives in a TIFF structure near the start of the file
+HEADER_EXTENSIONS = {".jpg", ".jpeg", ".tif", ".tiff", ".cr2", ".arw", ".dng"}
+
+# JPEG APP1 segments are limited to 64 KiB, RAW files keep IFD0 and the EXIF
+# sub-IFD in the first few KiB, so this prefix covers nearly every file
+PREFIX_SIZE = 128 * 1024
+
+TAG_DATETIME = 306
+TAG_EXIF_IFD = 0x8769
+TAG_DATETIME_ORIGINAL = 36867
+
+_TYPE_ASCII = 2
+_TYPE_LONG = 4
+_TYPE_IFD = 13
+
+
+def _read_prefix(file: Union[str, Path], size: int) -> bytes:
+    """Read the first `size` bytes of a file with a single read call."""
+    fd = os.open(file, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        if hasattr(os, "pread"):
+            return os.pread(fd, size, 0)
+        # os.pread is not available on Windows
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _find_jpeg_tiff(data: bytes) -> Optional[bytes]:
+    """Locate the TIFF block of the EXIF APP1 segment in a JPEG prefix.
+
+    Returns:
+        The TIFF block, b"" if the JPEG has no EXIF segment,
+        or None if the prefix ended before a decision could be made
+    """
+    pos = 2  # Skip SOI marker
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # Fill byte
+            pos += 1
+            continue
+        if marker == 0xDA or marker == 0xD9:  # Start of scan / end of image
+            return b""
+        length = struct.unpack_from(">H", data, pos + 2)[0]
+        segment_end = pos + 2 + length
+        if marker == 0xE1 and data[pos + 4 : pos + 10] == b"Exif\x00\x00":
+            if segment_end > len(data):
+                return None
+            return data[pos + 10 : segment_end]
+        pos = segment_end
+    return None
+
+
+def _read_ifd(tiff: bytes, offset: int, endian: str) -> Optional[dict]:
+    """Read the entries of one IFD as {tag: (type, count, value_offset)}."""
+    if offset + 2 > len(tiff):
+        return None
+    count = struct.unpack_from(endian + "H", tiff, offset)[0]
+    if offset + 2 + count * 12 > len(tiff):
+        return None
+    entries = {}
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        tag, type_, value_count = struct.unpack_from(endian + "HHI", tiff, entry)
+        entries[tag] = (type_, value_count, entry + 8)
+    return entries
+
+
+def _read_ascii(tiff: bytes, entry: tuple, endian: str) -> Optional[str]:
+    """Decode an ASCII tag value, or None if it cannot be read from the prefix."""
+    type_, count, value_pos = entry
+    if type_ != _TYPE_ASCII:
+        return None
+    if count > 4:
+        value_pos = struct.unpack_from(endian + "I", tiff, value_pos)[0]
+    raw = tiff[value_pos : value_pos + count]
+    if len(raw) != count:
+        return None
+    return raw.split(b"\x00", 1)[0].decode("ascii", errors="replace")
+
+
+def read_exif_dates(
+    file: Union[str, Path], prefix_size: int = PREFIX_SIZE
+) -> Optional[tuple[Optional[str], Optional[str]]]:
+    """Read the EXIF date tags of a file from its header.
+
+    Args:
+        file: Path of a JPEG, TIFF or TIFF-based RAW file
+        prefix_size: Number of bytes to read from the start of the file
+
+    Returns:
+        Optional[tuple]: (DateTimeOriginal, DateTime) strings, each None when the tag
+        is absent, or None when the header could not be decided and the caller
+        should fall back to a full parser
+    """
+    try:
+        data = _read_prefix(file, prefix_size)
+    except OSError:
+        return None
+
+    try:
+        if data[:2] == b"\xff\xd8":
+            tiff = _find_jpeg_tiff(data)
+            if tiff is None:
+                return None
+            if not tiff:
+                return None, None
+        else:
+            tiff = data
+
+        if tiff[:2] == b"II":
+            endian = "<"
+        elif tiff[:2] == b"MM":
+            endian = ">"
+        else:
+            return None
+        if struct.unpack_from(endian + "H", tiff, 2)[0] != 42:
+            return None
+
+        ifd0_offset = struct.unpack_from(endian + "I", tiff, 4)[0]
+        ifd0 = _read_ifd(tiff, ifd0_offset, endian)
+        if ifd0 is None:
+            return None
+
+        date_time = None
+        if TAG_DATETIME in ifd0:
+            date_time = _read_ascii(tiff, ifd0[TAG_DATETIME], endian)
+            if date_time is None:
+                return None
+
+        date_time_original = None
+        if TAG_EXIF_IFD in ifd0:
+            type_, _, value_pos = ifd0[TAG_EXIF_IFD]
+            if type_ not in (_TYPE_LONG, _TYPE_IFD):
+                return None
+            exif_offset = struct.unpack_from(endian + "I", tiff, value_pos)[0]
+            exif_ifd = _read_ifd(tiff, exif_offset, endian)
+            if exif_ifd is None:
+                return None
+            if TAG_DATETIME_ORIGINAL in exif_ifd:
+                date_time_original = _read_ascii(
+                    tiff, exif_ifd[TAG_DATETIME_ORIGINAL], endian
+                )
+                if date_time_original is None:
+                    return None
+
+        return date_time_original, date_time
+
+    except struct.error:
+        # Truncated or malformed header
+        return None
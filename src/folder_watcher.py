@@ -0,0 +1,280 @@
+# Filesystem watcher for the continuous ingest mode of PhotoOrganizer.
+# Uses inotify on Linux (through ctypes, no extra dependency) and falls back to
+# polling elsewhere. Polling only lists the folders whose modification time changed,
+# so neither backend rescans the whole tree. Files are reported once they are
+# complete: after a close-write or move-in event, or once their size and mtime
+# stayed the same for a settle time.
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+from time import monotonic, sleep, time_ns
+from typing import Callable, Iterator, Optional, Union
+
+# Seconds a file's size and mtime must stay unchanged before it is reported
+DEFAULT_SETTLE_SECONDS = 2.0
+# Seconds between two checks of pending files (and between polls)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify constants from <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+# Folders modified this recently are listed again on the next poll, as files
+# created within the filesystem's timestamp granularity leave the mtime unchanged
+_RECENT_FOLDER_NS = 3_000_000_000
+
+# Kinds of change reported by the backends
+CREATED = "created"  # New or growing file, reported once it settled
+COMPLETE = "complete"  # Writer closed the file or it was moved in
+FOLDER = "folder"  # New folder, its files are picked up by add_tree()
+OVERFLOW = "overflow"  # Events were lost, the tree has to be listed again
+
+
+class _InotifyBackend:
+    """One inotify watch per folder, events read from a non-blocking descriptor."""
+
+    name = "inotify"
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._folders: dict[int, str] = {}
+
+    def add_folder(self, path: str) -> None:
+        wd = self._add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"Cannot watch {path}: {os.strerror(error)}")
+        self._folders[wd] = path
+
+    def read(self, timeout: float) -> list[tuple[str, str]]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+        changes = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                changes.append(("", OVERFLOW))
+                continue
+            if mask & (_IN_IGNORED | _IN_DELETE_SELF):
+                self._folders.pop(wd, None)
+                continue
+            folder = self._folders.get(wd)
+            if folder is None or not name:
+                continue
+            path = os.path.join(folder, name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    changes.append((path, FOLDER))
+            elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                changes.append((path, COMPLETE))
+            else:
+                changes.append((path, CREATED))
+        return changes
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Lists a folder again only when its modification time changed."""
+
+    name = "polling"
+
+    def __init__(self):
+        # Folder -> (mtime_ns, names of its entries)
+        self._folders: dict[str, tuple[int, set[str]]] = {}
+
+    def add_folder(self, path: str) -> None:
+        self._folders[path] = self._list(path)
+
+    @staticmethod
+    def _list(path: str) -> tuple[int, set[str]]:
+        mtime_ns = os.stat(path).st_mtime_ns
+        return mtime_ns, set(os.listdir(path))
+
+    def read(self, timeout: float) -> list[tuple[str, str]]:
+        sleep(timeout)
+        changes = []
+        for folder, (mtime_ns, names) in list(self._folders.items()):
+            try:
+                if (
+                    os.stat(folder).st_mtime_ns == mtime_ns
+                    and time_ns() - mtime_ns > _RECENT_FOLDER_NS
+                ):
+                    continue
+                self._folders[folder] = self._list(folder)
+            except OSError:
+                self._folders.pop(folder, None)  # Folder was removed
+                continue
+            for name in self._folders[folder][1] - names:
+                path = os.path.join(folder, name)
+                changes.append((path, FOLDER if os.path.isdir(path) else CREATED))
+        return changes
+
+    def close(self) -> None:
+        self._folders.clear()
+
+
+class FolderWatcher:
+    """Report the complete new files of a folder tree as they arrive."""
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        accept_file: Callable[[Path], bool],
+        accept_folder: Callable[[str], bool] = lambda name: True,
+        exclude: Optional[Union[str, Path]] = None,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: Optional[bool] = None,
+    ):
+        """
+        Args:
+            root: Folder tree to watch
+            accept_file: Returns whether a complete file should be reported
+            accept_folder: Returns whether a folder (by name) should be watched
+            exclude: Optional folder to ignore, e.g. a destination inside root
+            settle_seconds: Time a file must stay unchanged when no close-write
+                event is available
+            poll_interval: Time between two checks of pending files, and between
+                two polls without inotify
+            use_inotify: Force (True) or disable (False) inotify, None picks
+                inotify when the platform supports it
+        """
+        self.root = os.path.abspath(root)
+        self.accept_file = accept_file
+        self.accept_folder = accept_folder
+        self.excluded = os.path.normcase(os.path.abspath(exclude)) if exclude else None
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self._backend = None
+        if use_inotify is None:
+            use_inotify = sys.platform.startswith("linux")
+        if use_inotify:
+            try:
+                self._backend = _InotifyBackend()
+            except (OSError, AttributeError) as e:
+                logging.warning("inotify unavailable, polling instead: %s", e)
+        if self._backend is None:
+            self._backend = _PollingBackend()
+        # Path -> (size, mtime_ns, time of the last change) of files still settling
+        self._pending: dict[str, tuple[int, int, float]] = {}
+        self._complete: set[str] = set()
+
+    @property
+    def backend_name(self) -> str:
+        return self._backend.name
+
+    def _add_tree(self, folder: str, report_files: bool) -> None:
+        """Watch a folder and its subfolders, optionally queueing their files."""
+        stack = [folder]
+        while stack:
+            current = stack.pop()
+            try:
+                self._backend.add_folder(current)
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self._watch_folder(entry.path, entry.name):
+                                stack.append(entry.path)
+                        elif report_files:
+                            self._pending[entry.path] = (-1, -1, monotonic())
+            except OSError as e:
+                logging.warning("Failed to watch %s: %s", current, e)
+
+    def _watch_folder(self, path: str, name: str) -> bool:
+        return self.accept_folder(name) and (
+            self.excluded is None
+            or os.path.normcase(os.path.abspath(path)) != self.excluded
+        )
+
+    def _settled(self) -> list[Path]:
+        """Return the pending files that are complete, dropping vanished ones."""
+        now = monotonic()
+        ready = []
+        for path, (size, mtime_ns, changed_at) in list(self._pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                self._complete.discard(path)
+                continue
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns):
+                self._pending[path] = (st.st_size, st.st_mtime_ns, now)
+                if path not in self._complete:
+                    continue
+            elif path not in self._complete and now - changed_at < self.settle_seconds:
+                continue
+            del self._pending[path]
+            self._complete.discard(path)
+            if self.accept_file(Path(path)):
+                ready.append(Path(path))
+        return ready
+
+    def watch(
+        self, stop_event: Optional[threading.Event] = None, existing: bool = False
+    ) -> Iterator[list[Path]]:
+        """Yield batches of complete new files until stop_event is set.
+
+        Args:
+            stop_event: Optional event that ends the watch
+            existing: Whether the files already in the tree are reported too
+
+        Yields:
+            list[Path]: Files that are complete and accepted, in arrival order
+        """
+        stop_event = stop_event or threading.Event()
+        self._add_tree(self.root, report_files=existing)
+        try:
+            while not stop_event.is_set():
+                timeout = self.poll_interval if not self._pending else 0.2
+                for path, kind in self._backend.read(min(timeout, self.poll_interval)):
+                    if kind == OVERFLOW:
+                        # Events were lost: list the tree once, queueing every file
+                        logging.warning("Watch events lost, listing %s", self.root)
+                        self._add_tree(self.root, report_files=True)
+                    elif kind == FOLDER:
+                        if self._watch_folder(path, os.path.basename(path)):
+                            self._add_tree(path, report_files=True)
+                    else:
+                        if kind == COMPLETE:
+                            self._complete.add(path)
+                        self._pending.setdefault(path, (-1, -1, monotonic()))
+                ready = self._settled()
+                if ready:
+                    yield ready
+        finally:
+            self._backend.close()
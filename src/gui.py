@@ -2,13 +2,16 @@
 # This script creates a simple GUI for the Photo Organizer application using PyQt6.
 import sys
 import logging
+from collections import deque
 from pathlib import Path
+from typing import Optional
 from PyQt6 import QtWidgets, QtCore
 from PyQt6 import QtGui
 
 from assets.MainWindow import Ui_MainWindow
 from assets.ProgressWindow import Ui_ProgressWindow
 from PhotoOrganizer_v3 import PhotoOrganizer
+from log_sink import LogBatcher, default_log_path, line_level
 
 logging.basicConfig(level=logging.INFO)
 
@@ -25,19 +28,28 @@ except ImportError:
     pass
 
 
+def log_folder() -> Optional[Path]:
+    """Return the per-user folder of the run logs, or None if Qt has none."""
+    location = QtCore.QStandardPaths.writableLocation(
+        QtCore.QStandardPaths.StandardLocation.AppDataLocation
+    )
+    return Path(location) / "logs" if location else None
+
+
 # Worker classes
 class PhotoOrganizerWorker(QtCore.QThread):
     # Custom signals to communicate with the main thread
-    # For progress updates (current, total, failed)
+    # For the final progress (current, total, failed, time remaining), intermediate
+    # values are published in `progress` and sampled by the progress dialog
     progress_updated = QtCore.pyqtSignal(int, int, int, float)
-    # For log messages
-    log_updated = QtCore.pyqtSignal(str)
+    # For log messages, delivered in batches
+    logs_updated = QtCore.pyqtSignal(list)
     # When task completes
     finished = QtCore.pyqtSignal()
     # For error handling
     error = QtCore.pyqtSignal(str)
-    # For invoke removal confirmation
-    remove_confirmation = QtCore.pyqtSignal(str)
+    # For the review of all hidden/system files the cleanup would remove
+    removal_review_requested = QtCore.pyqtSignal(list)
 
     def __init__(self, organizer, source, destination, sort_by_day, remove_empty):
         super().__init__()
@@ -48,21 +60,48 @@ class PhotoOrganizerWorker(QtCore.QThread):
         self.sort_by_day = sort_by_day
         self.remove_empty = remove_empty
         self.confirmation_loop = None
-        self.confirmation_response = None
+        self.approved_removals: list[str] = []
+        # Latest counters, replaced as a whole so readers never see a partial update
+        self.progress: Optional[tuple[int, int, int, float]] = None
+        # Byte progress of the file being copied to another drive (done, total)
+        self.file_progress: Optional[tuple[int, int]] = None
+        # Log lines go to the dialog in batches and, complete, to a file in the
+        # user's application data folder
+        folder = log_folder()
+        self.log_batcher = LogBatcher(
+            self.logs_updated.emit, default_log_path(folder) if folder else None
+        )
+
+    def flush_logs(self) -> None:
+        """Deliver waiting log lines, e.g. when no new line arrived for a while."""
+        self.log_batcher.flush()
+
+    def publish_progress(
+        self, current: int, total: int, failed: int, estimated_time: float
+    ) -> None:
+        """Store the latest counters (progress_callback of organize_photos)."""
+        self.progress = (current, total, failed, estimated_time)
+
+    def publish_file_progress(self, done: int, total: int) -> None:
+        """Store the byte progress of the current copy (byte_progress_callback)."""
+        self.file_progress = (done, total)
 
-    @QtCore.pyqtSlot(bool)
-    def handle_confirmation_response(self, confirmed: bool):
-        """Handle the user's response to the removal confirmation."""
-        self.confirmation_response = confirmed
+    @QtCore.pyqtSlot(list)
+    def handle_review_response(self, approved: list):
+        """Handle the files the user approved for removal."""
+        self.approved_removals = approved
         if self.confirmation_loop and self.confirmation_loop.isRunning():
             self.confirmation_loop.quit()
 
-    def ask_for_removal_confirmation(self, file_path: str):
-        """Ask user for confirmation via signal and wait for response"""
+    def review_removals(self, file_paths: list[str]) -> list[str]:
+        """Ask the user once which files may be removed and wait for the response"""
         self.confirmation_loop = QtCore.QEventLoop()
-        self.remove_confirmation.emit(file_path)
-        self.confirmation_loop.exec()  # Blocks until confirmation is received
-        return self.confirmation_response
+        self.approved_removals = []
+        # Show the log up to this point before asking
+        self.flush_logs()
+        self.removal_review_requested.emit(file_paths)
+        self.confirmation_loop.exec()  # Blocks until the review is closed
+        return self.approved_removals
 
     def run(self):
         try:
@@ -71,14 +110,31 @@ class PhotoOrganizerWorker(QtCore.QThread):
                 destination_folder=self.destination,
                 sort_by_day=self.sort_by_day,
                 remove_empty=self.remove_empty,
-                progress_callback=self.progress_updated.emit,
-                log_callback=self.log_updated.emit,
-                remove_confirmation_callback=self.ask_for_removal_confirmation,
+                progress_callback=self.publish_progress,
+                log_callback=self.log_batcher.write,
+                removal_review_callback=self.review_removals,
+                byte_progress_callback=self.publish_file_progress,
             )
+            self.close_log()
+            self.emit_final_progress()
             self.finished.emit()
         except Exception as e:
+            self.close_log()
+            self.emit_final_progress()
             self.error.emit(str(e))
 
+    def close_log(self):
+        """Flush the remaining log lines and close the log file."""
+        if self.log_batcher.log_path is not None:
+            self.log_batcher.write(f" • Full log: {self.log_batcher.log_path}")
+        self.log_batcher.close()
+
+    def emit_final_progress(self):
+        """Deliver the exact final counters, the sampled ones may be up to a tick old."""
+        self.file_progress = None
+        if self.progress is not None:
+            self.progress_updated.emit(*self.progress)
+
 
 # GUI classes
 class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
@@ -333,10 +389,10 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
         # Connect the worker thread signals to main thread handlers
         # UI updates
         self.worker.progress_updated.connect(self.progress_window.update_progress)
-        self.worker.log_updated.connect(self.progress_window.update_logs)
+        self.worker.logs_updated.connect(self.progress_window.append_logs)
         # removal confirmation handling
-        self.worker.remove_confirmation.connect(
-            self.progress_window.handle_removal_confirmation
+        self.worker.removal_review_requested.connect(
+            self.progress_window.handle_removal_review
         )
         # Error handling
         self.worker.error.connect(
@@ -366,11 +422,25 @@ class MainWindow(QtWidgets.QMainWindow, Ui_MainWindow):
 
 
 class ProgressDialog(QtWidgets.QDialog, Ui_ProgressWindow):
+    # Interval at which the worker's counters are sampled (10 Hz)
+    REFRESH_INTERVAL_MS = 100
+    # Number of log lines kept in the view, the full log is written to a file
+    LOG_VIEW_LINES = 5000
+    # Log filter choices: (label, minimum level)
+    LOG_FILTERS = [
+        ("All messages", logging.INFO),
+        ("Warnings and errors", logging.WARNING),
+        ("Errors only", logging.ERROR),
+    ]
+
     def __init__(self, parent, worker):
         super().__init__(parent)
         self.setupUi(self)
         self.worker = worker
         self.processing_done = False  # True once worker signals completion
+        # Last values drawn, so unchanged counters are not redrawn
+        self.shown_progress = None
+        self.shown_file_progress = None
 
         # Disable close button and system menu while processing
         self.setWindowFlags(
@@ -390,17 +460,74 @@ class ProgressDialog(QtWidgets.QDialog, Ui_ProgressWindow):
         self.plainTextEditLogs.setFont(fixed)
         self.plainTextEditLogs.setWordWrapMode(QtGui.QTextOption.WrapMode.NoWrap)
 
+        # Capped log view: the widget drops its oldest blocks, and ring buffers
+        # keep the recent lines to redraw when the filter changes. Warnings and
+        # errors get their own buffer so they are not pushed out by routine lines.
+        self.plainTextEditLogs.setMaximumBlockCount(self.LOG_VIEW_LINES)
+        self.log_lines = deque(maxlen=self.LOG_VIEW_LINES)
+        self.problem_lines = deque(maxlen=self.LOG_VIEW_LINES)
+        self.log_level = logging.INFO
+        self.comboBoxLogFilter = QtWidgets.QComboBox(parent=self.groupBoxLogs)
+        for label, level in self.LOG_FILTERS:
+            self.comboBoxLogFilter.addItem(label, level)
+        self.comboBoxLogFilter.currentIndexChanged.connect(self.set_log_filter)
+        self.logFilterLayout = QtWidgets.QHBoxLayout()
+        self.logFilterLayout.addWidget(self.comboBoxLogFilter)
+        self.logFilterLayout.addStretch()
+        # Only named when the log file could be opened
+        log_path = self.worker.log_batcher.log_path
+        self.labelLogFile = QtWidgets.QLabel(parent=self.groupBoxLogs)
+        if log_path is not None:
+            self.labelLogFile.setText(f"Full log: {log_path.name}")
+            self.labelLogFile.setToolTip(str(log_path))
+            self.logFilterLayout.addWidget(self.labelLogFile)
+        else:
+            self.labelLogFile.hide()
+        self.logLayout.insertLayout(0, self.logFilterLayout)
+
+        # Thin bar for the file being copied to another drive, hidden for renames
+        self.progressBarFile = QtWidgets.QProgressBar(parent=self)
+        self.progressBarFile.setRange(0, 1000)
+        self.progressBarFile.setTextVisible(False)
+        self.progressBarFile.setMaximumHeight(4)
+        self.progressBarFile.setVisible(False)
+        self.verticalLayout.insertWidget(1, self.progressBarFile)
+
         # Alt+Q (Quit) inside progress dialog ONLY after finished
         self.shortcut_quit = QtGui.QShortcut(QtGui.QKeySequence("Alt+Q"), self)
         self.shortcut_quit.setContext(QtCore.Qt.ShortcutContext.ApplicationShortcut)
         self.shortcut_quit.activated.connect(self.control_closing)
         self.shortcut_quit.setEnabled(False)  # Enable after finish
 
+        # Sample the worker's counters at a fixed rate instead of per file
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh_progress)
+        self.refresh_timer.start()
+
         # Track finish state from worker
         self.worker.finished.connect(self.processing_finished)
+        self.worker.error.connect(self.stop_refresh)
+
+    def refresh_progress(self) -> None:
+        """Redraw the progress from the worker's latest counters, if they changed."""
+        self.worker.flush_logs()
+        progress = self.worker.progress
+        if progress is not None and progress != self.shown_progress:
+            self.update_progress(*progress)
+        file_progress = self.worker.file_progress
+        if file_progress != self.shown_file_progress:
+            self.shown_file_progress = file_progress
+            self.update_file_progress(*(file_progress or (0, 0)))
+
+    def stop_refresh(self, *args) -> None:
+        """Stop sampling, the worker delivers its final counters by signal."""
+        self.refresh_timer.stop()
+        self.update_file_progress(0, 0)
 
     def processing_finished(self):
         """Restore window controls once processing is finished."""
+        self.stop_refresh()
         self.processing_done = True
         self.shortcut_quit.setEnabled(True)
         # Re-enable close button and system menu
@@ -438,6 +565,7 @@ class ProgressDialog(QtWidgets.QDialog, Ui_ProgressWindow):
         self, current: int, total: int, failed: int, estimated_time: float
     ) -> None:
         """Update the progress bar and labels"""
+        self.shown_progress = (current, total, failed, estimated_time)
 
         percentage = int((current + failed) / total * 100) if total > 0 else 0
         self.progressBar.setValue(percentage)
@@ -466,24 +594,185 @@ class ProgressDialog(QtWidgets.QDialog, Ui_ProgressWindow):
                 f"⏳ Time remaining: {seconds} second{'s' if seconds > 1 else ''}"
             )
 
+    def update_file_progress(self, done: int, total: int) -> None:
+        """Update the byte progress bar of the file being copied"""
+        if total <= 0 or done >= total:
+            self.progressBarFile.setVisible(False)
+            return
+        self.progressBarFile.setVisible(True)
+        self.progressBarFile.setValue(int(done / total * 1000))
+
     def update_logs(self, log: str) -> None:
-        """Append log messages to the logs text area"""
-        self.plainTextEditLogs.appendPlainText(log)
+        """Append a log message to the logs text area"""
+        self.append_logs([log])
+
+    def append_logs(self, lines: list) -> None:
+        """Append a batch of log messages, showing those that pass the filter"""
+        visible = []
+        for line in lines:
+            level = line_level(line)
+            self.log_lines.append(line)
+            if level >= logging.WARNING:
+                self.problem_lines.append((level, line))
+            if level >= self.log_level:
+                visible.append(line)
+        if visible:
+            self.plainTextEditLogs.appendPlainText("\n".join(visible))
+
+    def set_log_filter(self, index: int) -> None:
+        """Redraw the log view with the minimum level of the selected filter"""
+        self.log_level = self.comboBoxLogFilter.itemData(index)
+        if self.log_level <= logging.INFO:
+            lines = list(self.log_lines)
+        else:
+            lines = [
+                line for level, line in self.problem_lines if level >= self.log_level
+            ]
+        self.plainTextEditLogs.setPlainText("\n".join(lines))
+        self.plainTextEditLogs.moveCursor(QtGui.QTextCursor.MoveOperation.End)
 
-    def handle_removal_confirmation(self, file_path: str):
+    def handle_removal_review(self, file_paths: list):
         """
-        Handles the removal confirmation signal from the worker thread.
-        Displays a confirmation dialog to the user and waits for their response.
+        Handles the removal review signal from the worker thread.
+        Lists every removal candidate once and returns the checked ones to the worker.
         """
-        response = QtWidgets.QMessageBox.question(
-            self,
-            "Remove File",
-            f"Do you want to remove {file_path} ?",
-            QtWidgets.QMessageBox.StandardButton.Yes
-            | QtWidgets.QMessageBox.StandardButton.No,
+        dialog = RemovalReviewDialog(
+            self, file_paths, self.worker.organizer.hidden_pattern_of
+        )
+        approved = []
+        if dialog.exec() == QtWidgets.QDialog.DialogCode.Accepted:
+            approved = dialog.selected_files()
+        self.worker.handle_review_response(approved)
+
+
+class RemovalReviewDialog(QtWidgets.QDialog):
+    """Checkable list of the hidden/system files the cleanup would remove.
+
+    Files are grouped by the hidden file pattern they match, so a whole pattern
+    (e.g. every Thumbs.db) can be kept or removed with one click.
+    """
+
+    def __init__(self, parent, file_paths: list[str], pattern_of):
+        """
+        Args:
+            parent: Parent widget
+            file_paths: The removal candidates
+            pattern_of: Callable returning the pattern group of a file path
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Remove Hidden Files")
+        self.resize(700, 500)
+
+        self.labelSummary = QtWidgets.QLabel(parent=self)
+        self.labelSummary.setWordWrap(True)
+        self.labelSummary.setText(
+            f"{len(file_paths)} hidden/system files are left in the emptied folders. "
+            "Checked files are removed, a folder is only removed when all of its "
+            "files are."
+        )
+
+        # Per-pattern rules, toggling one checks or unchecks all of its files
+        self.listWidgetPatterns = QtWidgets.QListWidget(parent=self)
+        self.listWidgetPatterns.setMaximumHeight(120)
+        self.listWidgetFiles = QtWidgets.QListWidget(parent=self)
+        self.listWidgetFiles.setUniformItemSizes(True)
+
+        self.pattern_items: dict[str, QtWidgets.QListWidgetItem] = {}
+        self.file_items: dict[str, list[QtWidgets.QListWidgetItem]] = {}
+        for file_path in file_paths:
+            pattern = pattern_of(file_path)
+            item = QtWidgets.QListWidgetItem(file_path, self.listWidgetFiles)
+            item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.CheckState.Checked)
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, pattern)
+            self.file_items.setdefault(pattern, []).append(item)
+        for pattern, items in self.file_items.items():
+            item = QtWidgets.QListWidgetItem(
+                f"{pattern} ({len(items)})", self.listWidgetPatterns
+            )
+            item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(QtCore.Qt.CheckState.Checked)
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, pattern)
+            self.pattern_items[pattern] = item
+
+        self.btnSelectAll = QtWidgets.QPushButton("Select all", parent=self)
+        self.btnSelectAll.clicked.connect(lambda: self.set_all(True))
+        self.btnSelectNone = QtWidgets.QPushButton("Select none", parent=self)
+        self.btnSelectNone.clicked.connect(lambda: self.set_all(False))
+        self.buttonBox = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok
+            | QtWidgets.QDialogButtonBox.StandardButton.Cancel,
+            parent=self,
+        )
+        self.buttonBox.button(QtWidgets.QDialogButtonBox.StandardButton.Ok).setText(
+            "Remove selected"
+        )
+        self.buttonBox.accepted.connect(self.accept)
+        self.buttonBox.rejected.connect(self.reject)
+
+        buttonLayout = QtWidgets.QHBoxLayout()
+        buttonLayout.addWidget(self.btnSelectAll)
+        buttonLayout.addWidget(self.btnSelectNone)
+        buttonLayout.addStretch()
+        buttonLayout.addWidget(self.buttonBox)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.labelSummary)
+        layout.addWidget(QtWidgets.QLabel("Remove by pattern:", parent=self))
+        layout.addWidget(self.listWidgetPatterns)
+        layout.addWidget(QtWidgets.QLabel("Files:", parent=self))
+        layout.addWidget(self.listWidgetFiles)
+        layout.addLayout(buttonLayout)
+
+        self.listWidgetPatterns.itemChanged.connect(self.pattern_toggled)
+        self.listWidgetFiles.itemChanged.connect(self.file_toggled)
+
+    def pattern_toggled(self, item: QtWidgets.QListWidgetItem) -> None:
+        """Apply a pattern rule to all files of the pattern"""
+        state = item.checkState()
+        if state == QtCore.Qt.CheckState.PartiallyChecked:
+            return
+        pattern = item.data(QtCore.Qt.ItemDataRole.UserRole)
+        self.listWidgetFiles.blockSignals(True)
+        for file_item in self.file_items[pattern]:
+            file_item.setCheckState(state)
+        self.listWidgetFiles.blockSignals(False)
+
+    def file_toggled(self, item: QtWidgets.QListWidgetItem) -> None:
+        """Show a partially checked pattern once its files differ"""
+        pattern = item.data(QtCore.Qt.ItemDataRole.UserRole)
+        states = {file_item.checkState() for file_item in self.file_items[pattern]}
+        state = (
+            states.pop()
+            if len(states) == 1
+            else QtCore.Qt.CheckState.PartiallyChecked
+        )
+        self.listWidgetPatterns.blockSignals(True)
+        self.pattern_items[pattern].setCheckState(state)
+        self.listWidgetPatterns.blockSignals(False)
+
+    def set_all(self, checked: bool) -> None:
+        """Check or uncheck every file"""
+        state = (
+            QtCore.Qt.CheckState.Checked if checked else QtCore.Qt.CheckState.Unchecked
         )
-        confirmed = response == QtWidgets.QMessageBox.StandardButton.Yes
-        self.worker.handle_confirmation_response(confirmed)
+        self.listWidgetPatterns.blockSignals(True)
+        self.listWidgetFiles.blockSignals(True)
+        for item in self.pattern_items.values():
+            item.setCheckState(state)
+        for items in self.file_items.values():
+            for item in items:
+                item.setCheckState(state)
+        self.listWidgetPatterns.blockSignals(False)
+        self.listWidgetFiles.blockSignals(False)
+
+    def selected_files(self) -> list[str]:
+        """Return the checked file paths"""
+        return [
+            item.text()
+            for items in self.file_items.values()
+            for item in items
+            if item.checkState() == QtCore.Qt.CheckState.Checked
+        ]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+# Lazily imported metadata backends of PhotoOrganizer.
+# Pillow, pillow_heif and pymediainfo take most of the startup time, and many runs
+# never need all of them: the JPEG/TIFF/RAW header reader and the MP4/MOV/MKV reader
+# handle most files without any of them. Each backend is imported the first time a
+# file that needs it is seen, then kept for the rest of the process.
+
+import logging
+import sys
+import threading
+
+# Extensions that need the pillow_heif opener registered with Pillow
+HEIF_EXTENSIONS = {".heic", ".heif"}
+
+# Guards the one-time imports when several extraction threads start together
+_lock = threading.Lock()
+_image_module = None
+_heif_registered = False
+_media_info_class = None
+
+
+def pil_image(extension: str = ""):
+    """Return the PIL.Image module, importing Pillow on first use.
+
+    Args:
+        extension: Lowercase extension of the file about to be opened; HEIC/HEIF
+            files register the pillow_heif opener first
+
+    Returns:
+        module: PIL.Image
+    """
+    global _image_module
+    if _image_module is None:
+        with _lock:
+            if _image_module is None:
+                from PIL import Image
+
+                _image_module = Image
+    if extension in HEIF_EXTENSIONS and not _heif_registered:
+        _register_heif()
+    return _image_module
+
+
+def _register_heif() -> None:
+    global _heif_registered
+    with _lock:
+        if _heif_registered:
+            return
+        try:
+            from pillow_heif import register_heif_opener
+
+            register_heif_opener(thumbnails=False)
+        except ImportError as e:
+            logging.warning("HEIC/HEIF support unavailable: %s", e)
+        # Only try once, a missing pillow_heif leaves Pillow to fail per file
+        _heif_registered = True
+
+
+def media_info():
+    """Return the pymediainfo MediaInfo class, importing it on first use."""
+    global _media_info_class
+    if _media_info_class is None:
+        with _lock:
+            if _media_info_class is None:
+                from pymediainfo import MediaInfo
+
+                _media_info_class = MediaInfo
+    return _media_info_class
+
+
+def exif_tag_names() -> dict:
+    """Return Pillow's EXIF tag id -> name table (used for debug logging only)."""
+    from PIL.ExifTags import TAGS
+
+    return TAGS
+
+
+def loaded_backends() -> list[str]:
+    """Return the names of the heavy backends imported so far in this process."""
+    modules = ("PIL", "pillow_heif", "pymediainfo", "numpy")
+    return [name for name in modules if name in sys.modules]
@@ -0,0 +1,112 @@
+# Batched delivery of log_callback lines.
+# Lines are collected and handed to a flush callback in chunks (by count or age),
+# so a GUI receives one update per batch instead of one per line. Every line is
+# also streamed to a log file on disk, which keeps the complete log of a run.
+
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from time import monotonic
+from typing import Callable, Optional, Union
+
+# Flush when this many lines are waiting...
+DEFAULT_BATCH_SIZE = 500
+# ...or when the oldest waiting line is this old (seconds)
+DEFAULT_MAX_DELAY = 0.1
+
+# Markers of the organizer's log lines, most severe first
+_ERROR_MARKERS = ("❌", "Failed")
+_WARNING_MARKERS = ("already exists", "is a duplicate of", "Skipped")
+
+
+def line_level(line: str) -> int:
+    """Classify a log_callback line as logging.ERROR, WARNING or INFO."""
+    if any(marker in line for marker in _ERROR_MARKERS):
+        return logging.ERROR
+    if any(marker in line for marker in _WARNING_MARKERS):
+        return logging.WARNING
+    return logging.INFO
+
+
+def default_log_path(folder: Union[str, Path]) -> Path:
+    """Return a timestamped log file path inside a folder."""
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return Path(folder) / f"PhotoOrganizer_{timestamp}.log"
+
+
+class LogBatcher:
+    """Collect log lines, write them to a file and flush them in batches.
+
+    Use write() as the log_callback of organize_photos(). Batches are flushed from
+    the thread calling write(); call flush() before waiting on the user and close()
+    at the end of the run.
+    """
+
+    def __init__(
+        self,
+        flush_callback: Callable[[list[str]], None],
+        log_path: Optional[Union[str, Path]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_delay: float = DEFAULT_MAX_DELAY,
+    ):
+        """
+        Args:
+            flush_callback: Receives each batch as a list of lines
+            log_path: Optional file the complete log is appended to
+            batch_size: Maximum number of lines per batch
+            max_delay: Maximum age in seconds of a waiting line
+        """
+        self.flush_callback = flush_callback
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.log_path = Path(log_path) if log_path else None
+        self._lines: list[str] = []
+        self._first_line_time = 0.0
+        self._lock = threading.Lock()
+        self._file = None
+        if self.log_path is not None:
+            try:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.log_path, "a", encoding="utf-8")
+            except OSError as e:
+                logging.warning("Failed to open log file %s: %s", self.log_path, e)
+                self.log_path = None
+
+    def write(self, line: str) -> None:
+        """Queue one line, flushing the batch when it is full or old enough."""
+        with self._lock:
+            if self._file is not None:
+                self._file.write(line + "\n")
+            if not self._lines:
+                self._first_line_time = monotonic()
+            self._lines.append(line)
+            due = (
+                len(self._lines) >= self.batch_size
+                or monotonic() - self._first_line_time >= self.max_delay
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand all waiting lines to the flush callback."""
+        with self._lock:
+            lines, self._lines = self._lines, []
+            if self._file is not None:
+                self._file.flush()
+        if lines:
+            self.flush_callback(lines)
+
+    def close(self) -> None:
+        """Flush the waiting lines and close the log file."""
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
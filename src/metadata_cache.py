@@ -0,0 +1,170 @@
+# Persistent cache of extracted file dates, keyed by file identity.
+# Lets repeated runs over the same source folder skip metadata extraction for files
+# that were already looked at, including files for which no date could be found.
+
+import os
+import sqlite3
+import logging
+from datetime import date
+from pathlib import Path
+from time import time
+from typing import Optional, Union
+
+# Bump when the extraction logic changes, so cached results are discarded
+CACHE_VERSION = 2
+
+# Returned by MetadataCache.get() when a file is not in the cache
+MISS = object()
+
+
+class MetadataCache:
+    """
+    SQLite-backed cache of get_file_date() results.
+    Entries are keyed by (device, inode, size, mtime_ns), so a modified or replaced
+    file never hits a stale entry. Negative "no date" results are stored as NULL.
+    """
+
+    def __init__(
+        self,
+        cache_path: Union[str, Path],
+        max_age_days: int = 90,
+        commit_interval: int = 500,
+    ):
+        """Open (or create) the cache database.
+
+        Args:
+            cache_path: Path of the SQLite database file
+            max_age_days: Entries not seen for this many days are evicted on close
+            commit_interval: Number of pending writes before they are committed
+        """
+        self.cache_path = Path(cache_path)
+        self.max_age_days = max_age_days
+        self.commit_interval = commit_interval
+        self.hits: int = 0
+        self.misses: int = 0
+        self._pending_writes: list[tuple] = []
+        self._pending_touches: list[tuple] = []
+        self._now = int(time())
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.cache_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != CACHE_VERSION:
+            logging.info("Metadata cache version changed, discarding old entries")
+            self._conn.execute("DROP TABLE IF EXISTS file_dates")
+            self._conn.execute(f"PRAGMA user_version={CACHE_VERSION}")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS file_dates (
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                file_date TEXT,
+                last_seen INTEGER NOT NULL,
+                PRIMARY KEY (dev, ino, size, mtime_ns, path)
+            )"""
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(
+        dev: int, ino: int, size: int, mtime_ns: int, path: Union[str, Path]
+    ) -> tuple:
+        """Build the cache key for a file from its stat data.
+
+        The path is only part of the key when the filesystem reports no inode
+        number (e.g. DirEntry.stat() on Windows), to keep keys unique.
+        """
+        return (dev, ino, size, mtime_ns, "" if ino else str(path))
+
+    def key_for(self, file: Union[str, Path]) -> Optional[tuple]:
+        """Stat a file and build its cache key, or None if it cannot be stat'ed."""
+        try:
+            st = os.stat(file)
+        except OSError:
+            return None
+        return self.make_key(st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, file)
+
+    def get(self, key: tuple):
+        """Look up a cached date.
+
+        Returns:
+            The cached date, None for a cached "no date" result, or MISS
+        """
+        row = self._conn.execute(
+            "SELECT file_date FROM file_dates "
+            "WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND path=?",
+            key,
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return MISS
+        self.hits += 1
+        self._pending_touches.append(key)
+        self._maybe_commit()
+        return date.fromisoformat(row[0]) if row[0] else None
+
+    def put(self, key: tuple, file_date: Optional[date]) -> None:
+        """Store an extraction result (None for "no date")."""
+        self._pending_writes.append(
+            (*key, file_date.isoformat() if file_date else None, self._now)
+        )
+        self._maybe_commit()
+
+    def _maybe_commit(self) -> None:
+        if len(self._pending_writes) + len(self._pending_touches) >= self.commit_interval:
+            self.commit()
+
+    def commit(self) -> None:
+        """Write pending results and last-seen updates in one transaction."""
+        with self._conn:
+            if self._pending_writes:
+                # A file with the same identity but different size/mtime is stale
+                self._conn.executemany(
+                    "DELETE FROM file_dates WHERE dev=? AND ino=? AND path=?",
+                    [(w[0], w[1], w[4]) for w in self._pending_writes],
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO file_dates VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    self._pending_writes,
+                )
+            if self._pending_touches:
+                self._conn.executemany(
+                    "UPDATE file_dates SET last_seen=? "
+                    "WHERE dev=? AND ino=? AND size=? AND mtime_ns=? AND path=?",
+                    [(self._now, *key) for key in self._pending_touches],
+                )
+        self._pending_writes.clear()
+        self._pending_touches.clear()
+
+    def evict_stale(self) -> int:
+        """Delete entries that were not seen within max_age_days.
+
+        Returns:
+            int: Number of evicted entries
+        """
+        cutoff = self._now - self.max_age_days * 86400
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM file_dates WHERE last_seen < ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Commit pending writes, evict stale entries and close the database."""
+        try:
+            self.commit()
+            evicted = self.evict_stale()
+            if evicted:
+                logging.info("Evicted %d stale metadata cache entries", evicted)
+        finally:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,190 @@
+# File move engine used by PhotoOrganizer.
+# Same-device moves are plain renames. Cross-device moves copy the data in large chunks
+# with os.copy_file_range / os.sendfile where available, report bytes done through a
+# callback, and unlink the source only after the copy has completed. Copies are
+# written under a temporary name and linked into place, never over an existing file.
+
+import os
+import sys
+import errno
+import shutil
+import logging
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+# Chunk size for cross-device copies, large enough to keep syscall overhead low
+# while still giving regular progress updates on big videos
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Errors that mean a zero-copy method is not supported for this pair of files
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.EBADF,
+    errno.ENOTSOCK,
+}
+
+# Only Linux can sendfile to a regular file, macOS and BSD need a socket
+_SENDFILE_TO_FILES = hasattr(os, "sendfile") and sys.platform.startswith("linux")
+
+
+def is_cross_device(source: Union[str, Path], destination: Union[str, Path]) -> bool:
+    """Check whether two existing paths live on different filesystems."""
+    try:
+        return os.stat(source).st_dev != os.stat(destination).st_dev
+    except OSError:
+        # Unknown, let the first rename decide
+        return False
+
+
+class MoveEngine:
+    """
+    Moves files from the source tree to the destination tree.
+    The cross-device check and the choice of copy method are made once per run.
+    """
+
+    def __init__(
+        self,
+        source_root: Union[str, Path],
+        destination_root: Union[str, Path],
+        byte_progress_callback: Optional[Callable[[int, int], None]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Initialize the engine for one run.
+
+        Args:
+            source_root: Root of the source tree
+            destination_root: Root of the destination tree
+            byte_progress_callback: Optional callback(bytes_done, bytes_total) called
+                while a file is copied across devices
+            chunk_size: Number of bytes copied per system call
+        """
+        self.cross_device = is_cross_device(source_root, destination_root)
+        self.byte_progress_callback = byte_progress_callback
+        self.chunk_size = chunk_size
+        # Best available copy method, downgraded on the first unsupported error
+        if hasattr(os, "copy_file_range"):
+            self.copy_method = "copy_file_range"
+        elif _SENDFILE_TO_FILES:
+            self.copy_method = "sendfile"
+        else:
+            self.copy_method = "buffered"
+        logging.debug(
+            "Move engine: cross_device=%s, copy_method=%s",
+            self.cross_device,
+            self.copy_method,
+        )
+
+    def move(
+        self, src: Union[str, Path], dst: Union[str, Path], size: Optional[int] = None
+    ) -> None:
+        """Move a file, copying and unlinking it when it crosses devices.
+
+        Args:
+            src: The file to move
+            dst: The new file path, which must not exist yet
+            size: Optional known size of the file, avoids an extra stat call
+        """
+        if not self.cross_device:
+            try:
+                os.rename(src, dst)
+                return
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Part of the tree is on another mount, copy this file instead
+
+        if size is None:
+            size = os.stat(src).st_size
+        # Copy under a temporary name, so a crash never leaves a partial file
+        # under a real library name and an existing file is never overwritten
+        tmp = self.partial_path(dst)
+        try:
+            self._copy(src, tmp, size)
+            shutil.copystat(src, tmp)
+            self._commit(tmp, dst)
+        except BaseException:
+            # Only the temporary copy is ours to remove
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        os.remove(src)
+
+    @staticmethod
+    def partial_path(dst: Union[str, Path]) -> Path:
+        """Return the temporary name a cross-device copy to dst is written to."""
+        dst = Path(dst)
+        return dst.with_name(f".{dst.name}.partial")
+
+    @staticmethod
+    def _commit(tmp: Path, dst: Union[str, Path]) -> None:
+        """Give the finished copy its final name, failing if dst already exists."""
+        try:
+            os.link(tmp, dst)
+        except FileExistsError:
+            raise
+        except OSError:
+            # No hard links on this filesystem (FAT, some network shares)
+            if os.path.lexists(dst):
+                raise FileExistsError(errno.EEXIST, "File exists", str(dst))
+            os.rename(tmp, dst)
+            return
+        try:
+            os.remove(tmp)
+        except OSError as e:
+            logging.warning("Failed to remove temporary copy %s: %s", tmp, e)
+
+    def _copy(self, src: Union[str, Path], dst: Union[str, Path], size: int) -> None:
+        """Copy the file contents in chunks to a new file, reporting bytes done."""
+        try:
+            fdst = open(dst, "xb")
+        except FileExistsError:
+            # Left behind by a run that was killed during the copy
+            logging.debug("Removing stale partial copy %s", dst)
+            os.remove(dst)
+            fdst = open(dst, "xb")
+        with open(src, "rb") as fsrc, fdst:
+            in_fd = fsrc.fileno()
+            out_fd = fdst.fileno()
+            copied = 0
+            while True:
+                if self.copy_method == "buffered":
+                    chunk = fsrc.read(self.chunk_size)
+                    fdst.write(chunk)
+                    sent = len(chunk)
+                else:
+                    try:
+                        if self.copy_method == "copy_file_range":
+                            sent = os.copy_file_range(
+                                in_fd, out_fd, self.chunk_size, copied, copied
+                            )
+                        else:
+                            sent = os.sendfile(out_fd, in_fd, copied, self.chunk_size)
+                    except OSError as e:
+                        if e.errno not in _UNSUPPORTED_ERRNOS or copied > 0:
+                            raise
+                        self._downgrade_copy_method()
+                        continue
+
+                if sent == 0:
+                    break
+                copied += sent
+                if self.byte_progress_callback:
+                    self.byte_progress_callback(copied, size)
+
+            if self.copy_method == "buffered":
+                fdst.flush()
+            # The source is removed after this, the copy must be on disk first
+            os.fsync(out_fd)
+
+    def _downgrade_copy_method(self) -> None:
+        """Fall back to the next copy method for the rest of the run."""
+        if self.copy_method == "copy_file_range" and _SENDFILE_TO_FILES:
+            self.copy_method = "sendfile"
+        else:
+            self.copy_method = "buffered"
+        logging.debug("Move engine: falling back to %s", self.copy_method)
@@ -0,0 +1,233 @@
+# Append-only journal of the moves made by PhotoOrganizer.
+# Every move is recorded as "planned" before and "done" after it happens, so a run
+# that was killed halfway can be resumed without extracting dates again and any
+# run can be undone by replaying its journal in reverse. Records are handed to the
+# OS as they are written, which survives a killed process; fsync is done in
+# batches, so at most the last batch is lost on a power failure.
+
+import json
+import os
+import logging
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from time import monotonic
+from typing import Optional, Union
+
+JOURNAL_VERSION = 1
+
+# fsync after this many records...
+DEFAULT_SYNC_INTERVAL = 1000
+# ...or when the last fsync is this old (seconds)
+DEFAULT_SYNC_DELAY = 1.0
+
+# Record types
+PLANNED = "planned"  # A move is about to happen
+DONE = "done"  # The move completed
+SKIPPED = "skipped"  # The file stays in the source (no date, name taken, ...)
+UNDONE = "undone"  # The move was reversed by undo
+
+
+class JournalState:
+    """Replayed content of a journal."""
+
+    def __init__(self):
+        # Source path -> (destination, size, mtime_ns) of moves not known to be done
+        self.pending: dict[str, tuple[str, int, int]] = {}
+        # (source, destination, size) of completed moves, in journal order
+        self.done: list[tuple[str, str, int]] = []
+        # Source path -> (size, mtime_ns, reason) of files left in the source
+        self.skipped: dict[str, tuple[int, int, str]] = {}
+        self.source: Optional[str] = None
+        self.destination: Optional[str] = None
+
+
+class MoveJournal:
+    """Write journal records to an append-only JSON Lines file.
+
+    Paths are stored as absolute paths. Every run appends to the same file, so
+    load_journal() sees the history of all runs.
+    """
+
+    def __init__(
+        self,
+        journal_path: Union[str, Path],
+        source_folder: Union[str, Path],
+        destination_folder: Union[str, Path],
+        sync_interval: int = DEFAULT_SYNC_INTERVAL,
+        sync_delay: float = DEFAULT_SYNC_DELAY,
+    ):
+        """Open the journal for appending and record the start of a run.
+
+        Args:
+            journal_path: Path of the journal file, created if missing
+            source_folder: Source directory of the run
+            destination_folder: Destination directory of the run
+            sync_interval: Maximum number of records between two fsync calls
+            sync_delay: Maximum time in seconds between two fsync calls
+        """
+        self.journal_path = Path(journal_path)
+        self.sync_interval = sync_interval
+        self.sync_delay = sync_delay
+        self._unsynced = 0
+        self._last_sync = monotonic()
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+        if self._ends_with_torn_line():
+            # Close the line a crash left behind, so it does not swallow the next one
+            self._file.write("\n")
+        self._write(
+            {
+                "type": "run",
+                "version": JOURNAL_VERSION,
+                "started_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+                "source": os.path.abspath(source_folder),
+                "destination": os.path.abspath(destination_folder),
+            }
+        )
+        self.sync()
+
+    def _ends_with_torn_line(self) -> bool:
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Hand the line to the OS right away, only the disk sync is batched
+        self._file.flush()
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_interval
+            or monotonic() - self._last_sync >= self.sync_delay
+        ):
+            self.sync()
+
+    def planned(
+        self,
+        source: Union[str, Path],
+        destination: Union[str, Path],
+        size: int,
+        mtime_ns: int,
+    ) -> None:
+        self._write(
+            {
+                "type": PLANNED,
+                "src": os.path.abspath(source),
+                "dest": os.path.abspath(destination),
+                "size": size,
+                "mtime_ns": mtime_ns,
+            }
+        )
+
+    def done(
+        self, source: Union[str, Path], destination: Union[str, Path], size: int
+    ) -> None:
+        self._write(
+            {
+                "type": DONE,
+                "src": os.path.abspath(source),
+                "dest": os.path.abspath(destination),
+                "size": size,
+            }
+        )
+
+    def skipped(
+        self, source: Union[str, Path], size: int, mtime_ns: int, reason: str
+    ) -> None:
+        self._write(
+            {
+                "type": SKIPPED,
+                "src": os.path.abspath(source),
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "reason": reason,
+            }
+        )
+
+    def undone(self, source: Union[str, Path], destination: Union[str, Path]) -> None:
+        self._write(
+            {
+                "type": UNDONE,
+                "src": os.path.abspath(source),
+                "dest": os.path.abspath(destination),
+            }
+        )
+
+    def sync(self) -> None:
+        """Flush the written records to disk."""
+        self._file.flush()
+        try:
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            logging.warning("Failed to sync journal %s: %s", self.journal_path, e)
+        self._unsynced = 0
+        self._last_sync = monotonic()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_journal(journal_path: Union[str, Path]) -> JournalState:
+    """Replay a journal file. A torn last line, left by a crash, is ignored."""
+    state = JournalState()
+    undone: Counter = Counter()
+    with open(journal_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning("Ignoring incomplete journal line in %s", journal_path)
+                continue
+            kind = record.get("type")
+            if kind == "run":
+                if record.get("version") != JOURNAL_VERSION:
+                    raise ValueError(
+                        f"{journal_path} is not a journal of version {JOURNAL_VERSION}"
+                    )
+                state.source = state.source or record["source"]
+                state.destination = state.destination or record["destination"]
+            elif kind == PLANNED:
+                state.pending[record["src"]] = (
+                    record["dest"],
+                    record["size"],
+                    record["mtime_ns"],
+                )
+            elif kind == DONE:
+                state.pending.pop(record["src"], None)
+                state.skipped.pop(record["src"], None)
+                state.done.append((record["src"], record["dest"], record["size"]))
+            elif kind == SKIPPED:
+                state.pending.pop(record["src"], None)
+                state.skipped[record["src"]] = (
+                    record["size"],
+                    record["mtime_ns"],
+                    record["reason"],
+                )
+            elif kind == UNDONE:
+                undone[(record["src"], record["dest"])] += 1
+
+    # An undo reverses the latest matching moves
+    if undone:
+        kept = []
+        for move in reversed(state.done):
+            if undone[move[:2]] > 0:
+                undone[move[:2]] -= 1
+            else:
+                kept.append(move)
+        state.done = kept[::-1]
+    return state
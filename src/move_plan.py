@@ -0,0 +1,132 @@
+# Move plans for dry runs of PhotoOrganizer.
+# A plan is a JSON Lines file: one header line with the run options, then one line
+# per file with its source, resolved date, destination and collision status. Plans
+# are written while the files are processed and read back one line at a time, so
+# a plan of any size is never held in memory.
+
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional, Union
+
+PLAN_VERSION = 1
+
+# Collision status of a planned file
+MOVE = "move"  # The destination is free, the file will be moved
+EXISTS = "exists"  # A file of the same name is already in the destination
+CONFLICT = "conflict"  # An earlier file of the plan goes to the same destination
+DUPLICATE = "duplicate"  # Byte-identical to another source file, left in place
+NO_DATE = "no_date"  # No date found, left in place
+ERROR = "error"  # Date extraction failed, left in place
+
+
+class PlanEntry(NamedTuple):
+    """One file of a move plan. Paths are relative to the plan's source and
+    destination folders, so a plan made on a snapshot applies to the live tree."""
+
+    source: str
+    size: int
+    mtime_ns: int
+    status: str
+    date: Optional[date] = None
+    destination: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PlanWriter:
+    """Stream plan entries to a JSON Lines file."""
+
+    def __init__(
+        self,
+        plan_path: Union[str, Path],
+        source_folder: Union[str, Path],
+        destination_folder: Union[str, Path],
+        sort_by_day: bool,
+    ):
+        """Create the plan file and write its header.
+
+        Args:
+            plan_path: Path of the plan file, replaced if it exists
+            source_folder: Source directory the entries are relative to
+            destination_folder: Destination directory the entries are relative to
+            sort_by_day: Whether the plan sorts into day-level folders
+        """
+        self.plan_path = Path(plan_path)
+        self.source_folder = os.path.abspath(source_folder)
+        self.destination_folder = os.path.abspath(destination_folder)
+        self.counts: dict[str, int] = {}
+        self.plan_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.plan_path, "w", encoding="utf-8")
+        header = {
+            "version": PLAN_VERSION,
+            "created_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "source": self.source_folder,
+            "destination": self.destination_folder,
+            "sort_by_day": sort_by_day,
+        }
+        self._file.write(json.dumps(header) + "\n")
+
+    def relative_source(self, path: Union[str, Path]) -> str:
+        return os.path.relpath(path, self.source_folder)
+
+    def relative_destination(self, path: Union[str, Path]) -> str:
+        return os.path.relpath(path, self.destination_folder)
+
+    def write(self, entry: PlanEntry) -> None:
+        """Append one entry, leaving out empty fields."""
+        line = {"src": entry.source, "size": entry.size, "mtime_ns": entry.mtime_ns}
+        if entry.date is not None:
+            line["date"] = entry.date.isoformat()
+        if entry.destination is not None:
+            line["dest"] = entry.destination
+        line["status"] = entry.status
+        if entry.error is not None:
+            line["error"] = entry.error
+        self._file.write(json.dumps(line, ensure_ascii=False) + "\n")
+        self.counts[entry.status] = self.counts.get(entry.status, 0) + 1
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_plan_header(plan_path: Union[str, Path]) -> dict:
+    """Read the header of a plan file.
+
+    Raises:
+        ValueError: If the file is not a plan of a supported version
+    """
+    with open(plan_path, "r", encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{plan_path} is not a move plan: {e}") from e
+    if not isinstance(header, dict) or header.get("version") != PLAN_VERSION:
+        raise ValueError(f"{plan_path} is not a move plan of version {PLAN_VERSION}")
+    return header
+
+
+def iter_plan_entries(plan_path: Union[str, Path]) -> Iterator[PlanEntry]:
+    """Read the entries of a plan file one line at a time."""
+    with open(plan_path, "r", encoding="utf-8") as f:
+        f.readline()  # Header
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            yield PlanEntry(
+                source=item["src"],
+                size=item["size"],
+                mtime_ns=item["mtime_ns"],
+                status=item["status"],
+                date=date.fromisoformat(item["date"]) if "date" in item else None,
+                destination=item.get("dest"),
+                error=item.get("error"),
+            )
@@ -0,0 +1,156 @@
+# Near-duplicate photo detection with perceptual hashes.
+# Each image gets a 64-bit difference hash (dHash). Similar images have hashes with a
+# small Hamming distance. Candidate pairs are found with multi-index hashing: when
+# the hash is split into max_distance + 1 bands, two hashes within max_distance bits
+# must match exactly in at least one band, so only files sharing a band are compared.
+
+from functools import lru_cache
+from typing import Optional, Sequence
+
+# Default maximum Hamming distance between two hashes of near-duplicate images
+DEFAULT_MAX_DISTANCE = 4
+
+
+def dhash(image) -> int:
+    """Compute the 64-bit difference hash of an opened PIL image.
+
+    Compares each pixel of a 9x8 grayscale thumbnail with its right neighbour.
+    """
+    # Let the JPEG decoder downscale while decoding, much faster for big photos
+    image.draft("L", (64, 64))
+    pixels = image.convert("L").resize((9, 8)).tobytes()
+    value = 0
+    for row in range(8):
+        offset = row * 9
+        for col in range(8):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def _bands(max_distance: int) -> list[tuple[int, int]]:
+    """Split 64 bits into max_distance + 1 bands as (shift, mask) pairs."""
+    count = min(max_distance + 1, 64)
+    widths = [64 // count + (1 if i < 64 % count else 0) for i in range(count)]
+    bands = []
+    shift = 0
+    for width in widths:
+        bands.append((shift, (1 << width) - 1))
+        shift += width
+    return bands
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Import NumPy on first use, it is slow to load and only needed here."""
+    try:
+        import numpy
+
+        return numpy
+    except ImportError:  # NumPy is optional, a BK-tree is used instead
+        return None
+
+
+def _popcount(values):
+    """Count the set bits of each uint64 in a NumPy array."""
+    np = _numpy()
+    if hasattr(np, "bitwise_count"):  # NumPy 2.0+
+        return np.bitwise_count(values).astype(np.int64)
+    as_bytes = values.view(np.uint8).reshape(-1, 8)
+    return np.unpackbits(as_bytes, axis=1).sum(axis=1, dtype=np.int64)
+
+
+def _similar_pairs_numpy(hashes: Sequence[int], max_distance: int) -> list[tuple]:
+    """Vectorized candidate search over packed uint64 hashes."""
+    np = _numpy()
+    values = np.array(hashes, dtype=np.uint64)
+    n = len(values)
+    found_a, found_b, found_d = [], [], []
+    for shift, mask in _bands(max_distance):
+        band = (values >> np.uint64(shift)) & np.uint64(mask)
+        order = np.argsort(band, kind="stable")
+        sorted_band = band[order]
+        # Compare every file with the k-th next one in band order. Once no pair at
+        # offset k shares a band value, no run of equal values is longer than k.
+        for k in range(1, n):
+            same = sorted_band[k:] == sorted_band[:-k]
+            if not same.any():
+                break
+            a = order[:-k][same]
+            b = order[k:][same]
+            distance = _popcount(values[a] ^ values[b])
+            keep = distance <= max_distance
+            found_a.append(np.minimum(a[keep], b[keep]))
+            found_b.append(np.maximum(a[keep], b[keep]))
+            found_d.append(distance[keep])
+
+    if not found_a:
+        return []
+    a = np.concatenate(found_a).astype(np.int64)
+    b = np.concatenate(found_b).astype(np.int64)
+    d = np.concatenate(found_d)
+    # A pair can match in several bands, keep it once
+    _, first = np.unique(a * n + b, return_index=True)
+    return sorted(zip(a[first].tolist(), b[first].tolist(), d[first].tolist()))
+
+
+class _BKTree:
+    """BK-tree over Hamming distance, used when NumPy is not installed."""
+
+    def __init__(self):
+        self.root: Optional[list] = None  # [hash, index, {distance: child}]
+
+    def add(self, value: int, index: int) -> None:
+        if self.root is None:
+            self.root = [value, index, {}]
+            return
+        node = self.root
+        while True:
+            distance = bin(value ^ node[0]).count("1")
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, index, {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> list[tuple[int, int]]:
+        """Return (index, distance) of all stored hashes within max_distance."""
+        matches = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = bin(value ^ node[0]).count("1")
+            if distance <= max_distance:
+                matches.append((node[1], distance))
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return matches
+
+
+def _similar_pairs_bktree(hashes: Sequence[int], max_distance: int) -> list[tuple]:
+    tree = _BKTree()
+    pairs = []
+    for index, value in enumerate(hashes):
+        for other, distance in tree.search(value, max_distance):
+            pairs.append((other, index, distance))
+        tree.add(value, index)
+    return sorted(pairs)
+
+
+def find_similar_pairs(
+    hashes: Sequence[int], max_distance: int = DEFAULT_MAX_DISTANCE
+) -> list[tuple[int, int, int]]:
+    """Find all pairs of hashes within max_distance bits of each other.
+
+    Args:
+        hashes: 64-bit perceptual hashes
+        max_distance: Maximum Hamming distance of a near-duplicate pair
+
+    Returns:
+        list: (index_a, index_b, distance) tuples with index_a < index_b
+    """
+    if len(hashes) < 2:
+        return []
+    if _numpy() is not None:
+        return _similar_pairs_numpy(hashes, max_distance)
+    return _similar_pairs_bktree(hashes, max_distance)
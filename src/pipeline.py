@@ -0,0 +1,399 @@
+# Staged asyncio pipeline engine for PhotoOrganizer.
+# Files flow through four stages connected by bounded queues, so a full queue makes
+# the stage before it wait (backpressure) and memory stays bounded:
+#   scan    -> walks the source in a background thread
+#   read    -> many concurrent header reads, suited to network shares
+#   decode  -> a few CPU workers for the files the headers do not settle (Pillow,
+#              MediaInfo)
+#   place   -> one destination folder at a time per file: mkdir, collision check
+#              and move run serialized per folder, several folders in parallel
+# Counters, callbacks, the journal, the catalog and the cache are only touched on
+# the event loop thread; worker threads only do filesystem and decoding work.
+
+import asyncio
+import concurrent.futures
+import os
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Optional, Union
+
+from metadata_cache import MISS, MetadataCache
+
+# Marks the end of a stage's input
+_DONE = object()
+
+# Seconds between two checks for a stopped run while the scan thread waits
+_STOP_POLL = 0.1
+
+
+class StagedPipeline:
+    """Extract dates and move files through the scan, read, decode and place stages.
+
+    Results are not handled in scan order: when two source files of the same name
+    go to the same folder, the first one to reach the place stage is moved.
+    """
+
+    def __init__(
+        self,
+        organizer,
+        destination_folder: Union[str, Path],
+        sort_by_day: bool,
+        limits,
+        executor: str = "thread",
+        cache: Optional[MetadataCache] = None,
+        journal_state=None,
+        progress_callback=None,
+        log_callback=None,
+    ):
+        """
+        Args:
+            organizer: The PhotoOrganizer whose counters, journal and catalog are used
+            destination_folder: Destination directory path
+            sort_by_day: Whether to sort into day-level folders
+            limits: PipelineLimits with the concurrency limits of the stages
+            executor: "thread" or "process" workers for the decode stage
+            cache: Optional metadata cache consulted before extraction
+            journal_state: Optional replayed journal of a resumed run
+            progress_callback: Optional callback function to update GUI progress
+            log_callback: Optional callback for logging messages
+        """
+        if min(limits) < 1:
+            raise ValueError(f"Pipeline limits must be at least 1: {limits}")
+        self.organizer = organizer
+        self.destination_folder = destination_folder
+        self.sort_by_day = sort_by_day
+        self.limits = limits
+        self.executor = executor
+        self.cache = cache
+        self.journal_state = journal_state
+        self.progress_callback = progress_callback
+        self.log_callback = log_callback
+        # Interval between completed files, as measured by the sequential engine
+        self._last_done = perf_counter()
+
+    def run(self, files) -> None:
+        """Process every record of an iterable of FileRecord, blocking until done."""
+        asyncio.run(self._run(files))
+
+    async def _run(self, files) -> None:
+        limits = self.limits
+        scanned: asyncio.Queue = asyncio.Queue(limits.queue_size)
+        # Files the headers did not settle
+        self._to_decode: asyncio.Queue = asyncio.Queue(limits.queue_size)
+        # Files with their extraction result, from the read and decode stages
+        self._to_place: asyncio.Queue = asyncio.Queue(limits.queue_size)
+        self._folder_locks: dict[Path, asyncio.Lock] = {}
+        self._ready_folders: set[Path] = set()
+        self._writers = asyncio.Semaphore(limits.writers)
+        # Bounds the files waiting for their folder to be free
+        self._placing = asyncio.Semaphore(limits.queue_size)
+        # First unexpected error of a move task, e.g. raised by a callback
+        self._move_error: Optional[BaseException] = None
+        self._moves: set[asyncio.Task] = set()
+        # Set when the run fails, stops the scan thread
+        self._stop = threading.Event()
+
+        self._reader_pool = ThreadPoolExecutor(limits.readers, "pipeline-read")
+        self._writer_pool = ThreadPoolExecutor(limits.writers, "pipeline-write")
+        self._decode_pool, self._decode = self.organizer._extraction_pool(
+            limits.decoders, self.executor
+        )
+        # The read stage also feeds the place stage, the decode stage closes the
+        # place stage's queue as it only finishes after the last read
+        stages = [
+            asyncio.ensure_future(stage)
+            for stage in (
+                self._scan_stage(files, scanned),
+                self._stage(
+                    scanned,
+                    limits.readers,
+                    self._read,
+                    self._to_decode,
+                    limits.decoders,
+                ),
+                self._stage(
+                    self._to_decode, limits.decoders, self._decode_file, self._to_place
+                ),
+                self._stage(self._to_place, 1, self._place),
+            )
+        ]
+        try:
+            await asyncio.gather(*stages)
+            # Wait for the moves still running
+            for _ in range(limits.queue_size):
+                await self._placing.acquire()
+            if self._move_error is not None:
+                raise self._move_error
+        except BaseException:
+            # Stop the scan thread, the other stages and the moves before the
+            # pools shut down, so nothing waits on a queue no one reads anymore
+            self._stop.set()
+            pending = stages + list(self._moves)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+        finally:
+            for pool in (self._reader_pool, self._decode_pool, self._writer_pool):
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    async def _scan_stage(self, files, outbox: asyncio.Queue) -> None:
+        """Feed the records to the read stage from a background thread."""
+        loop = asyncio.get_running_loop()
+
+        def scan():
+            try:
+                for record in files:
+                    if not self._put(outbox, record, loop):
+                        return  # The pipeline stopped early
+            finally:
+                close = getattr(files, "close", None)
+                if close is not None:
+                    close()
+
+        await asyncio.to_thread(scan)
+        for _ in range(self.limits.readers):
+            await outbox.put(_DONE)
+
+    def _put(self, outbox: asyncio.Queue, record, loop) -> bool:
+        """Queue a record from the scan thread, waiting while the read stage is
+        behind.
+
+        Returns:
+            bool: False if the run stopped before the record was queued
+        """
+        put = asyncio.run_coroutine_threadsafe(outbox.put(record), loop)
+        while not self._stop.is_set():
+            try:
+                put.result(timeout=_STOP_POLL)
+                return True
+            except concurrent.futures.TimeoutError:
+                continue
+            except CancelledError:
+                return False
+        put.cancel()
+        return False
+
+    async def _stage(
+        self,
+        inbox: asyncio.Queue,
+        workers: int,
+        handle,
+        outbox: Optional[asyncio.Queue] = None,
+        next_workers: int = 1,
+    ) -> None:
+        """Run workers coroutines on the items of inbox, then close outbox."""
+
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                await handle(item)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        if outbox is not None:
+            for _ in range(next_workers):
+                await outbox.put(_DONE)
+
+    async def _read(self, record) -> None:
+        """Read stage: answer from the journal, the cache or the file headers."""
+        org = self.organizer
+        if self.journal_state is not None and await self._resumed(record):
+            return
+
+        ext = record.path.suffix.lower()
+        key = None
+        hashing = org.compute_perceptual_hash and ext in org.IMAGE_EXTENSIONS
+        # Cached results carry no perceptual hash, so images are re-read
+        if self.cache is not None and not hashing:
+            lookup_start = perf_counter()
+            key = self.cache.make_key(
+                record.dev, record.ino, record.size, record.mtime_ns, record.path
+            )
+            cached = self.cache.get(key)
+            if cached is not MISS:
+                outcome = (cached, None, None, "cache", perf_counter() - lookup_start)
+                await self._to_place.put((record, None, outcome, None))
+                return
+
+        if not hashing:
+            loop = asyncio.get_running_loop()
+            start = perf_counter()
+            try:
+                header = await loop.run_in_executor(
+                    self._reader_pool, org._read_header_date, record.path
+                )
+            except Exception:
+                header = None  # Pillow/MediaInfo report the error in the decode stage
+            if header is not None:
+                outcome = (header[0], None, None, header[1], perf_counter() - start)
+                await self._to_place.put((record, key, outcome, None))
+                return
+        await self._to_decode.put((record, key))
+
+    async def _resumed(self, record) -> bool:
+        """Handle a file the resumed journal already decided on.
+
+        Returns:
+            bool: Whether the journal handled the file
+        """
+        key = os.path.abspath(record.path)
+        pending = self.journal_state.pending.get(key)
+        if pending is not None and pending[1:] == (record.size, record.mtime_ns):
+            if self.log_callback:
+                self.log_callback(f" • Resuming: {record.path.name}")
+            try:
+                settled = self.organizer._finish_interrupted_move(
+                    record,
+                    Path(pending[0]),
+                    pending[1],
+                    self.progress_callback,
+                    self.log_callback,
+                )
+            except Exception as e:
+                self.organizer._count_move_failure(record, e, self.log_callback)
+                return True
+            if not settled:
+                # The destination is known, no date is extracted
+                await self._to_place.put((record, None, None, Path(pending[0]).parent))
+            return True
+        skipped = self.journal_state.skipped.get(key)
+        if skipped is None or skipped[:2] != (record.size, record.mtime_ns):
+            return False
+        self.organizer._count_journal_skip(record, skipped[2], self.progress_callback)
+        return True
+
+    async def _decode_file(self, item) -> None:
+        """Decode stage: full extraction of the files the headers did not settle.
+
+        The read stage already tried the headers, so only Pillow/MediaInfo run here.
+        """
+        record, key = item
+        loop = asyncio.get_running_loop()
+        outcome = await loop.run_in_executor(
+            self._decode_pool, self._decode, record.path, True
+        )
+        await self._to_place.put((record, key, outcome, None))
+
+    async def _place(self, item) -> None:
+        """Place stage: account the extraction and start the move of dated files.
+
+        Items are (record, cache key, _safe_get_file_date() tuple, folder), where
+        folder is only set for the journaled moves of a resumed run.
+        """
+        org = self.organizer
+        record, key, outcome, folder = item
+        if folder is None:
+            file_date, error, image_hash, backend, seconds = outcome
+            if key is not None and error is None:
+                self.cache.put(key, file_date)
+            if image_hash is not None:
+                org.perceptual_hashes[str(record.path)] = image_hash
+            org.run_report.add_extraction(
+                record.path.suffix.lower(),
+                backend,
+                seconds,
+                record.size,
+                failed=file_date is None,
+            )
+            if error is not None or file_date is None:
+                # Failures are counted exactly like the sequential engine does
+                org._handle_file(
+                    record,
+                    file_date,
+                    error,
+                    self.destination_folder,
+                    self.sort_by_day,
+                    self._last_done,
+                    self.progress_callback,
+                    self.log_callback,
+                )
+                self._last_done = perf_counter()
+                return
+            if self.log_callback:
+                self.log_callback(f" • Processing: {record.path.name}")
+            folder = org.date_folder(
+                self.destination_folder, file_date, self.sort_by_day
+            )
+
+        await self._placing.acquire()
+        if self._move_error is not None:
+            raise self._move_error
+        task = asyncio.create_task(self._move(record, folder))
+        self._moves.add(task)
+        task.add_done_callback(self._move_finished)
+
+    def _move_finished(self, task: asyncio.Task) -> None:
+        self._moves.discard(task)
+        self._placing.release()
+        if not task.cancelled() and task.exception() is not None:
+            # Stops the place stage, the pipeline raises it like the sequential
+            # engine would
+            if self._move_error is None:
+                self._move_error = task.exception()
+
+    async def _move(self, record, folder: Path) -> None:
+        """Move one file, serialized with the other files of its folder."""
+        org = self.organizer
+        loop = asyncio.get_running_loop()
+        lock = self._folder_locks.setdefault(folder, asyncio.Lock())
+        async with lock, self._writers:
+            try:
+                mkdir_start = perf_counter()
+                if folder not in self._ready_folders:
+                    # Known folders come from the catalog
+                    if org.catalog is None or not org.catalog.has_dir(folder):
+                        await loop.run_in_executor(
+                            self._writer_pool, _make_folder, folder
+                        )
+                        if org.catalog is not None:
+                            org.catalog.add_dir(folder)
+                    self._ready_folders.add(folder)
+                org.run_report.add("mkdir", perf_counter() - mkdir_start)
+
+                new_file_path = folder / record.path.name
+                if org.catalog is not None:
+                    already_exists = org.catalog.contains(new_file_path)
+                else:
+                    already_exists = await loop.run_in_executor(
+                        self._writer_pool, new_file_path.exists
+                    )
+            except Exception as e:
+                org._count_move_failure(record, e, self.log_callback)
+                return
+            if already_exists:
+                org._count_existing(
+                    record, folder, self.progress_callback, self.log_callback
+                )
+                self._last_done = perf_counter()
+                return
+
+            if org.journal is not None:
+                org.journal.planned(
+                    record.path, new_file_path, record.size, record.mtime_ns
+                )
+            move_start = perf_counter()
+            try:
+                await loop.run_in_executor(
+                    self._writer_pool, org._move_file, record, new_file_path
+                )
+            except Exception as e:
+                org.run_report.add("move", perf_counter() - move_start, failed=True)
+                org._count_move_failure(record, e, self.log_callback)
+                return
+            org.run_report.add("move", perf_counter() - move_start, record.size)
+            org._count_moved(
+                record,
+                new_file_path,
+                self._last_done,
+                self.progress_callback,
+                self.log_callback,
+            )
+            self._last_done = perf_counter()
+
+
+def _make_folder(folder: Path) -> None:
+    folder.mkdir(parents=True, exist_ok=True)
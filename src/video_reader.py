@@ -0,0 +1,273 @@
+# Native creation-date reader for MP4/MOV (ISO base media / QuickTime) and MKV (Matroska).
+# Walks box / element headers with a few small reads instead of running a full
+# MediaInfo analysis. Returns None whenever it cannot decide, so the caller can
+# fall back to MediaInfo.
+
+import struct
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+ISOBMFF_EXTENSIONS = {".mp4", ".mov"}
+MATROSKA_EXTENSIONS = {".mkv"}
+VIDEO_HEADER_EXTENSIONS = ISOBMFF_EXTENSIONS | MATROSKA_EXTENSIONS
+
+# Upper bound for the moov box we are willing to read into memory
+MAX_MOOV_SIZE = 16 * 1024 * 1024
+# Prefix of a Matroska file that is searched for the Segment Info element
+MATROSKA_PREFIX_SIZE = 64 * 1024
+
+_MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+_MATROSKA_EPOCH = datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+# QuickTime metadata key holding the recording date
+_CREATION_DATE_KEY = b"com.apple.quicktime.creationdate"
+
+# Matroska element IDs (with their length marker bits, as stored in the file)
+_EBML_HEADER = 0x1A45DFA3
+_SEGMENT = 0x18538067
+_INFO = 0x1549A966
+_DATE_UTC = 0x4461
+_CLUSTER = 0x1F43B675
+
+
+def _parse_date_prefix(value: str) -> Optional[date]:
+    """Parse the YYYY-MM-DD part of a recorded-date string, or None."""
+    value = value.strip()
+    if len(value) < 10 or value[4] != "-" or value[7] != "-":
+        return None
+    try:
+        return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+    except ValueError:
+        return None
+
+
+# ISO base media / QuickTime
+
+
+def _iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None):
+    """Yield (type, payload_start, payload_end) of the boxes in a buffer."""
+    pos = start
+    end = len(data) if end is None else end
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                return
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            return
+        yield box_type, pos + header, pos + size
+        pos += size
+
+
+def _find_box(data: bytes, box_type: bytes, start: int, end: int):
+    """Return (payload_start, payload_end) of the first child box of a type."""
+    for child_type, payload_start, payload_end in _iter_boxes(data, start, end):
+        if child_type == box_type:
+            return payload_start, payload_end
+    return None
+
+
+def _read_moov(f: BinaryIO) -> Optional[bytes]:
+    """Skip over top-level boxes (mdat can be gigabytes) and read the moov box."""
+    f.seek(0, 2)
+    file_size = f.tell()
+    pos = 0
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(16)
+        if len(header) < 8:
+            return None
+        size, box_type = struct.unpack_from(">I4s", header)
+        header_size = 8
+        if size == 1:
+            if len(header) < 16:
+                return None
+            size = struct.unpack_from(">Q", header, 8)[0]
+            header_size = 16
+        elif size == 0:
+            size = file_size - pos
+        if size < header_size:
+            return None
+        if box_type == b"moov":
+            if size > MAX_MOOV_SIZE:
+                return None
+            f.seek(pos + header_size)
+            data = f.read(size - header_size)
+            return data if len(data) == size - header_size else None
+        pos += size
+    return None
+
+
+def _meta_children(data: bytes, start: int, end: int) -> int:
+    """Return where the children of a meta box start.
+
+    ISO 'meta' is a full box (4 bytes version/flags), QuickTime 'meta' is not.
+    """
+    if data[start + 4 : start + 8] == b"hdlr":
+        return start
+    return start + 4
+
+
+def _ilst_date(data: bytes, ilst: tuple, wanted: set) -> Optional[date]:
+    """Read the first parsable date from 'data' atoms of the wanted ilst items."""
+    for item_type, start, end in _iter_boxes(data, *ilst):
+        if item_type not in wanted:
+            continue
+        data_box = _find_box(data, b"data", start, end)
+        if data_box is None:
+            continue
+        # data atom: 4 bytes type indicator, 4 bytes locale, then the value
+        value = data[data_box[0] + 8 : data_box[1]]
+        parsed = _parse_date_prefix(value.decode("utf-8", errors="replace"))
+        if parsed:
+            return parsed
+    return None
+
+
+def _recorded_date(moov: bytes) -> Optional[date]:
+    """Find the recording date in udta/©day, udta/meta/ilst or moov/meta keys."""
+    udta = _find_box(moov, b"udta", 0, len(moov))
+    if udta:
+        # QuickTime user data: [u16 length][u16 language][string]
+        day = _find_box(moov, b"\xa9day", *udta)
+        if day and day[1] - day[0] > 4:
+            length = struct.unpack_from(">H", moov, day[0])[0]
+            value = moov[day[0] + 4 : min(day[0] + 4 + length, day[1])]
+            parsed = _parse_date_prefix(value.decode("utf-8", errors="replace"))
+            if parsed:
+                return parsed
+        # iTunes-style metadata: udta/meta/ilst/©day/data
+        meta = _find_box(moov, b"meta", *udta)
+        if meta:
+            ilst = _find_box(moov, b"ilst", _meta_children(moov, *meta), meta[1])
+            if ilst:
+                parsed = _ilst_date(moov, ilst, {b"\xa9day"})
+                if parsed:
+                    return parsed
+
+    # QuickTime metadata: moov/meta/keys names the ilst item indexes
+    meta = _find_box(moov, b"meta", 0, len(moov))
+    if meta:
+        children = _meta_children(moov, *meta)
+        keys = _find_box(moov, b"keys", children, meta[1])
+        ilst = _find_box(moov, b"ilst", children, meta[1])
+        if keys and ilst:
+            wanted = set()
+            # keys: version/flags, entry count, then [u32 size][4s namespace][name]
+            pos = keys[0] + 8
+            index = 1
+            while pos + 8 <= keys[1]:
+                key_size = struct.unpack_from(">I", moov, pos)[0]
+                if key_size < 8:
+                    break
+                if moov[pos + 8 : pos + key_size] == _CREATION_DATE_KEY:
+                    wanted.add(struct.pack(">I", index))
+                pos += key_size
+                index += 1
+            if wanted:
+                return _ilst_date(moov, ilst, wanted)
+    return None
+
+
+def _encoded_date(moov: bytes) -> Optional[date]:
+    """Read the creation time of the movie header (mvhd), in UTC."""
+    mvhd = _find_box(moov, b"mvhd", 0, len(moov))
+    if mvhd is None:
+        return None
+    version = moov[mvhd[0]]
+    if version == 1:
+        seconds = struct.unpack_from(">Q", moov, mvhd[0] + 4)[0]
+    else:
+        seconds = struct.unpack_from(">I", moov, mvhd[0] + 4)[0]
+    if seconds == 0:  # Not set
+        return None
+    try:
+        return (_MP4_EPOCH + timedelta(seconds=seconds)).date()
+    except OverflowError:
+        return None
+
+
+def _read_isobmff_date(f: BinaryIO) -> Optional[date]:
+    moov = _read_moov(f)
+    if moov is None:
+        return None
+    return _recorded_date(moov) or _encoded_date(moov)
+
+
+# Matroska
+
+
+def _read_vint(data: bytes, pos: int, keep_marker: bool):
+    """Read an EBML variable-length integer, returning (value, length)."""
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(data):
+        raise ValueError("Invalid EBML integer")
+    value = first if keep_marker else first & (mask - 1)
+    for byte in data[pos + 1 : pos + length]:
+        value = (value << 8) | byte
+    # All value bits set means "unknown size"
+    unknown = not keep_marker and value == (1 << (7 * length)) - 1
+    return (None if unknown else value), length
+
+
+def _read_matroska_date(f: BinaryIO) -> Optional[date]:
+    data = f.read(MATROSKA_PREFIX_SIZE)
+    pos = 0
+    end = len(data)
+    try:
+        while pos < end:
+            element_id, id_length = _read_vint(data, pos, keep_marker=True)
+            size, size_length = _read_vint(data, pos + id_length, keep_marker=False)
+            payload = pos + id_length + size_length
+            if element_id in (_SEGMENT, _INFO):
+                # Descend into the container
+                end = len(data) if size is None else min(payload + size, len(data))
+                pos = payload
+                continue
+            if element_id == _DATE_UTC:
+                if size != 8 or payload + 8 > len(data):
+                    return None
+                nanoseconds = struct.unpack_from(">q", data, payload)[0]
+                return (
+                    _MATROSKA_EPOCH + timedelta(microseconds=nanoseconds // 1000)
+                ).date()
+            if element_id == _CLUSTER or size is None:
+                # Media data started without a Segment Info date
+                return None
+            pos = payload + size
+    except (ValueError, OverflowError, IndexError, struct.error):
+        return None
+    return None
+
+
+def read_video_date(file: Union[str, Path]) -> Optional[date]:
+    """Read the creation date of an MP4/MOV/MKV file from its container headers.
+
+    MP4/MOV: the recorded date (udta ©day, or QuickTime creationdate metadata),
+    then the movie header creation time. MKV: the Segment Info DateUTC element.
+
+    Returns:
+        Optional[date]: The date, or None when the headers hold no usable date or
+        could not be parsed and the caller should fall back to MediaInfo
+    """
+    ext = Path(file).suffix.lower()
+    try:
+        with open(file, "rb") as f:
+            if ext in ISOBMFF_EXTENSIONS:
+                return _read_isobmff_date(f)
+            if ext in MATROSKA_EXTENSIONS:
+                return _read_matroska_date(f)
+    except (OSError, struct.error, IndexError):
+        return None
+    return None
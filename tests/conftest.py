@@ -0,0 +1,10 @@
+# Shared setup of the PhotoOrganizer tests.
+# The application modules live flat in src/ and import each other by module name,
+# so src/ goes on sys.path the same way running from src/ would.
+
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
@@ -0,0 +1,114 @@
+# Builders of small media files for the tests.
+# Images are written with Pillow, so Pillow is the reference the header readers
+# are checked against. Videos are assembled box by box, with the dates known.
+
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image
+
+MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+MATROSKA_EPOCH = datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+
+def exif_block(
+    date_time_original: Optional[str] = None, date_time: Optional[str] = None
+) -> bytes:
+    """EXIF block as Pillow writes it, with the given date tags."""
+    exif = Image.Exif()
+    exif[0x010F] = "Test"  # Make
+    if date_time is not None:
+        exif[0x0132] = date_time
+    if date_time_original is not None:
+        exif.get_ifd(0x8769)[0x9003] = date_time_original
+    return exif.tobytes()
+
+
+def write_jpeg(path: Path, exif: bytes = b"") -> Path:
+    """Write a small JPEG, with an EXIF block when exif is given."""
+    image = Image.new("RGB", (32, 24), (120, 80, 40))
+    if exif:
+        image.save(path, quality=80, exif=exif)
+    else:
+        image.save(path, quality=80)
+    return path
+
+
+def insert_segments(path: Path, count: int, size: int = 65000) -> None:
+    """Insert APP2 segments right after the SOI marker, before the EXIF segment."""
+    data = path.read_bytes()
+    segment = b"\xff\xe2" + struct.pack(">H", size + 2) + b"\0" * size
+    path.write_bytes(data[:2] + segment * count + data[2:])
+
+
+def pillow_dates(path: Path) -> tuple[Optional[str], Optional[str]]:
+    """(DateTimeOriginal, DateTime) of a file as Pillow reads them."""
+    with Image.open(path) as image:
+        exif = image.getexif()
+        return exif.get_ifd(0x8769).get(0x9003), exif.get(0x0132)
+
+
+def box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", 8 + len(payload)) + box_type + payload
+
+
+def large_box(box_type: bytes, payload: bytes) -> bytes:
+    """Box with a 64-bit size field (size 1 followed by the largesize)."""
+    return (
+        struct.pack(">I", 1) + box_type + struct.pack(">Q", 16 + len(payload)) + payload
+    )
+
+
+def mvhd(created: datetime, version: int = 0) -> bytes:
+    """Movie header with the creation and modification times set."""
+    seconds = int((created - MP4_EPOCH).total_seconds())
+    if version == 1:
+        times = struct.pack(">QQIQ", seconds, seconds, 1000, 0)
+    else:
+        times = struct.pack(">IIII", seconds, seconds, 1000, 0)
+    return box(b"mvhd", bytes([version, 0, 0, 0]) + times + b"\0" * 80)
+
+
+def udta_day(value: str) -> bytes:
+    """QuickTime user data with a ©day recording date."""
+    raw = value.encode()
+    return box(b"udta", box(b"\xa9day", struct.pack(">HH", len(raw), 0x55C4) + raw))
+
+
+def keys_creationdate(value: str) -> bytes:
+    """QuickTime metadata (moov/meta with keys and ilst) with a creationdate."""
+    hdlr = box(b"hdlr", b"\0" * 8 + b"mdta" + b"\0" * 13)
+    name = b"com.apple.quicktime.creationdate"
+    keys = box(b"keys", b"\0" * 4 + struct.pack(">I", 1) + box(b"mdta", name))
+    data = box(b"data", struct.pack(">II", 1, 0) + value.encode())
+    ilst = box(b"ilst", box(struct.pack(">I", 1), data))
+    return box(b"meta", hdlr + keys + ilst)
+
+
+def write_mp4(path: Path, moov_children: bytes, moov_first: bool = True) -> Path:
+    """Write an MP4/MOV with a small mdat and a moov box of the given children."""
+    ftyp = box(b"ftyp", b"isom\0\0\2\0isomiso2mp41")
+    moov = box(b"moov", moov_children)
+    mdat = box(b"mdat", b"\0" * 1024)
+    path.write_bytes(ftyp + (moov + mdat if moov_first else mdat + moov))
+    return path
+
+
+def ebml(element_id: int, payload: bytes) -> bytes:
+    """Matroska element with an 8-byte size field."""
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, "big")
+    return id_bytes + (0x01 << 56 | len(payload)).to_bytes(8, "big") + payload
+
+
+def write_mkv(path: Path, created: Optional[datetime]) -> Path:
+    """Write an MKV whose Segment Info holds a DateUTC of created, if given."""
+    header = ebml(0x1A45DFA3, ebml(0x4282, b"matroska"))
+    info = b""
+    if created is not None:
+        nanoseconds = int((created - MATROSKA_EPOCH).total_seconds()) * 10**9
+        info = ebml(0x4461, struct.pack(">q", nanoseconds))
+    cluster = ebml(0x1F43B675, b"\0" * 64)
+    path.write_bytes(header + ebml(0x18538067, ebml(0x1549A966, info) + cluster))
+    return path
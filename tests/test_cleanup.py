@@ -0,0 +1,206 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from media import exif_block, write_jpeg
+from PhotoOrganizer_v3 import PhotoOrganizer
+
+
+def _folders(root: Path) -> list[str]:
+    return sorted(
+        str(Path(path).relative_to(root))
+        for path, _, _ in os.walk(root)
+        if path != str(root)
+    )
+
+
+def test_only_touched_folders_and_their_parents(tmp_path):
+    for rel in ("a/b/c", "a/other", "untouched", "kept/x"):
+        (tmp_path / rel).mkdir(parents=True)
+    (tmp_path / "kept" / "photo.jpg").write_bytes(b"not moved")
+
+    removable = PhotoOrganizer().find_removable_folders(
+        tmp_path, [tmp_path / "a/b/c", tmp_path / "kept/x", tmp_path / "a/b/c"]
+    )
+    folders = [Path(folder) for folder, _ in removable]
+    # a is checked after a/b, and still holds a/other
+    assert sorted(folders) == [
+        tmp_path / "a/b",
+        tmp_path / "a/b/c",
+        tmp_path / "kept/x",
+    ]
+    assert folders.index(tmp_path / "a/b/c") < folders.index(tmp_path / "a/b")
+
+
+def test_whole_tree_without_touched_folders(tmp_path):
+    for rel in ("a/b", "c"):
+        (tmp_path / rel).mkdir(parents=True)
+    (tmp_path / "c" / "photo.jpg").write_bytes(b"not moved")
+
+    removable = PhotoOrganizer().find_removable_folders(tmp_path)
+    assert [Path(folder) for folder, _ in removable] == [
+        tmp_path / "a/b",
+        tmp_path / "a",
+    ]
+
+
+def test_root_and_outside_folders_are_never_removed(tmp_path):
+    root = tmp_path / "src"
+    (root / "a").mkdir(parents=True)
+    (tmp_path / "outside").mkdir()
+
+    removed = PhotoOrganizer().delete_empty_folders(
+        root, folders=[root, root / "a", tmp_path / "outside"]
+    )
+    assert removed == 1
+    assert root.is_dir() and (tmp_path / "outside").is_dir()
+    assert not (root / "a").exists()
+
+
+def test_organize_prunes_emptied_folders(tmp_path):
+    src = tmp_path / "src"
+    exif = exif_block("2021:05:06 10:11:12")
+    for rel in ("2021/trip/day1", "2021/trip/day2"):
+        (src / rel).mkdir(parents=True)
+        write_jpeg(src / rel / "IMG_0001.jpg", exif)
+    (src / "2021/trip/day2/IMG_0002.jpg").write_bytes(b"")  # Fails, stays
+    (src / "empty before the run").mkdir()
+
+    PhotoOrganizer().organize_photos(src, tmp_path / "dst")
+    assert _folders(src) == [
+        "2021",
+        "2021/trip",
+        "2021/trip/day2",
+        "empty before the run",
+    ]
+
+
+def test_hidden_entries(tmp_path):
+    names = [".DS_Store", "._IMG_0001.jpg", "THUMBS.DB", "desktop.ini", "~$notes.docx"]
+    for name in names + [".hidden", "IMG_0001.jpg"]:
+        (tmp_path / name).write_bytes(b"")
+    for name in ("@eaDir", ".git", "DCIM"):
+        (tmp_path / name).mkdir()
+
+    organizer = PhotoOrganizer()
+    with os.scandir(tmp_path) as entries:
+        hidden = sorted(e.name for e in entries if organizer.is_hidden_entry(e))
+    # Folders only count as hidden by pattern, not for a leading "."
+    assert hidden == sorted(names + [".hidden", "@eaDir"])
+    assert organizer.hidden_pattern_of(tmp_path / "Thumbs.db") == "Thumbs.db"
+    assert organizer.hidden_pattern_of(tmp_path / ".hidden") == "Other hidden files"
+
+
+def test_junk_folders_are_removed_whole(tmp_path):
+    folder = tmp_path / "album"
+    (folder / "@eaDir" / "IMG_0001.jpg").mkdir(parents=True)
+    (folder / "@eaDir" / "IMG_0001.jpg" / "SYNOPHOTO_THUMB_M.jpg").write_bytes(b"")
+    (folder / "__MACOSX").mkdir()
+    (folder / "__MACOSX" / "._IMG_0001.jpg").write_bytes(b"")
+    (folder / ".DS_Store").write_bytes(b"")
+
+    organizer = PhotoOrganizer()
+    removable = organizer.find_removable_folders(tmp_path, [folder])
+    # The folder lists the junk folder, not the thumbnails in it
+    assert [(Path(f), sorted(Path(p).name for p in h)) for f, h in removable] == [
+        (folder, [".DS_Store", "@eaDir", "__MACOSX"])
+    ]
+    removed = organizer.delete_empty_folders(
+        tmp_path, folders=[folder], removal_review_callback=list
+    )
+    assert removed == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_other_hidden_folders_are_checked_file_by_file(tmp_path):
+    recycle_bin = tmp_path / "album" / "$RECYCLE.BIN"
+    recycle_bin.mkdir(parents=True)
+    (recycle_bin / "desktop.ini").write_bytes(b"")
+    removable = PhotoOrganizer().find_removable_folders(tmp_path)
+    assert [(Path(f), [Path(p).name for p in h]) for f, h in removable] == [
+        (recycle_bin, ["desktop.ini"]),
+        (tmp_path / "album", []),
+    ]
+
+    # A deleted photo in the recycle bin keeps both folders
+    (recycle_bin / "IMG_0001.jpg").write_bytes(b"")
+    assert PhotoOrganizer().find_removable_folders(tmp_path) == []
+    with pytest.raises(OSError):
+        PhotoOrganizer()._remove_path(str(recycle_bin))
+    assert (recycle_bin / "IMG_0001.jpg").exists()
+
+
+def _hidden_tree(root: Path) -> None:
+    for rel in ("a/.DS_Store", "a/b/Thumbs.db", "a/b/desktop.ini", "c/.DS_Store"):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(b"")
+
+
+def test_all_removals_are_reviewed_at_once(tmp_path):
+    _hidden_tree(tmp_path)
+    calls = []
+
+    def review(paths):
+        calls.append(sorted(str(Path(p).relative_to(tmp_path)) for p in paths))
+        return [p for p in paths if not p.endswith("desktop.ini")]
+
+    removed = PhotoOrganizer().delete_empty_folders(
+        tmp_path, removal_review_callback=review
+    )
+    assert calls == [["a/.DS_Store", "a/b/Thumbs.db", "a/b/desktop.ini", "c/.DS_Store"]]
+    # The declined file keeps its folder and the folders above it
+    assert removed == 1
+    assert _folders(tmp_path) == ["a", "a/b"]
+    assert sorted(p.name for p in tmp_path.rglob("*") if p.is_file()) == ["desktop.ini"]
+
+
+def test_per_file_confirmation(tmp_path):
+    _hidden_tree(tmp_path)
+    asked = []
+
+    def confirm(path):
+        asked.append(path)
+        return Path(path).parent.name == "c"
+
+    assert PhotoOrganizer().delete_empty_folders(tmp_path, None, confirm) == 1
+    assert len(asked) == 4
+    assert _folders(tmp_path) == ["a", "a/b"]
+
+
+@pytest.mark.parametrize("answer, remaining", [("y", []), ("n", ["a", "a/b", "c"])])
+def test_single_console_prompt(tmp_path, monkeypatch, answer, remaining):
+    _hidden_tree(tmp_path)
+    prompts = []
+
+    def ask(prompt):
+        prompts.append(prompt)
+        return answer
+
+    monkeypatch.setattr("builtins.input", ask)
+    PhotoOrganizer().delete_empty_folders(tmp_path)
+    [prompt] = prompts
+    assert prompt.startswith("Remove 4 hidden/system files (")
+    for count in (".DS_Store 2", "Thumbs.db 1", "desktop.ini 1"):
+        assert count in prompt
+    assert _folders(tmp_path) == remaining
+
+
+def test_organize_reviews_once(tmp_path):
+    src = tmp_path / "src"
+    exif = exif_block("2021:05:06 10:11:12")
+    for folder in ("a", "b"):
+        (src / folder).mkdir(parents=True)
+        write_jpeg(src / folder / f"IMG_{folder}.jpg", exif)
+        (src / folder / "Thumbs.db").write_bytes(b"")
+    calls = []
+
+    def review(paths):
+        calls.append(len(paths))
+        return paths
+
+    PhotoOrganizer().organize_photos(
+        src, tmp_path / "dst", removal_review_callback=review
+    )
+    assert calls == [2]
+    assert list(src.iterdir()) == []
@@ -0,0 +1,124 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import cli
+from media import exif_block, write_jpeg
+
+CLI = Path(cli.__file__)
+# Runs cli.py as a script, then checks that the GUI toolkit was never imported
+HEADLESS_RUN = """
+import os, runpy, sys
+sys.argv = sys.argv[1:]
+sys.path.insert(0, os.path.dirname(sys.argv[0]))
+try:
+    runpy.run_path(sys.argv[0], run_name="__main__")
+finally:
+    assert "PyQt6" not in sys.modules, "PyQt6 was imported"
+"""
+
+
+def _source(root: Path, count: int = 5) -> Path:
+    src = root / "src"
+    (src / "DCIM").mkdir(parents=True)
+    exif = exif_block("2021:05:06 10:11:12")
+    for index in range(count):
+        write_jpeg(src / "DCIM" / f"IMG_{index:04d}.jpg", exif)
+    write_jpeg(src / "DCIM" / "no_date.jpg")
+    return src
+
+
+def _events(output: str) -> list[dict]:
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def test_json_events(tmp_path, capsys):
+    src = _source(tmp_path)
+    dst = tmp_path / "dst"
+    argv = ["organize", str(src), str(dst), "--json", "--progress-interval", "0"]
+    assert cli.main(argv) == 0
+
+    events = _events(capsys.readouterr().out)
+    assert events[0] == {"event": "start", "command": "organize"}
+    assert events[-1]["event"] == "done"
+    assert events[-1]["report"]["files"]["processed"] == 5
+    assert events[-1]["report"]["files"]["failed"] == 1
+    progress = [e for e in events if e["event"] == "progress"]
+    assert [e["processed"] for e in progress] == sorted(
+        e["processed"] for e in progress
+    )
+    assert progress[-1] == {
+        "event": "progress",
+        "processed": 5,
+        "total": 6,
+        "failed": 1,
+        "eta_seconds": progress[-1]["eta_seconds"],
+    }
+    logs = [e for e in events if e["event"] == "log"]
+    assert logs and all(e["level"] in ("info", "warning", "error") for e in logs)
+    assert len(list((dst / "2021" / "05").iterdir())) == 5
+
+
+def test_plain_text_output(tmp_path, capsys):
+    src = _source(tmp_path)
+    assert cli.main(["organize", str(src), str(tmp_path / "dst")]) == 0
+    output = capsys.readouterr().out
+    assert output.strip()
+    assert not any(line.startswith('{"event"') for line in output.splitlines())
+
+
+def test_error_event(tmp_path, capsys):
+    assert cli.main(["execute-plan", str(tmp_path / "missing.jsonl"), "--json"]) == 1
+    events = _events(capsys.readouterr().out)
+    assert [e["event"] for e in events] == ["start", "error"]
+
+
+def test_resume_needs_journal(tmp_path):
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(["organize", str(tmp_path), str(tmp_path / "dst"), "--resume"])
+    assert exc_info.value.code == 2
+
+
+def test_keep_hidden_patterns():
+    review = cli.removal_rules(["desktop.ini", "*.keep"])
+    paths = ["a/Thumbs.db", "a/DESKTOP.INI", "b/.DS_Store", "b/notes.keep"]
+    assert review(paths) == ["a/Thumbs.db", "b/.DS_Store"]
+
+
+def test_cleanup_keeps_folders_with_kept_files(tmp_path, capsys):
+    src = _source(tmp_path, count=1)
+    (src / "DCIM" / "no_date.jpg").unlink()
+    (src / "DCIM" / "Thumbs.db").write_bytes(b"")
+    (src / "other").mkdir()
+    write_jpeg(src / "other" / "IMG_9999.jpg", exif_block("2021:05:06 10:11:12"))
+    (src / "other" / "desktop.ini").write_bytes(b"")
+
+    argv = ["organize", str(src), str(tmp_path / "dst"), "--cleanup"]
+    assert cli.main(argv + ["--keep-hidden", "desktop.ini"]) == 0
+    assert sorted(p.name for p in src.rglob("*")) == ["desktop.ini", "other"]
+
+
+def test_runs_headless(tmp_path):
+    src = _source(tmp_path)
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            HEADLESS_RUN,
+            str(CLI),
+            "organize",
+            str(src),
+            str(tmp_path / "dst"),
+            "--json",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    events = _events(result.stdout)
+    assert events[-1]["event"] == "done"
+    assert events[-1]["report"]["files"]["processed"] == 5
@@ -0,0 +1,105 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from date_parser import (
+    EXIF_FORMAT,
+    VIDEO_FORMATS,
+    parse_exif_datetime,
+    parse_video_datetime,
+)
+
+
+def strptime_exif(value: str):
+    try:
+        return datetime.strptime(value, EXIF_FORMAT).date()
+    except ValueError:
+        return None
+
+
+def strptime_video(value: str):
+    value = value.replace(" UTC", "").replace("UTC ", "")
+    for fmt in VIDEO_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+EXIF_VALUES = [
+    "2021:05:06 10:11:12",
+    "2020:02:29 00:00:00",  # Leap day
+    "2021:02:29 00:00:00",  # Not a leap year
+    "1900:02:29 12:00:00",
+    "2000:02:29 12:00:00",
+    "2021:04:31 10:11:12",
+    "2021:13:01 10:11:12",
+    "2021:00:10 10:11:12",
+    "2021:05:00 10:11:12",
+    "2021:05:06 24:00:00",
+    "2021:05:06 23:60:00",
+    "2021:05:06 23:59:60",
+    "0000:00:00 00:00:00",  # Cameras without a clock
+    "    :  :     :  :  ",
+    "2021:5:6 1:2:3",  # Single digits, accepted by strptime
+    "2021:05:06 10:11:12\0",
+    "2021-05-06 10:11:12",
+    "2021:05:06",
+    "２０２１:05:06 10:11:12",  # Non-ASCII digits
+    "",
+]
+
+VIDEO_VALUES = [
+    "UTC 2021-05-06 10:11:12",
+    "2021-05-06 10:11:12 UTC",
+    "2021-05-06 10:11:12",
+    "2021-05-06T10:11:12Z",
+    "2021-05-06T10:11:12.5Z",
+    "2021-05-06T10:11:12.123456Z",
+    "2021-05-06T10:11:12.1234567Z",
+    "2021-05-06T10:11:12.Z",
+    "2021-05-06T10:11:12",
+    "2021-05-06T10:11:12+02:00",
+    "2021-05-06",
+    "2021-02-29",
+    "2021-05-06 25:11:12",
+    "2021-5-6",
+    "2021-05-06 10:11",
+    "2021/05/06",
+    "UTC",
+    "",
+]
+
+
+@pytest.mark.parametrize("value", EXIF_VALUES)
+def test_exif_matches_strptime(value):
+    assert parse_exif_datetime(value) == strptime_exif(value)
+
+
+@pytest.mark.parametrize("value", VIDEO_VALUES)
+def test_video_matches_strptime(value):
+    assert parse_video_datetime(value) == strptime_video(value)
+
+
+def _mutations(seed: int, templates: list[str], count: int):
+    """Valid strings with random characters replaced, for the parsers' edge cases."""
+    rng = random.Random(seed)
+    alphabet = "0123456789 :-TZ.+/"
+    for _ in range(count):
+        value = list(rng.choice(templates))
+        for _ in range(rng.randint(1, 3)):
+            value[rng.randrange(len(value))] = rng.choice(alphabet)
+        yield "".join(value)
+
+
+def test_exif_mutations_match_strptime():
+    for value in _mutations(1, ["2021:05:06 10:11:12", "1999:12:31 23:59:59"], 3000):
+        assert parse_exif_datetime(value) == strptime_exif(value), value
+
+
+def test_video_mutations_match_strptime():
+    templates = ["2021-05-06 10:11:12", "2021-05-06T10:11:12.123Z", "2021-05-06"]
+    for value in _mutations(2, templates, 3000):
+        assert parse_video_datetime(value) == strptime_video(value), value
@@ -0,0 +1,91 @@
+import os
+import shutil
+
+from destination_catalog import DestinationCatalog
+from media import exif_block, write_jpeg
+from PhotoOrganizer_v3 import PhotoOrganizer
+
+
+def _library(root):
+    for rel in ("2020/01/a.jpg", "2020/02/b.jpg", "2021/03/c.jpg"):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_bytes(b"library file")
+    return root
+
+
+def _open(dst, tmp_path) -> DestinationCatalog:
+    catalog = DestinationCatalog(dst, tmp_path / "catalog.db")
+    catalog.load()
+    return catalog
+
+
+def test_first_load_scans_the_library(tmp_path):
+    dst = _library(tmp_path / "dst")
+    catalog = _open(dst, tmp_path)
+    assert catalog.rescanned_dirs == 6
+    assert catalog.has_dir(dst / "2020" / "02")
+    assert not catalog.has_dir(dst / "2020" / "03")
+    assert catalog.contains(dst / "2021" / "03" / "c.jpg")
+    assert not catalog.contains(dst / "2021" / "03" / "a.jpg")
+    catalog.close()
+
+    # Nothing changed, so nothing is scanned again
+    catalog = _open(dst, tmp_path)
+    assert catalog.rescanned_dirs == 0
+    assert catalog.contains(dst / "2020" / "01" / "a.jpg")
+    catalog.close()
+
+
+def test_only_changed_folders_are_rescanned(tmp_path):
+    dst = _library(tmp_path / "dst")
+    _open(dst, tmp_path).close()
+
+    (dst / "2020" / "01" / "new.jpg").write_bytes(b"added by hand")
+    shutil.rmtree(dst / "2021" / "03")
+    catalog = _open(dst, tmp_path)
+    # 2020/01 and 2021 changed
+    assert catalog.rescanned_dirs == 2
+    assert catalog.contains(dst / "2020" / "01" / "new.jpg")
+    assert not catalog.has_dir(dst / "2021" / "03")
+    assert not catalog.contains(dst / "2021" / "03" / "c.jpg")
+    catalog.close()
+
+
+def test_recorded_moves_need_no_rescan(tmp_path):
+    dst = _library(tmp_path / "dst")
+    catalog = _open(dst, tmp_path)
+    target = dst / "2022" / "07" / "d.jpg"
+    target.parent.mkdir(parents=True)
+    catalog.add_dir(target.parent)
+    target.write_bytes(b"moved")
+    st = os.stat(target)
+    catalog.add_file(target, st.st_size, st.st_mtime_ns)
+    catalog.close()
+
+    catalog = _open(dst, tmp_path)
+    assert catalog.rescanned_dirs == 0
+    assert catalog.has_dir(dst / "2022")
+    assert catalog.contains(target)
+    catalog.close()
+
+
+def test_organize_with_catalog(tmp_path):
+    src, dst = tmp_path / "src", _library(tmp_path / "dst")
+    src.mkdir()
+    exif = exif_block("2020:01:06 10:11:12")
+    taken = write_jpeg(src / "a.jpg", exif)
+    moved = write_jpeg(src / "e.jpg", exif)
+
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(
+        src, dst, remove_empty=False, catalog_path=tmp_path / "catalog.db"
+    )
+    # The catalog knew the name was taken
+    assert taken.exists()
+    assert (dst / "2020" / "01" / "a.jpg").read_bytes() == b"library file"
+    assert not moved.exists() and (dst / "2020" / "01" / "e.jpg").exists()
+
+    catalog = _open(dst, tmp_path)
+    assert catalog.rescanned_dirs == 0
+    assert catalog.contains(dst / "2020" / "01" / "e.jpg")
+    catalog.close()
@@ -0,0 +1,102 @@
+import os
+from pathlib import Path
+
+from duplicates import SAMPLE_SIZE, find_duplicate_groups
+from media import exif_block, write_jpeg
+from PhotoOrganizer_v3 import FileRecord, PhotoOrganizer
+
+
+def _records(*paths: Path) -> list[FileRecord]:
+    records = []
+    for path in paths:
+        st = os.stat(path)
+        records.append(
+            FileRecord(path, st.st_size, st.st_mtime_ns, st.st_dev, st.st_ino)
+        )
+    return records
+
+
+def _write(path: Path, data: bytes) -> Path:
+    path.write_bytes(data)
+    return path
+
+
+def test_groups_identical_files_in_scan_order(tmp_path):
+    small = os.urandom(1000)
+    large = os.urandom(3 * SAMPLE_SIZE)
+    records = _records(
+        _write(tmp_path / "a", large),
+        _write(tmp_path / "b", small),
+        _write(tmp_path / "c", os.urandom(1000)),  # Same size, other bytes
+        _write(tmp_path / "d", small),
+        _write(tmp_path / "e", large),
+        _write(tmp_path / "f", b"unique"),
+    )
+    groups = find_duplicate_groups(records, jobs=2)
+    assert [[r.path.name for r in group] for group in groups] == [
+        ["a", "e"],
+        ["b", "d"],
+    ]
+
+
+def test_large_files_differing_in_the_middle(tmp_path):
+    # Equal head and tail samples, only the full hash tells them apart
+    head, tail = os.urandom(SAMPLE_SIZE), os.urandom(SAMPLE_SIZE)
+    records = _records(
+        _write(tmp_path / "a", head + b"\0" * 100 + tail),
+        _write(tmp_path / "b", head + b"\1" * 100 + tail),
+    )
+    assert find_duplicate_groups(records) == []
+
+
+def test_unreadable_files_are_ignored(tmp_path):
+    data = os.urandom(1000)
+    records = _records(
+        _write(tmp_path / "a", data),
+        _write(tmp_path / "b", data),
+        _write(tmp_path / "c", data),
+    )
+    os.remove(tmp_path / "b")
+    groups = find_duplicate_groups(records)
+    assert [[r.path.name for r in group] for group in groups] == [["a", "c"]]
+
+
+def _source(root: Path) -> tuple[Path, Path]:
+    src = root / "src"
+    src.mkdir()
+    exif = exif_block("2021:05:06 10:11:12")
+    original = write_jpeg(src / "a.jpg", exif)
+    copy = src / "copy of a.jpg"
+    copy.write_bytes(original.read_bytes())
+    write_jpeg(src / "b.jpg", exif_block("2021:05:07 10:11:12"))
+    return src, copy
+
+
+def test_organize_skips_duplicates(tmp_path):
+    src, copy = _source(tmp_path)
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(
+        src, tmp_path / "dst", remove_empty=False, duplicates="skip"
+    )
+
+    # Whichever of the two was scanned first is kept as the original
+    [(duplicate, original)] = organizer.duplicate_files
+    assert {duplicate, original} == {str(copy), str(src / "a.jpg")}
+    assert [str(p) for p in src.iterdir()] == [duplicate]
+    assert sorted(p.name for p in (tmp_path / "dst/2021/05").iterdir()) == sorted(
+        [Path(original).name, "b.jpg"]
+    )
+    assert organizer.processed_files == 3
+
+
+def test_organize_reports_duplicates(tmp_path):
+    src, copy = _source(tmp_path)
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(
+        src, tmp_path / "dst", remove_empty=False, duplicates="report"
+    )
+
+    [pair] = organizer.duplicate_files
+    assert set(pair) == {str(copy), str(src / "a.jpg")}
+    assert list(src.iterdir()) == []
+    assert len(list((tmp_path / "dst/2021/05").iterdir())) == 3
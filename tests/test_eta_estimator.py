@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from eta_estimator import EtaEstimator
+from PhotoOrganizer_v3 import PhotoOrganizer
+
+MB = 1024 * 1024
+
+
+def _run(eta: EtaEstimator, file_class: str, count: int, size: int, seconds: float):
+    for _ in range(count):
+        eta.complete(file_class, size, seconds)
+
+
+def test_no_estimate_before_min_samples():
+    eta = EtaEstimator(min_samples=10)
+    for _ in range(20):
+        eta.add_pending("image", MB)
+    _run(eta, "image", 9, MB, 0.1)
+    assert eta.estimate() == -1
+    _run(eta, "image", 1, MB, 0.1)
+    assert eta.estimate() == pytest.approx(1.0)
+
+
+def test_weighted_by_remaining_bytes():
+    eta = EtaEstimator()
+    for _ in range(10):
+        eta.add_pending("image", MB)
+    eta.add_pending("video", 1000 * MB)
+    _run(eta, "image", 10, MB, 0.1)
+    # Videos have no samples yet and use the throughput of the images, 10 MB/s
+    assert eta.estimate() == pytest.approx(100.0)
+
+
+def test_each_class_has_its_own_throughput():
+    eta = EtaEstimator()
+    for _ in range(15):
+        eta.add_pending("image", MB)
+    for _ in range(12):
+        eta.add_pending("video", 100 * MB)
+    _run(eta, "image", 10, MB, 0.1)  # 10 MB/s
+    _run(eta, "video", 10, 100 * MB, 1.0)  # 100 MB/s
+    assert eta.estimate() == pytest.approx(5 * 0.1 + 2 * 1.0)
+
+
+def test_skipped_files_need_no_time():
+    eta = EtaEstimator()
+    for _ in range(20):
+        eta.add_pending("image", MB)
+    _run(eta, "image", 10, MB, 0.1)
+    for _ in range(10):
+        eta.skip("image", MB)
+    assert eta.estimate() == 0
+
+
+def test_empty_files_are_counted_per_file():
+    eta = EtaEstimator()
+    for _ in range(15):
+        eta.add_pending("image", 0)
+    _run(eta, "image", 10, 0, 0.2)
+    assert eta.estimate() == pytest.approx(5 * 0.2)
+
+
+def test_follows_a_change_of_speed():
+    eta = EtaEstimator(alpha=0.2)
+    for _ in range(200):
+        eta.add_pending("image", MB)
+    _run(eta, "image", 50, MB, 0.1)
+    _run(eta, "image", 50, MB, 1.0)  # e.g. the network share slowed down
+    assert eta.estimate() == pytest.approx(100 * 1.0, rel=0.01)
+
+
+@pytest.mark.parametrize(
+    "name, file_class",
+    [("a.JPG", "image"), ("a.heic", "image"), ("a.MOV", "video"), ("a.cr2", "raw")],
+)
+def test_file_classes(name, file_class):
+    assert PhotoOrganizer().file_class(Path(name)) == file_class
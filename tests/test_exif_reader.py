@@ -0,0 +1,112 @@
+import struct
+
+import pytest
+from PIL import Image
+
+from exif_reader import PREFIX_SIZE, read_exif_dates
+from media import exif_block, insert_segments, pillow_dates, write_jpeg
+from PhotoOrganizer_v3 import PhotoOrganizer
+
+ORIGINAL = "2021:05:06 10:11:12"
+MODIFIED = "2022:01:02 03:04:05"
+
+
+@pytest.mark.parametrize(
+    "original, modified",
+    [(ORIGINAL, MODIFIED), (ORIGINAL, None), (None, MODIFIED), (None, None)],
+)
+def test_jpeg_matches_pillow(tmp_path, original, modified):
+    path = write_jpeg(tmp_path / "a.jpg", exif_block(original, modified))
+    assert read_exif_dates(path) == pillow_dates(path) == (original, modified)
+
+
+def test_jpeg_without_exif(tmp_path):
+    path = write_jpeg(tmp_path / "a.jpg")
+    assert read_exif_dates(path) == (None, None)
+    assert pillow_dates(path) == (None, None)
+
+
+def test_tiff_matches_pillow(tmp_path):
+    path = tmp_path / "a.tif"
+    exif = Image.Exif()
+    exif[0x0132] = MODIFIED
+    Image.new("RGB", (8, 8)).save(path, exif=exif)
+    assert read_exif_dates(path) == pillow_dates(path) == (None, MODIFIED)
+
+
+def _big_endian_tiff(date_time: str, date_time_original: str) -> bytes:
+    """Motorola byte order TIFF with IFD0 DateTime and an EXIF sub-IFD."""
+    modified = date_time.encode() + b"\0"
+    original = date_time_original.encode() + b"\0"
+    # Header (8), IFD0 with 2 entries (30), EXIF IFD with 1 entry (18), values
+    ifd0 = struct.pack(">H", 2)
+    ifd0 += struct.pack(">HHII", 306, 2, len(modified), 56)
+    ifd0 += struct.pack(">HHII", 0x8769, 4, 1, 38) + struct.pack(">I", 0)
+    exif_ifd = struct.pack(">H", 1)
+    exif_ifd += struct.pack(">HHII", 36867, 2, len(original), 56 + len(modified))
+    exif_ifd += struct.pack(">I", 0)
+    header = b"MM" + struct.pack(">HI", 42, 8)
+    return header + ifd0 + exif_ifd + modified + original
+
+
+def test_big_endian_tiff_matches_pillow(tmp_path):
+    path = tmp_path / "a.dng"
+    path.write_bytes(_big_endian_tiff(MODIFIED, ORIGINAL))
+    exif = Image.Exif()
+    exif.load(path.read_bytes())
+    pillow = (exif.get_ifd(0x8769).get(0x9003), exif.get(0x0132))
+    assert read_exif_dates(path) == pillow == (ORIGINAL, MODIFIED)
+
+
+def test_exif_beyond_prefix_is_left_to_pillow(tmp_path):
+    path = write_jpeg(tmp_path / "a.jpg", exif_block(ORIGINAL, MODIFIED))
+    # Push the EXIF segment past the bytes the reader looks at
+    insert_segments(path, PREFIX_SIZE // 65000 + 1)
+    assert path.stat().st_size > PREFIX_SIZE
+    assert read_exif_dates(path) is None
+    assert read_exif_dates(path, prefix_size=4 * PREFIX_SIZE) == (ORIGINAL, MODIFIED)
+    assert pillow_dates(path) == (ORIGINAL, MODIFIED)
+
+    file_date, _, backend = PhotoOrganizer()._read_image_metadata(path)
+    assert (file_date.isoformat(), backend) == ("2021-05-06", "pillow")
+
+
+@pytest.mark.parametrize("kept", [0.0, 0.1, 0.3, 0.5, 0.7, 0.9, 0.99])
+def test_truncated_jpeg_is_undecided(tmp_path, kept):
+    path = write_jpeg(tmp_path / "a.jpg", exif_block(ORIGINAL, MODIFIED))
+    data = path.read_bytes()
+    # Cut the file inside the EXIF segment
+    start = data.index(b"\xff\xe1")
+    length = struct.unpack_from(">H", data, start + 2)[0]
+    path.write_bytes(data[: start + 2 + int(length * kept)])
+    assert read_exif_dates(path) is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"II",
+        b"XX*\0\x08\0\0\0",  # Unknown byte order
+        b"II\x2b\0\x08\0\0\0",  # Wrong magic number
+        b"II*\0\xff\xff\0\0",  # IFD0 offset past the end
+        b"II*\0\x08\0\0\0\xff\xff",  # More entries than bytes
+        b"\xff\xd8\x00\x00\x00\x00",  # JPEG without a marker
+    ],
+)
+def test_malformed_headers_are_undecided(tmp_path, data):
+    path = tmp_path / "a.tif"
+    path.write_bytes(data)
+    assert read_exif_dates(path) is None
+
+
+def test_date_pointing_past_the_end(tmp_path):
+    data = bytearray(_big_endian_tiff(MODIFIED, ORIGINAL))
+    struct.pack_into(">I", data, 18, 4096)  # Value offset of the DateTime entry
+    path = tmp_path / "a.tif"
+    path.write_bytes(bytes(data))
+    assert read_exif_dates(path) is None
+
+
+def test_missing_file(tmp_path):
+    assert read_exif_dates(tmp_path / "missing.jpg") is None
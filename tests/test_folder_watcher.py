@@ -0,0 +1,135 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from folder_watcher import FolderWatcher
+from media import exif_block, write_jpeg
+from PhotoOrganizer_v3 import PhotoOrganizer
+
+BACKENDS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(
+            not sys.platform.startswith("linux"), reason="inotify is Linux only"
+        ),
+    ),
+]
+
+
+class _Watch:
+    """Run a watch on a thread and collect the reported files."""
+
+    def __init__(self, watcher: FolderWatcher, existing: bool = False):
+        self.watcher = watcher
+        self.reported: list[Path] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(existing,))
+
+    def _run(self, existing: bool) -> None:
+        for batch in self.watcher.watch(self._stop, existing):
+            self.reported.extend(batch)
+
+    def __enter__(self):
+        self._thread.start()
+        time.sleep(0.2)  # Let the watch list the tree
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join(timeout=10)
+        assert not self._thread.is_alive()
+
+    def wait_for(self, count: int, timeout: float = 10) -> list[Path]:
+        deadline = time.monotonic() + timeout
+        while len(self.reported) < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return sorted(self.reported)
+
+
+def _watcher(root: Path, use_inotify: bool, **kwargs) -> FolderWatcher:
+    return FolderWatcher(
+        root,
+        accept_file=lambda path: path.suffix == ".jpg",
+        accept_folder=lambda name: name != "@eaDir",
+        settle_seconds=0.3,
+        poll_interval=0.05,
+        use_inotify=use_inotify,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+def test_reports_new_files(tmp_path, use_inotify):
+    (tmp_path / "existing.jpg").write_bytes(b"already there")
+    watcher = _watcher(tmp_path, use_inotify)
+    assert watcher.backend_name == ("inotify" if use_inotify else "polling")
+    with _Watch(watcher) as watch:
+        (tmp_path / "a.jpg").write_bytes(b"new")
+        (tmp_path / "notes.txt").write_bytes(b"not accepted")
+        (tmp_path / "DCIM" / "100").mkdir(parents=True)
+        (tmp_path / "DCIM" / "100" / "b.jpg").write_bytes(b"in a new folder")
+        assert watch.wait_for(2) == [tmp_path / "DCIM/100/b.jpg", tmp_path / "a.jpg"]
+        time.sleep(0.5)
+    # Every file is reported once
+    assert len(watch.reported) == 2
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+def test_existing_files_and_excluded_folders(tmp_path, use_inotify):
+    for rel in ("a.jpg", "sub/b.jpg", "@eaDir/c.jpg", "dst/2021/d.jpg"):
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(b"")
+    watcher = _watcher(tmp_path, use_inotify, exclude=tmp_path / "dst")
+    with _Watch(watcher, existing=True) as watch:
+        (tmp_path / "dst" / "2021" / "e.jpg").write_bytes(b"moved by the organizer")
+        assert watch.wait_for(2) == [tmp_path / "a.jpg", tmp_path / "sub/b.jpg"]
+        time.sleep(0.5)
+    assert len(watch.reported) == 2
+
+
+@pytest.mark.parametrize("use_inotify", BACKENDS)
+def test_waits_for_a_file_being_written(tmp_path, use_inotify):
+    path = tmp_path / "a.jpg"
+    with _Watch(_watcher(tmp_path, use_inotify)) as watch:
+        with open(path, "wb") as f:
+            for _ in range(8):
+                f.write(b"x" * 1000)
+                f.flush()
+                time.sleep(0.1)
+            assert watch.reported == []
+        assert watch.wait_for(1) == [path]
+
+
+def test_watch_folder_sorts_new_files(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "src" / "sorted"
+    src.mkdir()
+    stop = threading.Event()
+    organizer = PhotoOrganizer()
+    thread = threading.Thread(
+        target=organizer.watch_folder,
+        args=(src, dst),
+        kwargs=dict(stop_event=stop, settle_seconds=0.2, poll_interval=0.05),
+    )
+    thread.start()
+    try:
+        time.sleep(0.2)
+        exif = exif_block("2021:05:06 10:11:12")
+        write_jpeg(src / "IMG_0001.jpg", exif)
+        (src / "camera").mkdir()
+        write_jpeg(src / "camera" / "IMG_0002.jpg", exif)
+        deadline = time.monotonic() + 10
+        while organizer.processed_files < 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        stop.set()
+        thread.join(timeout=10)
+    assert not thread.is_alive()
+    assert sorted(p.name for p in (dst / "2021" / "05").iterdir()) == [
+        "IMG_0001.jpg",
+        "IMG_0002.jpg",
+    ]
+    assert organizer.processed_files == 2
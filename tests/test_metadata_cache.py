@@ -0,0 +1,126 @@
+import errno
+import os
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+import metadata_cache
+from media import exif_block, write_jpeg
+from metadata_cache import MISS, MetadataCache
+from PhotoOrganizer_v3 import FileRecord, PhotoOrganizer
+
+
+def _record(path: Path) -> FileRecord:
+    st = os.stat(path)
+    return FileRecord(path, st.st_size, st.st_mtime_ns, st.st_dev, st.st_ino)
+
+
+def test_round_trip_across_runs(tmp_path):
+    dated, undated = tmp_path / "a.jpg", tmp_path / "b.jpg"
+    dated.write_bytes(b"a")
+    undated.write_bytes(b"b")
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        assert cache.get(cache.key_for(dated)) is MISS
+        cache.put(cache.key_for(dated), date(2021, 5, 6))
+        cache.put(cache.key_for(undated), None)
+
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        assert cache.get(cache.key_for(dated)) == date(2021, 5, 6)
+        # A cached "no date" result is a hit, not a miss
+        assert cache.get(cache.key_for(undated)) is None
+        assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_modified_file_misses(tmp_path):
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"a")
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        old_key = cache.key_for(path)
+        cache.put(old_key, date(2021, 5, 6))
+
+    path.write_bytes(b"edited")
+    os.utime(path, ns=(1, 1))
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        new_key = cache.key_for(path)
+        assert cache.get(new_key) is MISS
+        cache.put(new_key, date(2022, 1, 2))
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        # The entry of the old version of the file is replaced
+        assert cache.get(old_key) is MISS
+        assert cache.get(new_key) == date(2022, 1, 2)
+
+
+def test_version_change_discards_entries(tmp_path, monkeypatch):
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"a")
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        cache.put(cache.key_for(path), date(2021, 5, 6))
+
+    monkeypatch.setattr(
+        metadata_cache, "CACHE_VERSION", metadata_cache.CACHE_VERSION + 1
+    )
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        assert cache.get(cache.key_for(path)) is MISS
+
+
+def test_evicts_entries_not_seen(tmp_path):
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"a")
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        cache.put(cache.key_for(path), date(2021, 5, 6))
+
+    cache = MetadataCache(tmp_path / "cache.db", max_age_days=1)
+    cache._now += 2 * 86400  # Two days later
+    assert cache.evict_stale() == 1
+    assert cache.get(cache.key_for(path)) is MISS
+    cache.close()
+
+    connection = sqlite3.connect(tmp_path / "cache.db")
+    assert connection.execute("SELECT COUNT(*) FROM file_dates").fetchone() == (0,)
+    connection.close()
+
+
+def test_extraction_uses_the_cache(tmp_path, monkeypatch):
+    dated = write_jpeg(tmp_path / "a.jpg", exif_block("2021:05:06 10:11:12"))
+    undated = write_jpeg(tmp_path / "b.jpg")
+    records = [_record(dated), _record(undated)]
+    organizer = PhotoOrganizer()
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        first = list(organizer.iter_file_dates(records, cache=cache))
+
+    def no_extraction(*args, **kwargs):
+        raise AssertionError("the file was read again")
+
+    monkeypatch.setattr(organizer, "_read_image_metadata", no_extraction)
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        second = list(organizer.iter_file_dates(records, cache=cache))
+        assert cache.hits == 2
+    assert (
+        second
+        == first
+        == [
+            (records[0], date(2021, 5, 6), None),
+            (records[1], None, None),
+        ]
+    )
+
+
+def test_read_failures_are_not_cached(tmp_path, monkeypatch):
+    path = write_jpeg(tmp_path / "a.jpg", exif_block("2021:05:06 10:11:12"))
+    record = _record(path)
+    organizer = PhotoOrganizer()
+
+    def unreadable(*args, **kwargs):
+        raise OSError(errno.EIO, "Input/output error")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(organizer, "_read_image_metadata", unreadable)
+        with MetadataCache(tmp_path / "cache.db") as cache:
+            [(_, file_date, error)] = organizer.iter_file_dates([record], cache=cache)
+    assert file_date is None and "Input/output error" in error
+
+    # The next run reads the file again instead of trusting a cached "no date"
+    with MetadataCache(tmp_path / "cache.db") as cache:
+        [(_, file_date, error)] = organizer.iter_file_dates([record], cache=cache)
+        assert cache.hits == 0
+    assert (file_date, error) == (date(2021, 5, 6), None)
@@ -0,0 +1,120 @@
+import errno
+import os
+
+import pytest
+
+import move_engine
+from move_engine import MoveEngine
+
+CONTENT = os.urandom(300_000)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    source = src / "a.jpg"
+    source.write_bytes(CONTENT)
+    os.utime(source, (1_600_000_000, 1_600_000_000))
+    return src, dst, source
+
+
+def _cross_device(src, dst, method=None, **kwargs) -> MoveEngine:
+    """An engine that copies as if the trees were on different devices."""
+    engine = MoveEngine(src, dst, **kwargs)
+    engine.cross_device = True
+    if method is not None:
+        engine.copy_method = method
+    return engine
+
+
+def test_same_device_rename(tree):
+    src, dst, source = tree
+    engine = MoveEngine(src, dst)
+    assert not engine.cross_device
+    engine.move(source, dst / "a.jpg")
+    assert not source.exists()
+    assert (dst / "a.jpg").read_bytes() == CONTENT
+
+
+@pytest.mark.parametrize("method", ["copy_file_range", "sendfile", "buffered"])
+def test_cross_device_copy(tree, method):
+    src, dst, source = tree
+    if method != "buffered" and not hasattr(os, method):
+        pytest.skip(f"os.{method} is not available")
+    progress = []
+    engine = _cross_device(
+        src,
+        dst,
+        method,
+        byte_progress_callback=lambda done, total: progress.append((done, total)),
+        chunk_size=64 * 1024,
+    )
+    target = dst / "a.jpg"
+    engine.move(source, target, len(CONTENT))
+
+    assert not source.exists()
+    assert target.read_bytes() == CONTENT
+    assert target.stat().st_mtime == 1_600_000_000
+    assert not MoveEngine.partial_path(target).exists()
+    assert progress[-1] == (len(CONTENT), len(CONTENT))
+    assert [done for done, _ in progress] == sorted(done for done, _ in progress)
+
+
+def test_never_overwrites(tree):
+    src, dst, source = tree
+    target = dst / "a.jpg"
+    target.write_bytes(b"library file")
+    with pytest.raises(FileExistsError):
+        _cross_device(src, dst).move(source, target)
+
+    assert source.read_bytes() == CONTENT
+    assert target.read_bytes() == b"library file"
+    assert not MoveEngine.partial_path(target).exists()
+
+
+def test_replaces_stale_partial_copy(tree):
+    src, dst, source = tree
+    target = dst / "a.jpg"
+    MoveEngine.partial_path(target).write_bytes(b"killed during the copy")
+    _cross_device(src, dst).move(source, target)
+    assert target.read_bytes() == CONTENT
+    assert not MoveEngine.partial_path(target).exists()
+
+
+def test_failed_copy_only_removes_its_partial(tree):
+    src, dst, source = tree
+
+    def fail(done, total):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    target = dst / "a.jpg"
+    engine = _cross_device(src, dst, byte_progress_callback=fail, chunk_size=4096)
+    with pytest.raises(OSError):
+        engine.move(source, target)
+
+    assert source.read_bytes() == CONTENT
+    assert not target.exists()
+    assert not MoveEngine.partial_path(target).exists()
+
+
+@pytest.mark.parametrize("error", [errno.ENOTSOCK, errno.EINVAL, errno.EXDEV])
+def test_falls_back_to_buffered_copy(tree, monkeypatch, error):
+    src, dst, source = tree
+
+    def unsupported(*args):
+        raise OSError(error, os.strerror(error))
+
+    monkeypatch.setattr(move_engine.os, "sendfile", unsupported, raising=False)
+    engine = _cross_device(src, dst, "sendfile")
+    engine.move(source, dst / "a.jpg")
+
+    assert engine.copy_method == "buffered"
+    assert (dst / "a.jpg").read_bytes() == CONTENT
+
+
+def test_no_sendfile_outside_linux(tmp_path, monkeypatch):
+    monkeypatch.delattr(move_engine.os, "copy_file_range", raising=False)
+    monkeypatch.setattr(move_engine, "_SENDFILE_TO_FILES", False)
+    assert MoveEngine(tmp_path, tmp_path).copy_method == "buffered"
@@ -0,0 +1,147 @@
+import json
+from datetime import date
+
+import pytest
+
+from media import exif_block, write_jpeg
+from move_engine import MoveEngine
+from move_journal import MoveJournal, load_journal
+from PhotoOrganizer_v3 import PhotoOrganizer, PipelineLimits
+
+
+def test_round_trip(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    a, b, c = src / "a.jpg", src / "b.jpg", src / "c.jpg"
+    with MoveJournal(tmp_path / "journal", src, dst) as journal:
+        journal.planned(a, dst / "a.jpg", 10, 111)
+        journal.done(a, dst / "a.jpg", 10)
+        journal.planned(b, dst / "b.jpg", 20, 222)  # Interrupted
+        journal.skipped(c, 30, 333, "no_date")
+
+    state = load_journal(tmp_path / "journal")
+    assert (state.source, state.destination) == (str(src), str(dst))
+    assert state.done == [(str(a), str(dst / "a.jpg"), 10)]
+    assert state.pending == {str(b): (str(dst / "b.jpg"), 20, 222)}
+    assert state.skipped == {str(c): (30, 333, "no_date")}
+
+
+def test_undone_moves_and_later_runs(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    a = src / "a.jpg"
+    with MoveJournal(tmp_path / "journal", src, dst) as journal:
+        journal.done(a, dst / "a.jpg", 10)
+        journal.undone(a, dst / "a.jpg")
+    # A second run appends to the same journal
+    with MoveJournal(tmp_path / "journal", src, dst) as journal:
+        journal.done(a, dst / "a.jpg", 10)
+
+    state = load_journal(tmp_path / "journal")
+    assert state.done == [(str(a), str(dst / "a.jpg"), 10)]
+
+
+def test_torn_last_line(tmp_path):
+    path = tmp_path / "journal"
+    with MoveJournal(path, tmp_path, tmp_path) as journal:
+        journal.done(tmp_path / "a", tmp_path / "b", 1)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "done", "src": ')  # Killed while writing
+
+    assert len(load_journal(path).done) == 1
+    # The next run closes the torn line instead of appending to it
+    with MoveJournal(path, tmp_path, tmp_path) as journal:
+        journal.done(tmp_path / "c", tmp_path / "d", 2)
+    assert len(load_journal(path).done) == 2
+
+
+def test_unknown_version(tmp_path):
+    path = tmp_path / "journal"
+    path.write_text(json.dumps({"type": "run", "version": 99}) + "\n")
+    with pytest.raises(ValueError):
+        load_journal(path)
+
+
+@pytest.fixture
+def interrupted(tmp_path):
+    """A source file whose journaled move was planned but never confirmed."""
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    source = write_jpeg(src / "a.jpg", exif_block("2021:05:06 10:11:12"))
+    target = PhotoOrganizer.date_folder(dst, date(2021, 5, 6), True) / "a.jpg"
+    target.parent.mkdir(parents=True)
+    stat = source.stat()
+    with MoveJournal(tmp_path / "journal", src, dst) as journal:
+        journal.planned(source, target, stat.st_size, stat.st_mtime_ns)
+    return src, dst, source, target
+
+
+def _resume(tmp_path, src, dst, pipeline) -> PhotoOrganizer:
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(
+        src,
+        dst,
+        sort_by_day=True,
+        remove_empty=False,
+        journal_path=tmp_path / "journal",
+        resume=True,
+        pipeline=pipeline,
+    )
+    return organizer
+
+
+@pytest.mark.parametrize("pipeline", [None, PipelineLimits()])
+@pytest.mark.parametrize("copied", [False, True])
+def test_resume_finishes_interrupted_move(tmp_path, interrupted, pipeline, copied):
+    src, dst, source, target = interrupted
+    content = source.read_bytes()
+    partial = MoveEngine.partial_path(target)
+    if copied:
+        # The copy got its name, the source removal was interrupted
+        target.write_bytes(content)
+    else:
+        # Killed during the copy to the temporary name
+        partial.write_bytes(content[: len(content) // 2])
+
+    organizer = _resume(tmp_path, src, dst, pipeline)
+
+    assert not source.exists() and not partial.exists()
+    assert target.read_bytes() == content
+    assert (organizer.processed_files, organizer.failed_count) == (1, 0)
+    state = load_journal(tmp_path / "journal")
+    assert state.pending == {}
+    assert [move[:2] for move in state.done] == [(str(source), str(target))]
+
+
+@pytest.mark.parametrize("pipeline", [None, PipelineLimits()])
+@pytest.mark.parametrize("same_size", [False, True])
+def test_resume_keeps_unrelated_destination(tmp_path, interrupted, pipeline, same_size):
+    src, dst, source, target = interrupted
+    content = source.read_bytes()
+    library = b"\0" * len(content) if same_size else content[: len(content) // 2]
+    target.write_bytes(library)
+
+    organizer = _resume(tmp_path, src, dst, pipeline)
+
+    # Neither file is removed, the name counts as taken
+    assert source.read_bytes() == content
+    assert target.read_bytes() == library
+    assert (organizer.processed_files, organizer.failed_count) == (1, 0)
+    state = load_journal(tmp_path / "journal")
+    assert state.pending == {} and state.done == []
+    assert state.skipped[str(source)][2] == "exists"
+
+
+def test_undo_restores_the_run(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    source = write_jpeg(src / "a.jpg", exif_block("2021:05:06 10:11:12"))
+    content = source.read_bytes()
+
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(
+        src, dst, sort_by_day=True, remove_empty=False, journal_path=tmp_path / "j"
+    )
+    assert not source.exists()
+    organizer.undo_moves(tmp_path / "j")
+
+    assert source.read_bytes() == content
+    assert load_journal(tmp_path / "j").done == []
@@ -0,0 +1,63 @@
+from datetime import date
+
+import pytest
+
+from media import exif_block, write_jpeg
+import move_plan
+from move_plan import PlanEntry, PlanWriter, iter_plan_entries, read_plan_header
+from PhotoOrganizer_v3 import PhotoOrganizer
+
+ENTRIES = [
+    PlanEntry("DCIM/a.jpg", 10, 111, move_plan.MOVE, date(2021, 5, 6), "2021/05/a.jpg"),
+    PlanEntry(
+        "DCIM/b.jpg", 20, 222, move_plan.EXISTS, date(2021, 5, 6), "2021/05/b.jpg"
+    ),
+    PlanEntry(
+        "DCIM/c.jpg", 30, 333, move_plan.CONFLICT, date(2021, 5, 6), "2021/05/a.jpg"
+    ),
+    PlanEntry("DCIM/d.png", 40, 444, move_plan.NO_DATE),
+    PlanEntry("DCIM/e.mp4", 50, 555, move_plan.ERROR, error="[Errno 5] I/O error"),
+    PlanEntry("Été/été 2019 ✓.jpg", 60, 666, move_plan.DUPLICATE),
+]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "plan.jsonl"
+    with PlanWriter(path, tmp_path / "src", tmp_path / "dst", True) as plan:
+        for entry in ENTRIES:
+            plan.write(entry)
+
+    header = read_plan_header(path)
+    assert header["source"] == str(tmp_path / "src")
+    assert header["destination"] == str(tmp_path / "dst")
+    assert header["sort_by_day"] is True
+    assert list(iter_plan_entries(path)) == ENTRIES
+    assert plan.counts[move_plan.MOVE] == 1
+
+
+@pytest.mark.parametrize("content", ["", "not json\n", '{"version": 99}\n', "[1]\n"])
+def test_not_a_plan(tmp_path, content):
+    path = tmp_path / "plan.jsonl"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        read_plan_header(path)
+
+
+def test_dry_run_then_execute(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    (src / "DCIM").mkdir(parents=True)
+    dated = write_jpeg(src / "DCIM" / "a.jpg", exif_block("2021:05:06 10:11:12"))
+    undated = write_jpeg(src / "DCIM" / "b.jpg")
+    plan_path = tmp_path / "plan.jsonl"
+
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(src, dst, remove_empty=False, plan_path=plan_path)
+    # A dry run only writes the plan
+    assert dated.exists() and not dst.exists()
+    entries = {entry.source: entry for entry in iter_plan_entries(plan_path)}
+    assert entries[str(dated.relative_to(src))].status == move_plan.MOVE
+    assert entries[str(undated.relative_to(src))].status == move_plan.NO_DATE
+
+    organizer.execute_plan(plan_path)
+    assert not dated.exists() and undated.exists()
+    assert (dst / "2021" / "05" / "a.jpg").exists()
@@ -0,0 +1,92 @@
+import random
+from itertools import combinations
+
+import pytest
+from PIL import Image, ImageDraw
+
+import near_duplicates
+from media import exif_block
+from near_duplicates import dhash, find_similar_pairs
+from PhotoOrganizer_v3 import PhotoOrganizer
+
+
+def _hashes(seed: int) -> list[int]:
+    """Random hashes with clusters of near-identical ones."""
+    rng = random.Random(seed)
+    hashes = []
+    for _ in range(60):
+        value = rng.getrandbits(64)
+        hashes.append(value)
+        for _ in range(rng.randrange(3)):
+            for bit in rng.sample(range(64), rng.randrange(8)):
+                value ^= 1 << bit
+            hashes.append(value)
+    hashes += hashes[:5]  # Exact copies
+    rng.shuffle(hashes)
+    return hashes
+
+
+def _brute_force(hashes: list[int], max_distance: int) -> list[tuple]:
+    pairs = []
+    for (a, x), (b, y) in combinations(enumerate(hashes), 2):
+        distance = bin(x ^ y).count("1")
+        if distance <= max_distance:
+            pairs.append((a, b, distance))
+    return pairs
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+@pytest.mark.parametrize("max_distance", [0, 4, 10])
+@pytest.mark.parametrize("seed", range(3))
+def test_finds_all_pairs(monkeypatch, numpy, max_distance, seed):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(near_duplicates, "_numpy", lambda: None)
+    hashes = _hashes(seed)
+    assert find_similar_pairs(hashes, max_distance) == _brute_force(
+        hashes, max_distance
+    )
+
+
+def test_needs_two_hashes():
+    assert find_similar_pairs([]) == []
+    assert find_similar_pairs([123]) == []
+
+
+def _picture(size=(400, 300)) -> Image.Image:
+    image = Image.new("RGB", size, (30, 60, 90))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((40, 40, 220, 200), fill=(240, 220, 20))
+    draw.rectangle((250, 120, 380, 280), fill=(200, 20, 20))
+    return image
+
+
+def test_dhash_survives_resize_and_recompression(tmp_path):
+    _picture().save(tmp_path / "a.jpg", quality=95)
+    _picture().resize((200, 150)).save(tmp_path / "b.jpg", quality=40)
+    _picture().transpose(Image.Transpose.FLIP_LEFT_RIGHT).save(tmp_path / "c.jpg")
+    hashes = []
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        with Image.open(tmp_path / name) as image:
+            hashes.append(dhash(image))
+    assert bin(hashes[0] ^ hashes[1]).count("1") <= 4
+    assert bin(hashes[0] ^ hashes[2]).count("1") > 10
+
+
+def test_organize_reports_near_duplicates(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    exif = exif_block("2021:05:06 10:11:12")
+    _picture().save(src / "a.jpg", quality=95, exif=exif)
+    _picture().resize((200, 150)).save(src / "a_small.jpg", quality=40, exif=exif)
+    _picture().rotate(180).save(src / "b.jpg", exif=exif)
+
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(src, dst, remove_empty=False, near_duplicates=True)
+
+    # Pairs refer to where the files were moved
+    [(path_a, path_b, distance)] = organizer.near_duplicate_pairs
+    folder = dst / "2021" / "05"
+    assert {path_a, path_b} == {str(folder / "a.jpg"), str(folder / "a_small.jpg")}
+    assert distance <= 4
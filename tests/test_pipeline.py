@@ -0,0 +1,103 @@
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from media import exif_block, mvhd, write_jpeg, write_mp4
+from PhotoOrganizer_v3 import PhotoOrganizer, PipelineLimits
+
+
+def _make_source(root: Path) -> Path:
+    """Mixed source tree: dated images and videos, undated files, a taken name."""
+    src = root / "src"
+    for folder in range(3):
+        (src / f"DCIM/{100 + folder}").mkdir(parents=True)
+        for index in range(20):
+            month = 1 + (folder * 20 + index) % 12
+            write_jpeg(
+                src / f"DCIM/{100 + folder}/IMG_{folder}{index:02d}.jpg",
+                exif_block(f"2021:{month:02d}:15 10:11:12"),
+            )
+    created = datetime(2019, 7, 8, tzinfo=timezone.utc)
+    write_mp4(src / "DCIM/100/VID_0001.mp4", mvhd(created))
+    write_jpeg(src / "DCIM/101/no_exif.jpg")
+    (src / "DCIM/102/empty.jpg").write_bytes(b"")
+    # Already in the library under the same name
+    taken = root / "dst/2021/01/IMG_000.jpg"
+    taken.parent.mkdir(parents=True)
+    taken.write_bytes(b"library file")
+    return src
+
+
+def _tree(root: Path) -> dict:
+    return {
+        str(path.relative_to(root)): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def _run(root: Path, **kwargs) -> PhotoOrganizer:
+    organizer = PhotoOrganizer()
+    organizer.organize_photos(
+        _make_source(root), root / "dst", remove_empty=False, **kwargs
+    )
+    return organizer
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_matches_sequential_engine(tmp_path, executor):
+    sequential = _run(tmp_path / "sequential")
+    staged = _run(
+        tmp_path / "pipeline",
+        executor=executor,
+        pipeline=PipelineLimits(readers=4, decoders=2, writers=2, queue_size=8),
+    )
+
+    for name in ("src", "dst"):
+        assert _tree(tmp_path / "pipeline" / name) == _tree(
+            tmp_path / "sequential" / name
+        )
+    assert (staged.processed_files, staged.failed_count) == (
+        sequential.processed_files,
+        sequential.failed_count,
+    )
+    assert sorted(Path(f).name for f in staged.failed_files) == sorted(
+        Path(f).name for f in sequential.failed_files
+    )
+
+
+def test_callback_error_stops_the_run(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    exif = exif_block("2021:05:06 10:11:12")
+    for index in range(300):
+        write_jpeg(src / f"IMG_{index:04d}.jpg", exif)
+    calls = []
+
+    def progress(*args):
+        calls.append(args)
+        if len(calls) == 10:
+            raise RuntimeError("callback failed")
+
+    errors = []
+
+    def run():
+        try:
+            PhotoOrganizer().organize_photos(
+                src,
+                tmp_path / "dst",
+                remove_empty=False,
+                progress_callback=progress,
+                pipeline=PipelineLimits(queue_size=4),
+            )
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive(), "organize_photos did not return"
+    assert [str(e) for e in errors] == ["callback failed"]
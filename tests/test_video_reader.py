@@ -0,0 +1,111 @@
+import struct
+from datetime import date, datetime, timezone
+
+import pytest
+
+from media import (
+    box,
+    keys_creationdate,
+    large_box,
+    mvhd,
+    udta_day,
+    write_mkv,
+    write_mp4,
+)
+from video_reader import MAX_MOOV_SIZE, read_video_date
+
+CREATED = datetime(2019, 7, 8, 23, 30, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("moov_first", [True, False])
+@pytest.mark.parametrize("suffix", [".mp4", ".mov"])
+def test_movie_header_date(tmp_path, suffix, moov_first):
+    path = write_mp4(tmp_path / f"a{suffix}", mvhd(CREATED), moov_first)
+    assert read_video_date(path) == date(2019, 7, 8)
+
+
+def test_64_bit_movie_header(tmp_path):
+    # Version 1 mvhd stores 64-bit times, e.g. for dates past 2040
+    created = datetime(2045, 3, 4, 12, tzinfo=timezone.utc)
+    path = write_mp4(tmp_path / "a.mp4", mvhd(created, version=1))
+    assert read_video_date(path) == date(2045, 3, 4)
+
+
+def test_64_bit_box_sizes(tmp_path):
+    # mdat with a largesize before the moov box, as written for files over 4 GiB
+    ftyp = box(b"ftyp", b"isom\0\0\2\0isom")
+    mdat = large_box(b"mdat", b"\0" * 4096)
+    moov = large_box(b"moov", mvhd(CREATED, version=1))
+    path = tmp_path / "a.mp4"
+    path.write_bytes(ftyp + mdat + moov)
+    assert read_video_date(path) == date(2019, 7, 8)
+
+
+def test_recorded_date_wins_over_movie_header(tmp_path):
+    children = mvhd(CREATED) + udta_day("2018-01-02T03:04:05+0100")
+    path = write_mp4(tmp_path / "a.mov", children)
+    assert read_video_date(path) == date(2018, 1, 2)
+
+
+def test_quicktime_creationdate_key(tmp_path):
+    children = mvhd(CREATED) + keys_creationdate("2017-11-12T13:14:15-0500")
+    path = write_mp4(tmp_path / "a.mov", children)
+    assert read_video_date(path) == date(2017, 11, 12)
+
+
+def test_unset_movie_header_time(tmp_path):
+    path = write_mp4(
+        tmp_path / "a.mp4", mvhd(datetime(1904, 1, 1, tzinfo=timezone.utc))
+    )
+    assert read_video_date(path) is None
+
+
+def test_invalid_recorded_date_falls_back_to_movie_header(tmp_path):
+    children = mvhd(CREATED) + udta_day("2018-13-45")
+    path = write_mp4(tmp_path / "a.mp4", children)
+    assert read_video_date(path) == date(2019, 7, 8)
+
+
+@pytest.mark.parametrize("cut", [4, 10, 20, 40, 60])
+def test_truncated_moov(tmp_path, cut):
+    path = write_mp4(tmp_path / "a.mp4", mvhd(CREATED), moov_first=False)
+    data = path.read_bytes()
+    path.write_bytes(data[: data.index(b"moov") - 4 + cut])
+    assert read_video_date(path) is None
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\0\0\0",
+        struct.pack(">I4s", 4, b"ftyp"),  # Size smaller than its header
+        struct.pack(">I4s", 1, b"moov") + b"\0\0",  # Truncated largesize
+        struct.pack(">I4s", 8 + MAX_MOOV_SIZE + 1, b"moov"),  # Oversized moov
+        box(b"moov", box(b"mvhd", b"\0")),  # mvhd too short for its times
+    ],
+)
+def test_malformed_headers_are_undecided(tmp_path, data):
+    path = tmp_path / "a.mp4"
+    path.write_bytes(data)
+    assert read_video_date(path) is None
+
+
+def test_matroska_date(tmp_path):
+    path = write_mkv(tmp_path / "a.mkv", CREATED)
+    assert read_video_date(path) == date(2019, 7, 8)
+
+
+def test_matroska_without_date(tmp_path):
+    assert read_video_date(write_mkv(tmp_path / "a.mkv", None)) is None
+
+
+def test_truncated_matroska(tmp_path):
+    path = write_mkv(tmp_path / "a.mkv", CREATED)
+    data = path.read_bytes()
+    path.write_bytes(data[: data.index(b"\x44\x61") + 6])
+    assert read_video_date(path) is None
+
+
+def test_missing_file(tmp_path):
+    assert read_video_date(tmp_path / "missing.mp4") is None